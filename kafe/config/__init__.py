@@ -3,10 +3,13 @@ Handle global kafe configuration
 """
 
 import os
+import sys
 import yaml
 
 from copy import deepcopy
 
+from ..tools import LazyModule
+
 
 class ConfigError(Exception): pass
 
@@ -62,6 +65,29 @@ def kc(*keys):
 
     return _dict
 
-# -- import matplotlib and source matplotlibrc file
-import matplotlib
-matplotlib.rc_file(os.path.join(__path__[0], 'kafe.matplotlibrc.conf'))
+# -- matplotlib is imported on first use, sourcing the kafe matplotlibrc file
+_matplotlib_rc_loaded = False
+
+def _load_matplotlib_rc():
+    global _matplotlib_rc_loaded
+    if not _matplotlib_rc_loaded:
+        import matplotlib as _matplotlib
+        _matplotlib.rc_file(os.path.join(__path__[0], 'kafe.matplotlibrc.conf'))
+        _matplotlib_rc_loaded = True
+
+def lazy_import_matplotlib(module_name='matplotlib'):
+    """
+    Return a stand-in for ``matplotlib`` (or one of its submodules), which is only imported
+    on first use. The *kafe* matplotlibrc file is sourced before that happens.
+
+    :param module_name: full name of the module (e.g. ``'matplotlib.pyplot'``)
+    :type module_name: str
+    :rtype: :py:class:`~kafe.tools.LazyModule`
+    """
+    return LazyModule(module_name, before_import=_load_matplotlib_rc)
+
+matplotlib = lazy_import_matplotlib()
+
+# if matplotlib has already been imported, source the rc file right away (as it costs nothing)
+if 'matplotlib' in sys.modules:
+    _load_matplotlib_rc()
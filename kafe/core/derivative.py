@@ -0,0 +1,125 @@
+"""
+Batched numerical differentiation of NumPy-vectorized functions.
+
+Instead of differentiating a function point by point, the finite-difference stencil is
+applied to whole arrays: the function is evaluated once per stencil offset (and per
+parameter, when differentiating with respect to the parameters).
+"""
+
+import numpy as np
+
+
+__all__ = ["DerivativeException", "central_difference_stencil", "derivative_by_x", "derivative_by_parameters"]
+
+
+# step used for complex-step differentiation (no subtractive cancellation, so it can be tiny)
+COMPLEX_STEP_SIZE = 1e-20
+
+_STENCIL_CACHE = dict()
+
+
+class DerivativeException(Exception):
+    pass
+
+
+def central_difference_stencil(order):
+    """
+    Return the offsets and weights of the central finite-difference formula for the first derivative.
+
+    :param order: number of stencil points (odd, at least 3)
+    :type order: int
+    :return: offsets (in units of the step size) and weights of the points with non-zero weight
+    :rtype: tuple of :py:obj:`numpy.ndarray`
+    """
+    if order < 3 or order % 2 != 1:
+        raise DerivativeException("Stencil order must be an odd integer >= 3, got %r!" % (order,))
+    _stencil = _STENCIL_CACHE.get(order, None)
+    if _stencil is None:
+        _half = order // 2
+        _offsets = np.arange(-_half, _half + 1, dtype=float)
+        # solve for weights that reproduce the first derivative of all polynomials up to degree 'order - 1'
+        _vandermonde = np.vander(_offsets, order, increasing=True).T
+        _rhs = np.zeros(order)
+        _rhs[1] = 1.0
+        _weights = np.linalg.solve(_vandermonde, _rhs)
+        _mask = np.abs(_weights) > 1e-12
+        _stencil = _STENCIL_CACHE[order] = (_offsets[_mask], _weights[_mask])
+    return _stencil
+
+
+def derivative_by_x(func, x, args=(), dx=None, order=3, complex_step=False):
+    """
+    Differentiate an elementwise, NumPy-vectorized function :math:`f(x, ...)` with respect to *x*
+    at all points of **x** simultaneously.
+
+    :param func: function handle, called as ``func(x, *args)``
+    :param x: points at which to evaluate the derivative
+    :type x: float or iterable of float
+    :param args: further arguments passed to the function
+    :type args: tuple
+    :param dx: step size(s) (scalar or one per point). If ``None``, a step size is chosen based on **x**.
+    :type dx: float or iterable of float
+    :param order: number of points of the central difference stencil (odd)
+    :type order: int
+    :param complex_step: if ``True``, use complex-step differentiation (the function must accept complex input)
+    :type complex_step: bool
+    :return: derivative values
+    :rtype: :py:obj:`numpy.ndarray`
+    """
+    _x = np.asarray(x, dtype=float)
+    if complex_step:
+        _h = COMPLEX_STEP_SIZE if dx is None else np.asarray(dx, dtype=float)
+        return np.imag(func(_x + 1j * _h, *args)) / _h
+
+    _h = 1e-2 * (np.abs(_x) + 1.0 / (1.0 + np.abs(_x))) if dx is None else np.asarray(dx, dtype=float)
+    _offsets, _weights = central_difference_stencil(order)
+    _ret = 0.0
+    for _offset, _weight in zip(_offsets, _weights):
+        _ret = _ret + _weight * np.asarray(func(_x + _offset * _h, *args), dtype=float)
+    return _ret / _h
+
+
+def derivative_by_parameters(func, parameters, args=(), dp=None, order=3, complex_step=False):
+    """
+    Differentiate a NumPy-vectorized function with respect to each of its parameters.
+    Each function evaluation covers the full array of support points.
+
+    :param func: function handle, called as ``func(*(args + parameters))``
+    :param parameters: parameter values at which to evaluate the derivative
+    :type parameters: iterable of float
+    :param args: leading arguments passed to the function (e.g. the *x* support points)
+    :type args: tuple
+    :param dp: step size(s) (scalar or one per parameter). If ``None``, a step size is chosen based on the
+               parameter values.
+    :type dp: float or iterable of float
+    :param order: number of points of the central difference stencil (odd)
+    :type order: int
+    :param complex_step: if ``True``, use complex-step differentiation (the function must accept complex input)
+    :type complex_step: bool
+    :return: derivative values, one row per parameter
+    :rtype: :py:obj:`numpy.ndarray`
+    """
+    _pars = np.asarray(parameters, dtype=float)
+    _args = tuple(args)
+    if complex_step:
+        _dps = np.broadcast_to(COMPLEX_STEP_SIZE if dp is None else dp, _pars.shape)
+        _ret = []
+        for _par_idx, _dp in enumerate(_dps):
+            _shifted_pars = _pars.astype(complex)
+            _shifted_pars[_par_idx] += 1j * _dp
+            _ret.append(np.imag(func(*(_args + tuple(_shifted_pars)))) / _dp)
+        return np.array(_ret)
+
+    if dp is None:
+        dp = 1e-2 * (np.abs(_pars) + 1.0 / (1.0 + np.abs(_pars)))
+    _dps = np.broadcast_to(dp, _pars.shape)
+    _offsets, _weights = central_difference_stencil(order)
+    _ret = []
+    for _par_idx, _dp in enumerate(_dps):
+        _der_val = 0.0
+        for _offset, _weight in zip(_offsets, _weights):
+            _shifted_pars = _pars.copy()
+            _shifted_pars[_par_idx] += _offset * _dp
+            _der_val = _der_val + _weight * np.asarray(func(*(_args + tuple(_shifted_pars))), dtype=float)
+        _ret.append(_der_val / _dp)
+    return np.array(_ret)
@@ -5,6 +5,13 @@
 import abc
 import copy
 import numpy as np
+import six
+
+import scipy.sparse as sp
+
+from scipy.linalg import cho_solve, cho_solve_banded, cholesky_banded, solve_banded, solve_triangular
+from scipy.linalg.lapack import dpotri
+from scipy.sparse.csgraph import reverse_cuthill_mckee
 
 import logging
 
@@ -46,6 +53,7 @@ class CovMat(object):
         self._chol = None
         self._cor_mat = None
         self._cond = None
+        self._factor = None
 
         # -- initialization
         self.mat = matrix
@@ -57,9 +65,7 @@ class CovMat(object):
         return self
 
     def __add__(self, other):
-        _new = CovMat(self.mat)
-        _new += other
-        return _new
+        return CovMat(self.mat + other.mat)
 
     def __len__(self):
         return self._size
@@ -70,6 +76,27 @@ class CovMat(object):
         self._chol = None
         self._inverse = None
         self._cor_mat = None
+        self._factor = None
+
+    def _get_factor_raise(self):
+        """
+        Factorize the covariance matrix (cached). Use a Cholesky decomposition, falling back
+        to an eigendecomposition if that fails for numerical reasons. Raise if the matrix is singular.
+        """
+        if self._factor is None:
+            if self.chol is not None:
+                # Fortran order avoids a copy of the factor in each LAPACK call
+                self._factor = ('cholesky', np.asfortranarray(self.chol))
+            else:
+                _eig_vals, _eig_vecs = np.linalg.eigh(np.asarray(self.mat))
+                _tol = _eig_vals.max() * self._size * np.finfo(float).eps if self._size else 0.0
+                if self._size and _eig_vals.min() > _tol:
+                    self._factor = ('eigen', (_eig_vals, _eig_vecs))
+                else:
+                    self._factor = ('singular', None)
+        if self._factor[0] == 'singular':
+            raise np.linalg.LinAlgError("Covariance matrix is singular!")
+        return self._factor
 
     # -- public interface
 
@@ -112,6 +139,8 @@ class CovMat(object):
         if isinstance(matrix, CovMat):
             # "copy constructor"
             matrix = copy.deepcopy(matrix.mat)
+        elif sp.issparse(matrix):
+            matrix = matrix.toarray()
 
         self._mat = np.asmatrix(matrix)
         if not (self._mat.shape[1] == self._mat.shape[0]):
@@ -123,6 +152,13 @@ class CovMat(object):
 
         self._invalidate_cache()
 
+    @property
+    def diagonal(self):
+        """
+        Diagonal of the covariance matrix (the variances) as a one-dimensional array.
+        """
+        return np.diagonal(np.asarray(self.mat)).copy()
+
     @property
     def cor_mat(self):
         """
@@ -140,8 +176,14 @@ class CovMat(object):
         Inverse of the covariance matrix. Returns ``None`` if matrix is singular.
         """
         if self._inverse is None:
+            if self.chol is not None:
+                # invert using the (cached) Cholesky factor
+                _inverse, _info = dpotri(np.asfortranarray(self.chol), lower=True)
+                if _info == 0:
+                    self._inverse = np.asmatrix(np.tril(_inverse) + np.tril(_inverse, -1).T)
+                    return self._inverse
             try:
-                self._inverse = self._mat.I
+                self._inverse = self.mat.I
             except np.linalg.LinAlgError:
                 pass  # fail silently if matrix is singular
         return self._inverse
@@ -159,6 +201,70 @@ class CovMat(object):
                 pass  # fail silently if matrix is not positive definite
         return self._chol
 
+    def solve(self, b):
+        """
+        Solve the linear system :math:`{\bf V} {\bf x} = {\bf b}` using a cached factorization of
+        the covariance matrix :math:`{\bf V}`.
+
+        :param b: right-hand side (vector or matrix)
+        :type b: `numpy.ndarray`
+        :return: the solution :math:`{\bf x}`
+        :rtype: `numpy.ndarray`
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        b = np.asarray(b)
+        if _kind == 'cholesky':
+            return cho_solve((_factor, True), b)
+        _eig_vals, _eig_vecs = _factor
+        _proj = _eig_vecs.T.dot(b)
+        _proj = (_proj.T / _eig_vals).T
+        return _eig_vecs.dot(_proj)
+
+    def whiten(self, residual):
+        """
+        Transform a residual vector :math:`{\bf r}` into a whitened residual :math:`{\bf z}` using a cached
+        factorization of the covariance matrix :math:`{\bf V}`, so that
+        :math:`{\bf z} \cdot {\bf z} = {\bf r}^{\top} {\bf V}^{-1} {\bf r}`.
+
+        :param residual: residual vector (or matrix with residual vectors as columns)
+        :type residual: `numpy.ndarray`
+        :return: the whitened residual
+        :rtype: `numpy.ndarray`
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        residual = np.asarray(residual)
+        if _kind == 'cholesky':
+            return solve_triangular(_factor, residual, lower=True, check_finite=False)
+        _eig_vals, _eig_vecs = _factor
+        return (_eig_vecs.T.dot(residual).T / np.sqrt(_eig_vals)).T
+
+    @property
+    def logdet(self):
+        """
+        Natural logarithm of the determinant of the covariance matrix, computed from a cached factorization.
+
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        if _kind == 'cholesky':
+            return 2.0 * np.sum(np.log(np.diag(_factor)))
+        _eig_vals, _eig_vecs = _factor
+        return np.sum(np.log(_eig_vals))
+
+    def scaled(self, factors):
+        """
+        Return a new covariance matrix for the scaled quantities :math:`f_i x_i`, i.e. with elements
+        :math:`V_{ij} f_i f_j`.
+
+        :param factors: pointwise scale factors :math:`f_i`
+        :type factors: iterable of float
+        :rtype: :py:obj:`CovMat`
+        """
+        _factors = np.asarray(factors, dtype=float)
+        return CovMat(np.asarray(self.mat) * np.outer(_factors, _factors))
+
     @property
     def cond(self):
         """
@@ -189,6 +295,795 @@ class CovMat(object):
         return _l
 
 
+class LowRankCovMat(CovMat):
+    """
+    Covariance matrix with the structure :math:`{\bf V} = {\bf D} + {\bf U} {\bf U}^{\top}`, where
+    :math:`{\bf D}` is diagonal and :math:`{\bf U}` is an :math:`N \times k` matrix whose columns are the
+    pointwise errors of :math:`k` fully correlated error sources.
+
+    Only the diagonal and the factors are stored. Sums of such matrices are formed by adding the diagonals
+    and concatenating the factors. Linear systems, whitening and the log-determinant are computed via the
+    Woodbury identity in :math:`\mathcal{O}(N k^2)`. The dense matrix is only materialized (and cached) if
+    it is requested explicitly via :py:attr:`mat`.
+    """
+    def __init__(self, diag, factors=None):
+        """
+        :param diag: diagonal part :math:`{\bf D}` of the covariance matrix
+        :type diag: iterable of float
+        :param factors: low-rank factors :math:`{\bf U}`, one column per correlated error source
+        :type factors: ``None`` or two-dimensional array of shape (N, k)
+        """
+        _diag = np.array(diag, dtype=float).ravel()
+        _size = _diag.shape[0]
+        if factors is None:
+            _factors = np.zeros((_size, 0))
+        else:
+            _factors = np.array(factors, dtype=float)
+            if _factors.ndim == 1:
+                _factors = _factors.reshape((_size, 1))
+            if _factors.ndim != 2 or _factors.shape[0] != _size:
+                raise ValueError("Low-rank factors must have shape (%d, k), shape %r given!"
+                                 % (_size, _factors.shape))
+        if np.any(_diag < 0):
+            raise ValueError("Diagonal part of covariance matrix must be non-negative!")
+
+        # -- member definitions
+        self._diag = _diag
+        self._factors = _factors
+        self._size = _size
+        self._mat = None
+        self._inverse = None
+        self._chol = None
+        self._cor_mat = None
+        self._cond = None
+        self._factor = None
+
+    # -- 'magic' methods
+
+    def __iadd__(self, other):
+        return self + other
+
+    def __add__(self, other):
+        if isinstance(other, LowRankCovMat):
+            return LowRankCovMat(self._diag + other._diag, np.hstack([self._factors, other._factors]))
+        if isinstance(other, BandedCovMat) and not self.rank:
+            return other + self
+        return CovMat(self.mat + other.mat)
+
+    # -- private methods
+
+    def _invalidate_cache(self):
+        super(LowRankCovMat, self)._invalidate_cache()
+        self._mat = None
+        self._cond = None
+
+    def _get_factor_raise(self):
+        """
+        Factorize the covariance matrix (cached). If the diagonal part is positive definite, compute the
+        eigendecomposition of the whitened low-rank update
+        :math:`{\bf D}^{-1/2} {\bf U} {\bf U}^{\top} {\bf D}^{-1/2} = {\bf P} \Lambda {\bf P}^{\top}`,
+        otherwise fall back to factorizing the dense matrix.
+        """
+        if self._factor is None:
+            if self._size and np.all(self._diag > 0):
+                _scaled_factors = self._factors / np.sqrt(self._diag)[:, np.newaxis]
+                if _scaled_factors.shape[1]:
+                    _q, _r = np.linalg.qr(_scaled_factors)
+                    _eig_vals, _eig_vecs = np.linalg.eigh(_r.dot(_r.T))
+                    _eig_vals = np.clip(_eig_vals, 0.0, None)
+                    _proj = _q.dot(_eig_vecs)
+                else:
+                    _eig_vals, _proj = np.zeros(0), np.zeros((self._size, 0))
+                self._factor = ('woodbury', (_eig_vals, _proj))
+            else:
+                self._factor = None
+                return super(LowRankCovMat, self)._get_factor_raise()
+        elif self._factor[0] != 'woodbury':
+            return super(LowRankCovMat, self)._get_factor_raise()
+        return self._factor
+
+    # -- public interface
+
+    def rescale_variant(self, old_reference_values, new_reference_values):
+        """
+        Rescale the covariance matrix (same as :py:meth:`rescale`).
+        """
+        self.rescale(old_reference_values, new_reference_values)
+
+    def rescale(self, old_reference_values, new_reference_values):
+        """
+        Rescale the covariance matrix.
+        """
+        _ratio = np.asarray(new_reference_values, dtype=float) / np.asarray(old_reference_values, dtype=float)
+        self._diag = self._diag * _ratio ** 2
+        self._factors = self._factors * _ratio[:, np.newaxis]
+        self._invalidate_cache()
+
+    def scaled(self, factors):
+        """
+        Return a new covariance matrix for the scaled quantities :math:`f_i x_i`, i.e. with elements
+        :math:`V_{ij} f_i f_j`. The low-rank structure is preserved.
+
+        :param factors: pointwise scale factors :math:`f_i`
+        :type factors: iterable of float
+        :rtype: :py:obj:`LowRankCovMat`
+        """
+        _factors = np.asarray(factors, dtype=float)
+        return LowRankCovMat(self._diag * _factors ** 2, self._factors * _factors[:, np.newaxis])
+
+    @property
+    def diag_part(self):
+        """
+        Diagonal part :math:`{\bf D}` of the covariance matrix as a one-dimensional array.
+        """
+        return self._diag
+
+    @property
+    def factors(self):
+        """
+        Low-rank factors :math:`{\bf U}` of the covariance matrix (array of shape (N, k)).
+        """
+        return self._factors
+
+    @property
+    def rank(self):
+        """
+        Number of low-rank factors :math:`k`.
+        """
+        return self._factors.shape[1]
+
+    @property
+    def mat(self):
+        """
+        Get the (dense) covariance matrix. It is materialized on first access and cached.
+        """
+        if self._mat is None:
+            _mat = np.diag(self._diag)
+            _mat += self._factors.dot(self._factors.T)
+            self._mat = np.asmatrix(_mat)
+        return self._mat
+
+    @property
+    def diagonal(self):
+        """
+        Diagonal of the covariance matrix (the variances) as a one-dimensional array.
+        """
+        return self._diag + np.sum(self._factors ** 2, axis=1)
+
+    @property
+    def I(self):
+        """
+        Inverse of the covariance matrix. Returns ``None`` if matrix is singular.
+        """
+        if self._inverse is None:
+            try:
+                _kind, _factor = self._get_factor_raise()
+            except np.linalg.LinAlgError:
+                return None  # fail silently if matrix is singular
+            if _kind != 'woodbury':
+                return super(LowRankCovMat, self).I
+            _eig_vals, _proj = _factor
+            _proj = _proj / np.sqrt(self._diag)[:, np.newaxis]
+            _inverse = np.diag(1.0 / self._diag)
+            _inverse -= (_proj * (_eig_vals / (1.0 + _eig_vals))).dot(_proj.T)
+            self._inverse = np.asmatrix(_inverse)
+        return self._inverse
+
+    @property
+    def logdet(self):
+        """
+        Natural logarithm of the determinant of the covariance matrix, computed from a cached factorization.
+
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        if _kind != 'woodbury':
+            return super(LowRankCovMat, self).logdet
+        _eig_vals, _proj = _factor
+        return np.sum(np.log(self._diag)) + np.sum(np.log1p(_eig_vals))
+
+    def solve(self, b):
+        """
+        Solve the linear system :math:`{\bf V} {\bf x} = {\bf b}` via the Woodbury identity.
+
+        :param b: right-hand side (vector or matrix)
+        :type b: `numpy.ndarray`
+        :return: the solution :math:`{\bf x}`
+        :rtype: `numpy.ndarray`
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        if _kind != 'woodbury':
+            return super(LowRankCovMat, self).solve(b)
+        _eig_vals, _proj = _factor
+        _sqrt_diag = np.sqrt(self._diag)
+        _y = (np.asarray(b, dtype=float).T / _sqrt_diag).T
+        _coeffs = _proj.T.dot(_y)
+        _y = _y - _proj.dot((_coeffs.T * (_eig_vals / (1.0 + _eig_vals))).T)
+        return (_y.T / _sqrt_diag).T
+
+    def whiten(self, residual):
+        """
+        Transform a residual vector :math:`{\bf r}` into a whitened residual :math:`{\bf z}`, so that
+        :math:`{\bf z} \cdot {\bf z} = {\bf r}^{\top} {\bf V}^{-1} {\bf r}`.
+
+        :param residual: residual vector (or matrix with residual vectors as columns)
+        :type residual: `numpy.ndarray`
+        :return: the whitened residual
+        :rtype: `numpy.ndarray`
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        if _kind != 'woodbury':
+            return super(LowRankCovMat, self).whiten(residual)
+        _eig_vals, _proj = _factor
+        _y = (np.asarray(residual, dtype=float).T / np.sqrt(self._diag)).T
+        _coeffs = _proj.T.dot(_y)
+        return _y + _proj.dot((_coeffs.T * (1.0 / np.sqrt(1.0 + _eig_vals) - 1.0)).T)
+
+    @property
+    def cond(self):
+        """
+        Condition number of the matrix.
+        """
+        if self._cond is None:
+            self._cond = np.linalg.cond(self.mat)
+        return self._cond
+
+
+class BandedCovMat(CovMat):
+    """
+    Sparse covariance matrix stored in (lower) banded form.
+
+    The matrix can be constructed from a :py:mod:`scipy.sparse` matrix, a dense array or directly from
+    its lower bands (see :py:meth:`from_bands`). General sparse matrices are reordered using the reverse
+    Cuthill-McKee algorithm to reduce their bandwidth. Linear systems, whitening and the log-determinant
+    are computed from a banded Cholesky decomposition, so that memory and time scale with
+    :math:`N b` (:math:`N b^2` for the factorization) for a bandwidth :math:`b` instead of :math:`N^2`.
+    The dense matrix is only materialized (and cached) if it is requested explicitly via :py:attr:`mat`.
+    """
+    def __init__(self, matrix, reorder=True):
+        """
+        :param matrix: the covariance matrix
+        :type matrix: :py:mod:`scipy.sparse` matrix or two-dimensional array
+        :param reorder: if ``True``, reorder rows and columns to reduce the bandwidth
+        :type reorder: bool
+        """
+        if isinstance(matrix, BandedCovMat):
+            # "copy constructor"
+            self._set_bands(matrix._bands.copy(), matrix._perm)
+            return
+
+        _mat = sp.csr_matrix(matrix, dtype=float)
+        if not (_mat.shape[1] == _mat.shape[0]):
+            raise ValueError("Covariance matrix must be square matrix, shape %r given," % (_mat.shape,))
+        if _mat.nnz and abs(_mat - _mat.T).max() > 1e-8:
+            raise ValueError("Covariance matrix must be symmetric!")
+
+        _perm = None
+        _bandwidth = self._calculate_bandwidth(_mat)
+        if reorder and _bandwidth > 1:
+            _rcm_perm = reverse_cuthill_mckee(_mat, symmetric_mode=True)
+            _rcm_mat = _mat[_rcm_perm][:, _rcm_perm]
+            if self._calculate_bandwidth(_rcm_mat) < _bandwidth:
+                _perm, _mat = np.asarray(_rcm_perm), _rcm_mat
+                _bandwidth = self._calculate_bandwidth(_mat)
+
+        _coo = sp.tril(_mat).tocoo()
+        _bands = np.zeros((_bandwidth + 1, _mat.shape[0]))
+        _bands[_coo.row - _coo.col, _coo.col] = _coo.data
+        self._set_bands(_bands, _perm)
+
+    @classmethod
+    def from_bands(cls, bands):
+        """
+        Construct a covariance matrix from its lower bands, stored as in
+        :py:func:`scipy.linalg.cholesky_banded` with ``lower=True``, i.e. ``bands[i - j, j] == matrix[i, j]``.
+
+        :param bands: the lower bands, shape (b + 1, N)
+        :type bands: two-dimensional array
+        :rtype: :py:obj:`BandedCovMat`
+        """
+        _bands = np.array(bands, dtype=float)
+        if _bands.ndim != 2:
+            raise ValueError("Banded covariance matrix must be two-dimensional, shape %r given," % (_bands.shape,))
+        _new = cls.__new__(cls)
+        _new._set_bands(_bands, None)
+        return _new
+
+    # -- 'magic' methods
+
+    def __iadd__(self, other):
+        return self + other
+
+    def __add__(self, other):
+        if isinstance(other, BandedCovMat):
+            return BandedCovMat(self.sparse + other.sparse)
+        if isinstance(other, LowRankCovMat) and not other.rank:
+            return BandedCovMat(self.sparse + sp.diags(other.diag_part))
+        return CovMat(self.mat + other.mat)
+
+    # -- static methods
+
+    @staticmethod
+    def _calculate_bandwidth(sparse_matrix):
+        _coo = sparse_matrix.tocoo()
+        if not _coo.nnz:
+            return 0
+        return int(np.max(np.abs(_coo.row - _coo.col)))
+
+    # -- private methods
+
+    def _set_bands(self, bands, perm):
+        # -- member definitions
+        self._bands = bands
+        self._perm = perm
+        self._inv_perm = None if perm is None else np.argsort(perm)
+        self._size = bands.shape[1]
+        self._mat = None
+        self._inverse = None
+        self._chol = None
+        self._cor_mat = None
+        self._cond = None
+        self._factor = None
+
+    def _to_band_order(self, array):
+        if self._perm is None:
+            return np.asarray(array, dtype=float)
+        return np.asarray(array, dtype=float)[self._perm]
+
+    def _from_band_order(self, array):
+        if self._perm is None:
+            return array
+        return array[self._inv_perm]
+
+    def _invalidate_cache(self):
+        super(BandedCovMat, self)._invalidate_cache()
+        self._mat = None
+        self._cond = None
+
+    def _get_factor_raise(self):
+        """
+        Factorize the covariance matrix (cached) using a banded Cholesky decomposition, falling back
+        to factorizing the dense matrix if that fails.
+        """
+        if self._factor is None:
+            try:
+                self._factor = ('banded', cholesky_banded(self._bands, lower=True))
+            except np.linalg.LinAlgError:
+                return super(BandedCovMat, self)._get_factor_raise()
+        elif self._factor[0] != 'banded':
+            return super(BandedCovMat, self)._get_factor_raise()
+        return self._factor
+
+    # -- public interface
+
+    def rescale_variant(self, old_reference_values, new_reference_values):
+        """
+        Rescale the covariance matrix (same as :py:meth:`rescale`).
+        """
+        self.rescale(old_reference_values, new_reference_values)
+
+    def rescale(self, old_reference_values, new_reference_values):
+        """
+        Rescale the covariance matrix.
+        """
+        _ratio = np.asarray(new_reference_values, dtype=float) / np.asarray(old_reference_values, dtype=float)
+        self._bands = self._scaled_bands(self._to_band_order(_ratio))
+        self._invalidate_cache()
+
+    def _scaled_bands(self, factors):
+        _bands = self._bands.copy()
+        for _k in six.moves.range(_bands.shape[0]):
+            _bands[_k, :self._size - _k] *= factors[_k:] * factors[:self._size - _k]
+        return _bands
+
+    def scaled(self, factors):
+        """
+        Return a new covariance matrix for the scaled quantities :math:`f_i x_i`, i.e. with elements
+        :math:`V_{ij} f_i f_j`. The banded structure is preserved.
+
+        :param factors: pointwise scale factors :math:`f_i`
+        :type factors: iterable of float
+        :rtype: :py:obj:`BandedCovMat`
+        """
+        _new = BandedCovMat(self)
+        _new._bands = self._scaled_bands(self._to_band_order(factors))
+        return _new
+
+    @property
+    def bands(self):
+        """
+        Lower bands of the (possibly reordered) covariance matrix, shape (b + 1, N).
+        """
+        return self._bands
+
+    @property
+    def bandwidth(self):
+        """
+        Number of sub-diagonals :math:`b` of the (possibly reordered) covariance matrix.
+        """
+        return self._bands.shape[0] - 1
+
+    @property
+    def sparse(self):
+        """
+        The covariance matrix as a :py:mod:`scipy.sparse` matrix (CSR format).
+        """
+        _n = self._size
+        _offsets = list(six.moves.range(self._bands.shape[0]))
+        _lower = sp.diags([self._bands[_k, :_n - _k] for _k in _offsets], [-_k for _k in _offsets],
+                          shape=(_n, _n), format='csr')
+        _mat = _lower + sp.tril(_lower, k=-1, format='csr').T
+        if self._perm is not None:
+            _mat = _mat[self._inv_perm][:, self._inv_perm]
+        return _mat.tocsr()
+
+    @property
+    def mat(self):
+        """
+        Get the (dense) covariance matrix. It is materialized on first access and cached.
+        """
+        if self._mat is None:
+            self._mat = np.asmatrix(self.sparse.toarray())
+        return self._mat
+
+    @property
+    def diagonal(self):
+        """
+        Diagonal of the covariance matrix (the variances) as a one-dimensional array.
+        """
+        return self._from_band_order(self._bands[0]).copy()
+
+    @property
+    def I(self):
+        """
+        Inverse of the covariance matrix. Returns ``None`` if matrix is singular.
+        """
+        if self._inverse is None:
+            try:
+                _kind, _factor = self._get_factor_raise()
+            except np.linalg.LinAlgError:
+                return None  # fail silently if matrix is singular
+            if _kind != 'banded':
+                return super(BandedCovMat, self).I
+            self._inverse = np.asmatrix(self.solve(np.eye(self._size)))
+        return self._inverse
+
+    @property
+    def logdet(self):
+        """
+        Natural logarithm of the determinant of the covariance matrix, computed from a cached factorization.
+
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        if _kind != 'banded':
+            return super(BandedCovMat, self).logdet
+        return 2.0 * np.sum(np.log(_factor[0]))
+
+    def solve(self, b):
+        """
+        Solve the linear system :math:`{\bf V} {\bf x} = {\bf b}` using a banded Cholesky decomposition.
+
+        :param b: right-hand side (vector or matrix)
+        :type b: `numpy.ndarray`
+        :return: the solution :math:`{\bf x}`
+        :rtype: `numpy.ndarray`
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        if _kind != 'banded':
+            return super(BandedCovMat, self).solve(b)
+        return self._from_band_order(cho_solve_banded((_factor, True), self._to_band_order(b)))
+
+    def whiten(self, residual):
+        """
+        Transform a residual vector :math:`{\bf r}` into a whitened residual :math:`{\bf z}`, so that
+        :math:`{\bf z} \cdot {\bf z} = {\bf r}^{\top} {\bf V}^{-1} {\bf r}`.
+
+        :param residual: residual vector (or matrix with residual vectors as columns)
+        :type residual: `numpy.ndarray`
+        :return: the whitened residual
+        :rtype: `numpy.ndarray`
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        _kind, _factor = self._get_factor_raise()
+        if _kind != 'banded':
+            return super(BandedCovMat, self).whiten(residual)
+        # whitened residuals are defined up to an orthogonal transformation, so the ordering can be kept
+        return solve_banded((self.bandwidth, 0), _factor, self._to_band_order(residual), check_finite=False)
+
+    @property
+    def cond(self):
+        """
+        Condition number of the matrix.
+        """
+        if self._cond is None:
+            self._cond = np.linalg.cond(self.mat)
+        return self._cond
+
+
+class ProjectedCovMat(CovMat):
+    """
+    Covariance matrix :math:`{\bf V} = {\bf V}_y + {\bf S} {\bf V}_x {\bf S}` of *y* values with the *x*
+    uncertainties projected on top of them, where :math:`{\bf S}` is the diagonal matrix of the model
+    derivatives :math:`f'(x_i)`.
+
+    The constant part :math:`{\bf V}_y` is kept as a separate object, so its factorization is only computed
+    once and reused each time the derivatives change (see :py:meth:`update`). The projected part is handled
+    depending on the structure of the matrices:
+
+    * if both parts are diagonal + low-rank (or banded + diagonal), their structured sum is used,
+    * if :math:`{\bf S} {\bf V}_x {\bf S}` is purely low-rank (fully correlated *x* errors), it is treated as a
+      low-rank update of the factorization of :math:`{\bf V}_y` via the Woodbury identity,
+    * otherwise, the dense matrix is assembled from the cached dense :math:`{\bf V}_y` and refactorized.
+
+    Rescaling (see :py:meth:`rescale`) rescales :math:`{\bf V}_y` in place.
+    """
+    def __init__(self, base_cov_mat, x_cov_mat, derivatives):
+        """
+        :param base_cov_mat: the constant part :math:`{\bf V}_y` of the covariance matrix
+        :type base_cov_mat: :py:obj:`CovMat`
+        :param x_cov_mat: the *x* covariance matrix :math:`{\bf V}_x`
+        :type x_cov_mat: :py:obj:`CovMat`
+        :param derivatives: the model derivatives :math:`f'(x_i)`
+        :type derivatives: iterable of float
+        """
+        # -- member definitions
+        self._base = base_cov_mat
+        self._x_cov_mat = x_cov_mat
+        self._size = len(base_cov_mat)
+        self._derivatives = None
+        self._mode = None
+        self._structured = None  # structured sum of both parts ('sum' mode)
+        self._update_factors = None  # low-rank factors of the projected part ('woodbury' mode)
+        self._woodbury_solve_cache = None
+        self._mat = None
+        self._inverse = None
+        self._chol = None
+        self._cor_mat = None
+        self._cond = None
+        self._factor = None
+
+        # -- initialization
+        self.update(derivatives)
+
+    # -- 'magic' methods
+
+    def __iadd__(self, other):
+        return self + other
+
+    def __add__(self, other):
+        return CovMat(self.mat + other.mat)
+
+    # -- private methods
+
+    def _invalidate_cache(self):
+        super(ProjectedCovMat, self)._invalidate_cache()
+        self._woodbury_solve_cache = None
+        self._cond = None
+
+    def _get_woodbury_solve_cache(self):
+        # V^-1 = V_y^-1 - V_y^-1 U (1 + U^T V_y^-1 U)^-1 U^T V_y^-1
+        if self._woodbury_solve_cache is None:
+            _base_solved_factors = self._base.solve(self._update_factors)
+            _capacitance = np.eye(self._update_factors.shape[1]) + self._update_factors.T.dot(_base_solved_factors)
+            self._woodbury_solve_cache = (_base_solved_factors, _capacitance)
+        return self._woodbury_solve_cache
+
+    def _get_factor_raise(self):
+        """
+        In 'woodbury' mode, compute the eigendecomposition of the whitened low-rank update
+        :math:`{\bf W} {\bf U} {\bf U}^{\top} {\bf W}^{\top} = {\bf P} \Lambda {\bf P}^{\top}`, where
+        :math:`{\bf W}` is the whitening transformation of :math:`{\bf V}_y`. Otherwise, factorize the dense matrix.
+        """
+        if self._mode != 'woodbury':
+            return super(ProjectedCovMat, self)._get_factor_raise()
+        if self._factor is None:
+            _q, _r = np.linalg.qr(np.asarray(self._base.whiten(self._update_factors)).reshape(self._size, -1))
+            _eig_vals, _eig_vecs = np.linalg.eigh(_r.dot(_r.T))
+            self._factor = ('woodbury', (np.clip(_eig_vals, 0.0, None), _q.dot(_eig_vecs)))
+        return self._factor
+
+    # -- public interface
+
+    def update(self, derivatives):
+        """
+        Set new model derivatives. The factorization of the constant part :math:`{\bf V}_y` is reused.
+
+        :param derivatives: the model derivatives :math:`f'(x_i)`
+        :type derivatives: iterable of float
+        """
+        _derivatives = self._derivatives = np.asarray(derivatives, dtype=float)
+        _base, _x_cov_mat = self._base, self._x_cov_mat
+        self._structured = None
+        self._update_factors = None
+        self._mat = None
+        self._invalidate_cache()
+        if isinstance(_x_cov_mat, LowRankCovMat):
+            if isinstance(_base, (LowRankCovMat, BandedCovMat)):
+                _sum = _base + _x_cov_mat.scaled(_derivatives)
+                if type(_sum) is not CovMat:
+                    self._mode = 'sum'
+                    self._structured = _sum
+                    return
+            if not np.any(_x_cov_mat.diag_part):
+                self._mode = 'woodbury'
+                self._update_factors = _x_cov_mat.factors * _derivatives[:, np.newaxis]
+                return
+        self._mode = 'dense'
+        _mat = np.array(_base.mat, dtype=float)
+        if isinstance(_x_cov_mat, LowRankCovMat):
+            _mat[np.diag_indices(self._size)] += _x_cov_mat.diag_part * _derivatives ** 2
+            _factors = _x_cov_mat.factors * _derivatives[:, np.newaxis]
+            if _factors.shape[1]:
+                _mat += _factors.dot(_factors.T)
+        else:
+            _mat += np.asarray(_x_cov_mat.mat) * np.outer(_derivatives, _derivatives)
+        self._mat = np.asmatrix(_mat)
+
+    @property
+    def mode(self):
+        """
+        How the projected part is handled: ``'sum'``, ``'woodbury'`` or ``'dense'``.
+        """
+        return self._mode
+
+    def rescale_variant(self, old_reference_values, new_reference_values):
+        """
+        Rescale the covariance matrix (same as :py:meth:`rescale`).
+        """
+        self.rescale(old_reference_values, new_reference_values)
+
+    def rescale(self, old_reference_values, new_reference_values):
+        """
+        Rescale the covariance matrix. With the ratios :math:`r_i` of new to old reference values,
+        :math:`{\bf r} {\bf V} {\bf r} = {\bf r} {\bf V}_y {\bf r} + ({\bf r} {\bf S}) {\bf V}_x ({\bf r} {\bf S})`,
+        so the constant part is rescaled and the derivatives are multiplied by the ratios.
+        """
+        _ratio = np.asarray(new_reference_values, dtype=float) / np.asarray(old_reference_values, dtype=float)
+        self._base.rescale(old_reference_values, new_reference_values)
+        self.update(self._derivatives * _ratio)
+
+    def scaled(self, factors):
+        """
+        Return a new covariance matrix for the scaled quantities :math:`f_i x_i`, i.e. with elements
+        :math:`V_{ij} f_i f_j`.
+
+        :param factors: pointwise scale factors :math:`f_i`
+        :type factors: iterable of float
+        :rtype: :py:obj:`CovMat`
+        """
+        if self._mode == 'sum':
+            return self._structured.scaled(factors)
+        return super(ProjectedCovMat, self).scaled(factors)
+
+    @property
+    def mat(self):
+        """
+        Get the (dense) covariance matrix. It is materialized on first access and cached.
+        """
+        if self._mode == 'sum':
+            return self._structured.mat
+        if self._mat is None:
+            _mat = np.array(self._base.mat, dtype=float)
+            _mat += self._update_factors.dot(self._update_factors.T)
+            self._mat = np.asmatrix(_mat)
+        return self._mat
+
+    @property
+    def diagonal(self):
+        """
+        Diagonal of the covariance matrix (the variances) as a one-dimensional array.
+        """
+        if self._mode == 'sum':
+            return self._structured.diagonal
+        if self._mode == 'woodbury':
+            return self._base.diagonal + np.sum(self._update_factors ** 2, axis=1)
+        return super(ProjectedCovMat, self).diagonal
+
+    @property
+    def cor_mat(self):
+        """
+        Correlation matrix corresponding to the covariance matrix.
+        """
+        if self._mode == 'sum':
+            return self._structured.cor_mat
+        return super(ProjectedCovMat, self).cor_mat
+
+    @property
+    def I(self):
+        """
+        Inverse of the covariance matrix. Returns ``None`` if matrix is singular. In 'woodbury' mode, it is
+        obtained from the (cached) inverse of :math:`{\bf V}_y` by a low-rank correction.
+        """
+        if self._mode == 'sum':
+            return self._structured.I
+        if self._inverse is None and self._mode == 'woodbury':
+            _base_inverse = self._base.I
+            if _base_inverse is None:
+                return super(ProjectedCovMat, self).I
+            _base_solved_factors, _capacitance = self._get_woodbury_solve_cache()
+            _correction = _base_solved_factors.dot(np.linalg.solve(_capacitance, _base_solved_factors.T))
+            self._inverse = np.asmatrix(np.asarray(_base_inverse) - _correction)
+        return super(ProjectedCovMat, self).I
+
+    @property
+    def chol(self):
+        """
+        Lower diagonal matrix resulting from the Cholesky decomposition of the covariance matrix. Returns ``None``
+        if matrix is not positive definite.
+        """
+        if self._mode == 'sum':
+            return self._structured.chol
+        return super(ProjectedCovMat, self).chol
+
+    @property
+    def logdet(self):
+        """
+        Natural logarithm of the determinant of the covariance matrix, computed from a cached factorization.
+
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        if self._mode == 'sum':
+            return self._structured.logdet
+        _kind, _factor = self._get_factor_raise()
+        if _kind != 'woodbury':
+            return super(ProjectedCovMat, self).logdet
+        _eig_vals, _proj = _factor
+        return self._base.logdet + np.sum(np.log1p(_eig_vals))
+
+    def solve(self, b):
+        """
+        Solve the linear system :math:`{\bf V} {\bf x} = {\bf b}`. In 'woodbury' mode, this only requires
+        solving with the cached factorization of :math:`{\bf V}_y`.
+
+        :param b: right-hand side (vector or matrix)
+        :type b: `numpy.ndarray`
+        :return: the solution :math:`{\bf x}`
+        :rtype: `numpy.ndarray`
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        if self._mode == 'sum':
+            return self._structured.solve(b)
+        if self._mode != 'woodbury':
+            return super(ProjectedCovMat, self).solve(b)
+        _base_solved_factors, _capacitance = self._get_woodbury_solve_cache()
+        _x = np.asarray(self._base.solve(b))
+        return _x - _base_solved_factors.dot(np.linalg.solve(_capacitance, self._update_factors.T.dot(_x)))
+
+    def whiten(self, residual):
+        """
+        Transform a residual vector :math:`{\bf r}` into a whitened residual :math:`{\bf z}`, so that
+        :math:`{\bf z} \cdot {\bf z} = {\bf r}^{\top} {\bf V}^{-1} {\bf r}`.
+
+        :param residual: residual vector (or matrix with residual vectors as columns)
+        :type residual: `numpy.ndarray`
+        :return: the whitened residual
+        :rtype: `numpy.ndarray`
+        :raises numpy.linalg.LinAlgError: if the covariance matrix is singular
+        """
+        if self._mode == 'sum':
+            return self._structured.whiten(residual)
+        _kind, _factor = self._get_factor_raise()
+        if _kind != 'woodbury':
+            return super(ProjectedCovMat, self).whiten(residual)
+        _eig_vals, _proj = _factor
+        _y = np.asarray(self._base.whiten(residual))
+        _coeffs = _proj.T.dot(_y)
+        return _y + _proj.dot((_coeffs.T * (1.0 / np.sqrt(1.0 + _eig_vals) - 1.0)).T)
+
+    @property
+    def cond(self):
+        """
+        Condition number of the matrix.
+        """
+        if self._cond is None:
+            self._cond = np.linalg.cond(self.mat)
+        return self._cond
+
+
 """
 Data structures for Gaussian Errors
 """
@@ -307,19 +1202,23 @@ class SimpleGaussianError(GaussianErrorBase):
 
     @staticmethod
     def _calculate_cov_mat_generic(error_array, corr_coeff):
-        """Calculate a covariance matrix from an array of error values and a global correlation coefficient."""
+        """
+        Calculate a covariance matrix from an array of error values and a global correlation coefficient.
+        The matrix is represented as a diagonal plus (at most) a rank-one term and is never formed densely.
+        """
         if corr_coeff > 0:
-            cov_mat_uncor_part = np.diag(error_array ** 2 * (1.0 - corr_coeff))
-            cov_mat_cor_part = np.outer(error_array, error_array) * corr_coeff
-        else:
-            cov_mat_uncor_part = np.diag(error_array ** 2)
-            cov_mat_cor_part = np.zeros_like(cov_mat_uncor_part)
+            return LowRankCovMat(error_array ** 2 * (1.0 - corr_coeff), error_array * np.sqrt(corr_coeff))
+        return LowRankCovMat(error_array ** 2)
 
-        cov_mat = CovMat(cov_mat_uncor_part + cov_mat_cor_part)
-
-        assert np.allclose(np.diag(cov_mat.mat), error_array ** 2, atol=1e-4)
+    @staticmethod
+    def _get_cov_mat_uncor_part(cov_mat):
+        """Dense diagonal ('uncorrelated') part of a covariance matrix created by `_calculate_cov_mat_generic`."""
+        return np.diag(cov_mat.diag_part)
 
-        return cov_mat, cov_mat_uncor_part, cov_mat_cor_part
+    @staticmethod
+    def _get_cov_mat_cor_part(cov_mat):
+        """Dense 'fully correlated' part of a covariance matrix created by `_calculate_cov_mat_generic`."""
+        return cov_mat.factors.dot(cov_mat.factors.T)
 
     # -- private methods
 
@@ -332,7 +1231,7 @@ class SimpleGaussianError(GaussianErrorBase):
         else:
             _abs_err = self.error
 
-        self._cov_mat, self._cov_mat_uncor_part, self._cov_mat_cor_part = self._calculate_cov_mat_generic(_abs_err, self._corr_coeff)
+        self._cov_mat = self._calculate_cov_mat_generic(_abs_err, self._corr_coeff)
 
     def _calculate_cov_mat_rel(self):
         """Calculate relative covariance matrix for error object."""
@@ -343,7 +1242,7 @@ class SimpleGaussianError(GaussianErrorBase):
                 raise AttributeError("Requested 'relative' errors for error object declared 'absolute', but 'reference' not set!")
             _rel_err = self.error / self.reference
 
-        self._cov_mat_rel, self._cov_mat_rel_uncor_part, self._cov_mat_rel_cor_part = self._calculate_cov_mat_generic(_rel_err, self._corr_coeff)
+        self._cov_mat_rel = self._calculate_cov_mat_generic(_rel_err, self._corr_coeff)
 
     # -- public methods
 
@@ -477,13 +1376,13 @@ class SimpleGaussianError(GaussianErrorBase):
     def cov_mat_uncor(self):
         if self._cov_mat is None:
             self._calculate_cov_mat()
-        return self._cov_mat_uncor_part
+        return self._get_cov_mat_uncor_part(self._cov_mat)
 
     @property
     def cov_mat_cor(self):
         if self._cov_mat is None:
             self._calculate_cov_mat()
-        return self._cov_mat_cor_part
+        return self._get_cov_mat_cor_part(self._cov_mat)
 
     @property
     def cov_mat_rel(self):
@@ -501,13 +1400,19 @@ class SimpleGaussianError(GaussianErrorBase):
     def cov_mat_rel_uncor(self):
         if self._cov_mat_rel is None:
             self._calculate_cov_mat_rel()
-        return self._cov_mat_rel_uncor_part
+        return self._get_cov_mat_uncor_part(self._cov_mat_rel)
 
     @property
     def cov_mat_rel_cor(self):
         if self._cov_mat_rel is None:
             self._calculate_cov_mat_rel()
-        return self._cov_mat_rel_cor_part
+        return self._get_cov_mat_cor_part(self._cov_mat_rel)
+
+    def get_cov_mat_object(self):
+        """Returns the internal-use `CovMat` object used to represent measurement errors. (advanced)"""
+        if self._cov_mat is None:
+            self._calculate_cov_mat()
+        return self._cov_mat
 
     @property
     def cor_mat(self):
@@ -553,15 +1458,26 @@ class MatrixGaussianError(GaussianErrorBase):
                 self.cov_mat_rel = err_matrix
                 # check err_val against cov_mat diagonal
                 if err_val is not None:
-                    if not np.allclose(np.diag(self._cov_mat_rel.mat), err_val ** 2):
+                    if not np.allclose(self._cov_mat_rel.diagonal, err_val ** 2):
                         raise ValueError("Covariance matrix diagonal does not match array of error values!")
             else:
                 self.cov_mat = err_matrix
                 # check err_val against cov_mat diagonal
                 if err_val is not None:
-                    if not np.allclose(np.diag(self._cov_mat.mat), err_val ** 2):
+                    if not np.allclose(self._cov_mat.diagonal, err_val ** 2):
                         raise ValueError("Covariance matrix diagonal does not match array of error values!")
 
+        elif matrix_type.lower() in ('banded', 'band'):
+            self._matrix_type_at_construction = 'covariance'
+            _cm = BandedCovMat.from_bands(err_matrix)
+            if self.relative:
+                self.cov_mat_rel = _cm
+            else:
+                self.cov_mat = _cm
+            if err_val is not None:
+                if not np.allclose(_cm.diagonal, err_val ** 2):
+                    raise ValueError("Covariance matrix diagonal does not match array of error values!")
+
         elif matrix_type.lower() in ('correlation', 'correlations', 'cor', 'corr'):
             self._matrix_type_at_construction = 'correlation'
             if err_val is None:
@@ -572,13 +1488,18 @@ class MatrixGaussianError(GaussianErrorBase):
             else:
                 self.cov_mat = _cm
         else:
-            raise ValueError("Unknown matrix type '%s'. Expected one of: %r" % (matrix_type, ('cov', 'cor')))
+            raise ValueError("Unknown matrix type '%s'. Expected one of: %r" % (matrix_type, ('cov', 'cor', 'banded')))
 
     # -- static methods
 
     @staticmethod
     def _calculate_cov_mat_from_cor_mat_and_error_array(error_array, corr_mat):
         """Calculate a covariance matrix from an array of error values and a correlation matrix."""
+        if sp.issparse(corr_mat):
+            if not np.allclose(corr_mat.diagonal(), 1.0):
+                raise ValueError("Corelation matrix has non-unit entry on diagonal!")
+            _err_diag = sp.diags(np.asarray(error_array, dtype=float))
+            return BandedCovMat(_err_diag.dot(corr_mat).dot(_err_diag))
         # check if corr_mat has ones on diagonal
         if not np.allclose(np.diag(corr_mat), 1.0):
             raise ValueError("Corelation matrix has non-unit entry on diagonal!")
@@ -588,17 +1509,35 @@ class MatrixGaussianError(GaussianErrorBase):
 
     @staticmethod
     def _calculate_cov_mat_rel_from_cov(cov_mat, reference):
-        _ref = np.asarray(reference)
-        _refmat = np.outer(_ref, _ref)
-        _mat = np.asarray(cov_mat)
-        return CovMat(_mat / _refmat)
+        _ref = np.asarray(reference, dtype=float)
+        return cov_mat.scaled(1.0 / _ref)
 
     @staticmethod
     def _calculate_cov_mat_from_cov_rel(cov_mat_rel, reference):
-        _ref = np.asarray(reference)
-        _refmat = np.outer(_ref, _ref)
-        _mat_rel = np.asarray(cov_mat_rel)
-        return CovMat(_mat_rel * _refmat)
+        _ref = np.asarray(reference, dtype=float)
+        return cov_mat_rel.scaled(_ref)
+
+    @staticmethod
+    def _copy_cov_mat_object(cov_mat):
+        """
+        Create a `CovMat` object from a matrix, copying and preserving the structure of `CovMat` objects.
+        Sparse matrices are stored in banded form.
+        """
+        if isinstance(cov_mat, LowRankCovMat):
+            return LowRankCovMat(cov_mat.diag_part, cov_mat.factors)
+        if isinstance(cov_mat, BandedCovMat) or sp.issparse(cov_mat):
+            return BandedCovMat(cov_mat)
+        return CovMat(cov_mat)
+
+    # -- private methods
+
+    def _get_cov_mat_rel_object(self):
+        if not self.relative:
+            if self.reference is None:
+                raise AttributeError(
+                    "Requested 'relative' covariance matrix for error object declared 'absolute', but 'reference' not set!")
+            self._cov_mat_rel = self._calculate_cov_mat_rel_from_cov(self.get_cov_mat_object(), self.reference)
+        return self._cov_mat_rel
 
     # -- public methods
 
@@ -610,33 +1549,23 @@ class MatrixGaussianError(GaussianErrorBase):
     @property
     def cov_mat(self):
         """"""
-        if self.relative:
-            if self.reference is None:
-                raise AttributeError(
-                    "Requested 'absolute' covariance matrix for error object declared 'relative', but 'reference' not set!")
-            self._cov_mat = self._calculate_cov_mat_from_cov_rel(self.cov_mat_rel, self.reference)
-        return self._cov_mat.mat
+        return self.get_cov_mat_object().mat
 
     @cov_mat.setter
     def cov_mat(self, cov_mat):
         """"""
-        self._cov_mat = CovMat(cov_mat)
+        self._cov_mat = self._copy_cov_mat_object(cov_mat)
         self._cov_mat_rel = None
 
     @property
     def cov_mat_rel(self):
         """"""
-        if not self.relative:
-            if self.reference is None:
-                raise AttributeError(
-                    "Requested 'relative' covariance matrix for error object declared 'absolute', but 'reference' not set!")
-            self._cov_mat_rel = self._calculate_cov_mat_rel_from_cov(self.cov_mat, self.reference)
-        return self._cov_mat_rel.mat
+        return self._get_cov_mat_rel_object().mat
 
     @cov_mat_rel.setter
     def cov_mat_rel(self, cov_mat_rel):
         """"""
-        self._cov_mat_rel = CovMat(cov_mat_rel)
+        self._cov_mat_rel = self._copy_cov_mat_object(cov_mat_rel)
         self._cov_mat = None
 
     @property
@@ -645,7 +1574,7 @@ class MatrixGaussianError(GaussianErrorBase):
             if self.reference is None:
                 raise AttributeError(
                     "Requested 'absolute' inverse covariance matrix for error object declared 'relative', but 'reference' not set!")
-            self._cov_mat = self._calculate_cov_mat_from_cov_rel(self.cov_mat_rel, self.reference)
+            self._cov_mat = self._calculate_cov_mat_from_cov_rel(self._cov_mat_rel, self.reference)
         return self._cov_mat.I
 
     @property
@@ -656,7 +1585,7 @@ class MatrixGaussianError(GaussianErrorBase):
                 if self.reference is None:
                     raise AttributeError(
                         "Requested 'absolute' error array for error object declared 'relative', but 'reference' not set!")
-            self._err = np.sqrt(np.diag(self.cov_mat))
+            self._err = np.sqrt(self.get_cov_mat_object().diagonal)
         return self._err
 
     @property
@@ -667,7 +1596,7 @@ class MatrixGaussianError(GaussianErrorBase):
                 if self.reference is None:
                     raise AttributeError(
                         "Requested 'relative' error array for error object declared 'absolute', but 'reference' not set!")
-            self._err_rel = np.sqrt(np.diag(self.cov_mat_rel))
+            self._err_rel = np.sqrt(self._get_cov_mat_rel_object().diagonal)
         return self._err_rel
 
     @property
@@ -730,6 +1659,15 @@ class MatrixGaussianError(GaussianErrorBase):
     def cov_mat_rel_cor(self):
         raise AttributeError("Cannot get the correlated part of a 'matrix-type' error!")
 
+    def get_cov_mat_object(self):
+        """Returns the internal-use `CovMat` object used to represent measurement errors. (advanced)"""
+        if self.relative:
+            if self.reference is None:
+                raise AttributeError(
+                    "Requested 'absolute' covariance matrix for error object declared 'relative', but 'reference' not set!")
+            self._cov_mat = self._calculate_cov_mat_from_cov_rel(self._cov_mat_rel, self.reference)
+        return self._cov_mat
+
     @property
     def cor_mat(self):
         # TODO: check if these are equal
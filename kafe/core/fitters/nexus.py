@@ -1,19 +1,92 @@
 import abc
 import inspect
+import numpy as np
 import six
 import sys
+import types
 import weakref
 from ast import parse
 from collections import OrderedDict
+from copy import deepcopy
+from timeit import default_timer
 
 
 NODE_VALUE_DEFAULT = 1.0
 
 
+def _values_equal(value_1, value_2):
+    """Check if two node values are equal. Values which cannot be compared are considered different."""
+    if value_1 is value_2:
+        return True
+    if isinstance(value_1, np.ndarray) or isinstance(value_2, np.ndarray):
+        return np.array_equal(value_1, value_2)
+    try:
+        return bool(value_1 == value_2)
+    except (TypeError, ValueError):
+        return False
+
+
+def _make_cell(value):
+    return (lambda: value).__closure__[0]
+
+
+def _deepcopy_function(func, memo):
+    """Copy a Python function, deep-copying the contents of its closure (e.g. an object bound in a lambda)."""
+    if not isinstance(func, types.FunctionType) or not func.__closure__:
+        return deepcopy(func, memo)
+    _closure = tuple(_make_cell(deepcopy(_cell.cell_contents, memo)) for _cell in func.__closure__)
+    _func_copy = types.FunctionType(func.__code__, func.__globals__, func.__name__, func.__defaults__, _closure)
+    _func_copy.__dict__.update(func.__dict__)
+    return _func_copy
+
+
 class NodeException(Exception):
     pass
 
 
+class NodeProfile(object):
+    """
+    Evaluation statistics of a single node, recorded while profiling is enabled in the parent nexus.
+
+    Evaluations of nodes which are triggered while another node is being evaluated are subtracted
+    from the *self time* of the latter.
+    """
+    __slots__ = ('n_evaluations', 'n_cache_hits', 'n_cache_misses', 'n_memo_hits', 'n_invalidations',
+                 'cumulative_time', 'self_time', '_stack')
+
+    def __init__(self, stack):
+        self._stack = stack  # evaluation stack shared by all profiles of a nexus
+        self.reset()
+
+    def reset(self):
+        self.n_evaluations = 0  # number of actual function calls
+        self.n_cache_hits = 0  # value requested, node up to date
+        self.n_cache_misses = 0  # value requested, node stale
+        self.n_memo_hits = 0  # node stale, but recalculation skipped by memoization
+        self.n_invalidations = 0  # number of times the node was marked stale
+        self.cumulative_time = 0.0
+        self.self_time = 0.0
+
+    @property
+    def cache_hit_ratio(self):
+        _n_requests = self.n_cache_hits + self.n_cache_misses
+        if _n_requests == 0:
+            return None
+        return float(self.n_cache_hits) / _n_requests
+
+    def as_dict(self):
+        return OrderedDict([
+            ('n_evaluations', self.n_evaluations),
+            ('n_cache_hits', self.n_cache_hits),
+            ('n_cache_misses', self.n_cache_misses),
+            ('n_memo_hits', self.n_memo_hits),
+            ('n_invalidations', self.n_invalidations),
+            ('cache_hit_ratio', self.cache_hit_ratio),
+            ('cumulative_time', self.cumulative_time),
+            ('self_time', self.self_time),
+        ])
+
+
 class NodeBase(object):
     """
     Abstract class. Defines the minimal interface required by all specializations.
@@ -27,6 +100,9 @@ class NodeBase(object):
         self.nexus = parent_nexus
 
         self._stale = False
+        self._version = 0  # incremented whenever the node value changes
+        self._plan_index = None  # position in the parent nexus' compiled evaluation plan
+        self._profile = None  # evaluation statistics, only set while profiling
 
     @staticmethod
     def check_parameter_name_raise(parameter_name):
@@ -43,6 +119,23 @@ class NodeBase(object):
     def stale(self):
         return self._stale
 
+    @property
+    def version(self):
+        return self._version
+
+    def __deepcopy__(self, memo):
+        # the copy refers to the copy of the parent nexus, not the original one
+        _copy = self.__class__.__new__(self.__class__)
+        memo[id(self)] = _copy
+        for _attr, _value in six.iteritems(self.__dict__):
+            if _attr == '_nexus_weak_ref':
+                _nexus = _value()
+                _value = weakref.ref(deepcopy(_nexus, memo)) if _nexus is not None else _value
+            else:
+                _value = deepcopy(_value, memo)
+            _copy.__dict__[_attr] = _value
+        return _copy
+
     @property
     def nexus(self):
         return self._nexus_weak_ref()
@@ -95,6 +188,8 @@ class NodeValue(NodeBase):
 
     @value.setter
     def value(self, value):
+        if not _values_equal(value, self._value):
+            self._version += 1
         self._value = value
         self.notify_dependencies()
 
@@ -108,14 +203,25 @@ class NodeValue(NodeBase):
 
 
 class NodeFunction(NodeBase):
-    """All keyword arguments of the function must be parameters registered in the parameter space."""
-    def __init__(self, function_handle, function_name=None, parent_nexus=None):
+    """
+    All keyword arguments of the function must be parameters registered in the parameter space.
+
+    If `memoize` is ``True``, the node keeps a fingerprint of the versions of all of its inputs
+    (function parameters and dependency sources) and skips recalculation if none of them changed.
+    This assumes that the function value depends only on these inputs, and that input values are
+    not modified in-place.
+    """
+    def __init__(self, function_handle, function_name=None, parent_nexus=None, memoize=False):
         _fname = function_name if function_name is not None else function_handle.__name__
         super(NodeFunction, self).__init__(_fname, parent_nexus=parent_nexus)
         self.func = function_handle
+        self.memoize = memoize
         self._value = 0.0
         #self._par_value_cache = dict()
         self._par_value_cache = []
+        self._par_node_cache = None  # parameter node objects, bound by the parent nexus
+        self._input_nodes = None  # parameter and dependency source nodes, bound by the parent nexus
+        self._input_fingerprint = None  # input versions at last recalculation
         self._stale = True
 
         #logger.debug("Created: %s", self)
@@ -124,6 +230,12 @@ class NodeFunction(NodeBase):
         #return self._func(**self._par_value_cache)
         return self._func(*self._par_value_cache)
 
+    def __deepcopy__(self, memo):
+        _copy = super(NodeFunction, self).__deepcopy__(memo)
+        # functions closing over other objects (e.g. ``lambda: fit.y_model``) are bound to copies of these
+        _copy._func = _deepcopy_function(self._func, memo)
+        return _copy
+
     @property
     def parameter_names(self):
         return self._func_varnames
@@ -132,6 +244,8 @@ class NodeFunction(NodeBase):
     def parameter_names(self, para_names):
         self._func_varcount = len(para_names)
         self._func_varnames = para_names
+        self._par_node_cache = None
+        self._input_fingerprint = None
         self._stale = True
 
     def _update(self):
@@ -139,25 +253,74 @@ class NodeFunction(NodeBase):
         if self.nexus is None:
             return
 
+        _fingerprint = None
+        if self.memoize and self._input_nodes is None:
+            # input nodes are bound when compiling the evaluation plan
+            self.nexus.update_evaluation_plan()
+        if self.memoize and self._input_nodes is not None:
+            # bring inputs up to date, then check if any of them changed
+            for _node in self._input_nodes:
+                if _node._stale:
+                    _node.value
+            _fingerprint = tuple([_node._version for _node in self._input_nodes])
+            if _fingerprint == self._input_fingerprint:
+                self._stale = False
+                return False
+
+        _ps = self._par_node_cache
+        if _ps is None:
+            # parameter nodes not bound yet -> resolve by name
+            _ps = self.nexus.get_by_name(self._func_varnames)
         #self._par_value_cache = dict()
-        self._par_value_cache = []
-        _pns = self._func_varnames
-        _ps = self.nexus.get_by_name(_pns)
-        for _pn, _p in zip(_pns, _ps):
-            #logger.debug("Update: %s = %s (%s)", _pn, _p.value, _p)
-            #self._par_value_cache[_pn] = _p.value
-            self._par_value_cache.append(_p.value)
+        self._par_value_cache = [_p.value for _p in _ps]
 
+        _old_value = self._value
         self._value = self()
         self._stale = False
+        if _fingerprint is None:
+            self._version += 1
+        else:
+            self._input_fingerprint = _fingerprint
+            if not _values_equal(self._value, _old_value):
+                self._version += 1
+        return True
+
+    def _update_profiled(self):
+        _profile = self._profile
+        _stack = _profile._stack
+        _stack.append(0.0)  # accumulates time spent evaluating other nodes
+        _t_start = default_timer()
+        try:
+            _recalculated = self._update()
+        finally:
+            _t_elapsed = default_timer() - _t_start
+            _t_children = _stack.pop()
+            if _stack:
+                _stack[-1] += _t_elapsed
+        _profile.n_cache_misses += 1
+        if _recalculated:
+            _profile.n_evaluations += 1
+        elif _recalculated is not None:
+            _profile.n_memo_hits += 1
+        _profile.cumulative_time += _t_elapsed
+        _profile.self_time += _t_elapsed - _t_children
+
+    def mark_for_update(self):
+        self._input_fingerprint = None  # force recalculation
+        self._stale = True
 
     @property
     def value(self):
         #logger.debug("Request function value: %s", self)
         #logger.debug("Stale? %s", self.stale)
-        if self.stale:
+        if self._stale:
             #logger.debug("Is stale -> recalculate!")
-            self._update()
+            if self._profile is None:
+                self._update()
+            else:
+                self._update_profiled()
+        elif self._profile is not None:
+            self._profile.n_cache_hits += 1
         #logger.debug("Value: %s", self._value)
         return self._value
 
@@ -171,12 +334,40 @@ class NodeFunction(NodeBase):
         # do introspection
         self._func_varcount = self._func.__code__.co_argcount
         self._func_varnames = inspect.getargspec(self._func)[0]
+        self._par_node_cache = None
+        self._input_fingerprint = None
         self._stale = True
 
     def __str__(self):
         return "ParameterFunction('%s', function_handle=%s, nexus=%s) [%d]" % (self.name, self._func, self.nexus, id(self))
 
 
+class NodeSlots(object):
+    """
+    Ordered list of value nodes bound to a nexus in advance, so that all of their values can be
+    set in one go (see :py:meth:`Nexus.set_vector`).
+    """
+    def __init__(self, nodes):
+        self._nodes = tuple(nodes)
+        self._dirty_set = tuple()
+        self._plan_version = None  # evaluation plan for which the dirty set was last computed
+
+    def __len__(self):
+        return len(self._nodes)
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def names(self):
+        return [_node.name for _node in self._nodes]
+
+    @property
+    def values(self):
+        return [_node.value for _node in self._nodes]
+
+
 # ----------------------------------------------
 
 class NexusException(Exception):
@@ -208,6 +399,21 @@ class Nexus(object):
         self._dependency_graph = dict()
         self._dependency_graph_stale = False
 
+        # "EvaluationPlan": compiled, index-based view of the dependency graph
+        self.__plan_nodes = []  # all distinct nodes, topologically sorted (sources first)
+        self.__plan_dirty_sets = []  # plan index -> tuple of nodes to mark stale when that node changes
+        self.__plan_stale = True  # need to recompile the evaluation plan?
+        self.__plan_version = 0  # incremented every time the plan is recompiled
+        self.__plan_group_dirty_sets = dict()  # group name -> tuple of nodes to mark stale for the group
+
+        # "InvalidationGroups": named groups of nodes which are marked for update together
+        self.__groups = OrderedDict()  # group name -> list of nodes
+
+        # "Profile": per-node evaluation statistics (only while profiling is enabled)
+        self.__profiling = False
+        self.__profiles = OrderedDict()  # node -> `NodeProfile`
+        self.__profile_stack = []
+
     # -- private methods
 
     @staticmethod
@@ -218,16 +424,91 @@ class Nexus(object):
             raise NodeException("Invalid parameter name '%s'. Must be Python identifier!"
                                 % (parameter_name,))
 
-    def _check_for_dependency_cycles_raise(self):
-        """Check for dependency cycles. Recursive and expensive!"""
-        _seen = list()
-        def check_cycle_from_vertex(v):
-            _seen.add(v)
-            for _dep in self._dependency_graph.get(v, tuple()):
-                if _dep in _seen or check_cycle_from_vertex(_dep):
-                    _m = ' <- '.join(_seen)
-                    raise NexusException("Cyclic parameter dependency detected: %s!" % (_m,))
-            _seen.remove(v)
+    def _topologically_sorted_nodes_raise(self, nodes):
+        """Sort nodes so that every node comes before all of its dependents. Raise on dependency cycles."""
+        _n_sources = dict.fromkeys(nodes, 0)
+        for _src, _targets in six.iteritems(self._dependency_graph):
+            for _target in _targets:
+                _n_sources[_target] = _n_sources.get(_target, 0) + 1
+
+        _sorted = [_node for _node, _n in six.iteritems(_n_sources) if _n == 0]
+        _i = 0
+        while _i < len(_sorted):
+            for _target in self._dependency_graph.get(_sorted[_i], tuple()):
+                _n_sources[_target] -= 1
+                if _n_sources[_target] == 0:
+                    _sorted.append(_target)
+            _i += 1
+
+        if len(_sorted) < len(_n_sources):
+            _m = ', '.join(sorted(_node.name for _node, _n in six.iteritems(_n_sources) if _n > 0))
+            raise NexusException("Cyclic parameter dependency detected among: %s!" % (_m,))
+        return _sorted
+
+    def _compile_evaluation_plan(self):
+        """
+        Compile the dependency graph into an index-based evaluation plan.
+
+        Each node is assigned its position in a topological ordering of the graph,
+        and the full set of nodes to invalidate whenever a node changes (its "dirty set")
+        is precomputed. Parameter node objects are bound to the function nodes which
+        take them as arguments, so that no lookups by name are needed when evaluating.
+        """
+        if self.__nexus_stale:
+            self._rebuild_nexus()
+
+        # unique node objects, in registration order
+        _nodes = list(OrderedDict.fromkeys(self.__map_par_name_to_par_obj.values()))
+        _plan_nodes = self._topologically_sorted_nodes_raise(_nodes)
+        for _idx, _node in enumerate(_plan_nodes):
+            _node._plan_index = _idx
+
+        # transitive closure of dependents: visit nodes in reverse topological order,
+        # so the closures of all direct targets are already known
+        _closures = [None] * len(_plan_nodes)
+        for _idx in six.moves.range(len(_plan_nodes) - 1, -1, -1):
+            _closure = set()
+            for _target in self._dependency_graph.get(_plan_nodes[_idx], tuple()):
+                _closure.add(_target._plan_index)
+                _closure.update(_closures[_target._plan_index])
+            _closures[_idx] = _closure
+
+        # only function nodes can become stale -> simple values need no marking
+        self.__plan_dirty_sets = [
+            tuple(_plan_nodes[_i] for _i in sorted(_closure) if not isinstance(_plan_nodes[_i], NodeValue))
+            for _closure in _closures
+        ]
+
+        # nodes to mark stale for each invalidation group: members and all their dependents
+        self.__plan_group_dirty_sets = dict()
+        for _group_name, _group_nodes in six.iteritems(self.__groups):
+            _closure = set()
+            for _node in _group_nodes:
+                _closure.add(_node._plan_index)
+                _closure.update(_closures[_node._plan_index])
+            self.__plan_group_dirty_sets[_group_name] = tuple(
+                _plan_nodes[_i] for _i in sorted(_closure) if not isinstance(_plan_nodes[_i], NodeValue))
+
+        # direct dependency sources of each node
+        _sources = [[] for _node in _plan_nodes]
+        for _src, _targets in six.iteritems(self._dependency_graph):
+            for _target in _targets:
+                _sources[_target._plan_index].append(_src)
+
+        # bind parameter and input nodes to function nodes
+        for _node in _plan_nodes:
+            if isinstance(_node, NodeFunction):
+                _par_nodes = [self._get_one_by_name(_pn, None) for _pn in _node.parameter_names]
+                if None not in _par_nodes:
+                    _node._par_node_cache = _par_nodes
+                    _node._input_nodes = tuple(OrderedDict.fromkeys(_par_nodes + _sources[_node._plan_index]))
+                else:
+                    _node._input_nodes = None
+
+        self.__plan_nodes = _plan_nodes
+        self.__plan_version += 1
+        self.__plan_stale = False
+        self._dependency_graph_stale = False
 
     def _rebuild_nexus(self):
 
@@ -282,6 +563,7 @@ class Nexus(object):
         self.__nexus_real_dim = _real_dim
         self.__nexus_stale = False
         self.__getter_cache = dict()  # rebuilding nexus invalidates getter cache
+        self.__plan_stale = True  # rebuilding nexus invalidates evaluation plan
 
     # -- heuristic getters
     #
@@ -378,6 +660,7 @@ class Nexus(object):
                 # re-raise ParameterException as ParameterSpaceException
                 raise NexusException(pe)
             self.__nexus_stale = True
+            self.__plan_stale = True
 
     def _set_one(self, name, value):
         _p = self._get_one_by_name(name, None)
@@ -410,6 +693,7 @@ class Nexus(object):
             raise NexusException(pe)
 
         self.__nexus_stale = True
+        self.__plan_stale = True
 
     # def _get_dependent_parameter_objects(self, source_par_obj, default=tuple()):
     #     if self._dependency_graph_stale:
@@ -508,13 +792,14 @@ class Nexus(object):
         for k, v in six.iteritems(kwargs):
             self._new_one(k, v)
 
-    def new_function(self, function_handle, function_name=None, add_unknown_parameters=False, wire_parameters=True):
+    def new_function(self, function_handle, function_name=None, add_unknown_parameters=False, wire_parameters=True,
+                     groups=None, memoize=False):
         _p = self.__map_par_name_to_par_obj.get(function_handle)
         if _p is not None:
             raise NexusException("Cannot create parameter '%s': exists!" % (function_handle,))
         else:
             try:
-                _pf = NodeFunction(function_handle, function_name=function_name, parent_nexus=self)
+                _pf = NodeFunction(function_handle, function_name=function_name, parent_nexus=self, memoize=memoize)
                 self.__map_par_name_to_par_obj[_pf.name] = _pf
                 #self.add_dependency(target=_fname, sources=_pf.parameter_names)
                 for _pf_par_name in _pf.parameter_names:
@@ -524,10 +809,52 @@ class Nexus(object):
                             self.new(**{_pf_par_name: NODE_VALUE_DEFAULT})
                     if wire_parameters:
                         self.add_dependency(source=_pf_par_name, target=_pf.name)
+                for _group_name in (groups or tuple()):
+                    self.__groups.setdefault(_group_name, []).append(_pf)
+                if self.__profiling:
+                    self._attach_profile(_pf)
             except NodeException as pe:
                 # re-raise NodeException as NexusException
                 raise NexusException(pe.message)
             self.__nexus_stale = True
+            self.__plan_stale = True
+
+    # invalidation groups
+
+    @property
+    def group_names(self):
+        return list(self.__groups.keys())
+
+    def get_group(self, group_name):
+        """
+        Return the nodes registered in an invalidation group.
+
+        :param group_name: name of the group
+        :type group_name: str
+        :return: list of nodes
+        """
+        _group_nodes = self.__groups.get(group_name, None)
+        if _group_nodes is None:
+            raise NexusException("No invalidation group with name '%s'!" % (group_name,))
+        return list(_group_nodes)
+
+    def mark_group_for_update(self, group_name):
+        """
+        Mark all nodes in an invalidation group and all of their dependents for update in a single pass.
+
+        :param group_name: name of the group, as specified on node creation
+        :type group_name: str
+        """
+        if self.__plan_stale:
+            self._compile_evaluation_plan()
+        _dirty_set = self.__plan_group_dirty_sets.get(group_name, None)
+        if _dirty_set is None:
+            raise NexusException("No invalidation group with name '%s'!" % (group_name,))
+        for _target in _dirty_set:
+            _target._input_fingerprint = None  # force recalculation of memoized nodes
+            _target._stale = True
+        if self.__profiling:
+            self._count_invalidations(_dirty_set)
 
     # change parameter values
 
@@ -535,6 +862,57 @@ class Nexus(object):
         for k, v in six.iteritems(kwargs):
             self._set_one(k, v)
 
+    def bind_slots(self, names):
+        """
+        Bind an ordered list of value nodes for setting their values in bulk via :py:meth:`set_vector`.
+
+        :param names: names of the value nodes
+        :type names: iterable of str
+        :return: the bound slot list
+        :rtype: :py:class:`NodeSlots`
+        """
+        _nodes = []
+        for _name in names:
+            _p = self.get_by_name(_name)
+            if _p is None:
+                raise NexusException("Cannot bind parameter '%s': no such parameter!" % (_name,))
+            if not isinstance(_p, NodeValue):
+                raise NexusException("Cannot bind parameter '%s': not a simple value!" % (_name,))
+            _nodes.append(_p)
+        return NodeSlots(_nodes)
+
+    def set_vector(self, slots, values):
+        """
+        Set the values of all nodes in a bound slot list at once. All dependent nodes are
+        marked for update in a single pass.
+
+        :param slots: slot list, as returned by :py:meth:`bind_slots`
+        :type slots: :py:class:`NodeSlots`
+        :param values: new node values, in the same order as the slots
+        :type values: sequence or `numpy.ndarray`
+        """
+        if self.__plan_stale:
+            self._compile_evaluation_plan()
+        if slots._plan_version != self.__plan_version:
+            # merge dirty sets of all slots, keep evaluation order
+            _dirty_set = OrderedDict()
+            for _node in slots.nodes:
+                _dirty_set.update((_target, None) for _target in self.get_dirty_set(_node))
+            slots._dirty_set = tuple(sorted(_dirty_set, key=lambda _target: _target._plan_index))
+            slots._plan_version = self.__plan_version
+        if len(values) != len(slots._nodes):
+            raise NexusException("Cannot set vector: %d slots bound, but %d values provided!"
+                                 % (len(slots._nodes), len(values)))
+
+        for _node, _value in zip(slots._nodes, values):
+            if not _values_equal(_value, _node._value):
+                _node._version += 1
+            _node._value = _value
+        for _target in slots._dirty_set:
+            _target._stale = True
+        if self.__profiling:
+            self._count_invalidations(slots._dirty_set)
+
     def set_function(self, **kwargs):
         for k, v in six.iteritems(kwargs):
             self._set_function_one(k, v)
@@ -586,6 +964,7 @@ class Nexus(object):
 
         self._dependency_graph[_src_par_obj].append(_target_par_obj)
         self._dependency_graph_stale = True
+        self.__plan_stale = True
 
     # def get_dependencies_OLD(self, source, default=tuple()):
     #     _src_par_obj = self.get_by_name(source)
@@ -598,8 +977,7 @@ class Nexus(object):
 
     def get_dependencies(self, source, default=tuple()):
         if self._dependency_graph_stale:
-            self._check_for_dependency_cycles_raise()
-            self._dependency_graph_stale = False
+            self._compile_evaluation_plan()
         _deps = self._dependency_graph.get(source, None)
         if _deps is None:
             # if nothing found, try again assuming 'source' is a parameter name, not a parameter object...
@@ -608,15 +986,90 @@ class Nexus(object):
             return _deps
         return _deps
 
+    def update_evaluation_plan(self):
+        """Recompile the evaluation plan if the nexus or the dependency graph changed."""
+        if self.__plan_stale:
+            self._compile_evaluation_plan()
+
+    def get_dirty_set(self, source):
+        """
+        Return all nodes which are marked for update whenever the source node changes,
+        in evaluation order.
+
+        :param source: node object or node name
+        :return: tuple of nodes
+        """
+        if self.__plan_stale:
+            self._compile_evaluation_plan()
+        if not isinstance(source, NodeBase):
+            source = self.get_by_name(source)
+            if source is None:
+                return tuple()
+        if source._plan_index is None:
+            return tuple()
+        return self.__plan_dirty_sets[source._plan_index]
+
     def notify_dependencies(self, source):
-        for _target in self.get_dependencies(source, tuple()):
-            try:
-                _target.mark_for_update()
-            except AttributeError:
-                _target = self.get_by_name(_target)
-                _target.mark_for_update()
-            finally:
-                self.notify_dependencies(_target)
+        _dirty_set = self.get_dirty_set(source)
+        for _target in _dirty_set:
+            _target._stale = True
+        if self.__profiling:
+            self._count_invalidations(_dirty_set)
+
+    def _count_invalidations(self, nodes):
+        for _node in nodes:
+            _node._profile.n_invalidations += 1
+
+    # profiling
+
+    @property
+    def profiling_enabled(self):
+        return self.__profiling
+
+    def _attach_profile(self, node):
+        _profile = self.__profiles.get(node, None)
+        if _profile is None:
+            _profile = self.__profiles[node] = NodeProfile(self.__profile_stack)
+        node._profile = _profile
+
+    def enable_profiling(self, reset=True):
+        """
+        Start recording evaluation statistics for all function nodes.
+
+        :param reset: if ``True``, discard statistics recorded previously
+        :type reset: bool
+        """
+        if reset:
+            self.reset_profile()
+        for _node in OrderedDict.fromkeys(self.__map_par_name_to_par_obj.values()):
+            if isinstance(_node, NodeFunction):
+                self._attach_profile(_node)
+        self.__profiling = True
+
+    def disable_profiling(self):
+        """Stop recording evaluation statistics. The statistics recorded so far are kept."""
+        for _node in self.__profiles:
+            _node._profile = None
+        self.__profile_stack[:] = []
+        self.__profiling = False
+
+    def reset_profile(self):
+        """Discard all recorded evaluation statistics."""
+        for _profile in six.itervalues(self.__profiles):
+            _profile.reset()
+
+    def get_profile_report(self):
+        """
+        Return the evaluation statistics recorded for all function nodes.
+
+        The report maps node names to dictionaries of statistics and can be turned into a table, e.g. with
+        ``pandas.DataFrame.from_dict(report, orient='index')``.
+        Times are wall-clock times in seconds.
+
+        :return: node names mapped to statistics
+        :rtype: `OrderedDict`
+        """
+        return OrderedDict([(_node.name, _profile.as_dict()) for _node, _profile in six.iteritems(self.__profiles)])
 
     def print_state(self, output_stream=sys.stdout):
         for _par_name, _par_obj in six.iteritems(self.__map_par_name_to_par_obj):
@@ -10,10 +10,12 @@ class NexusFitterException(Exception):
 
 class NexusFitter(object):
 
-    def __init__(self, nexus, parameters_to_fit, parameter_to_minimize, minimizer=None, minimizer_kwargs=None):
+    def __init__(self, nexus, parameters_to_fit, parameter_to_minimize, minimizer=None, minimizer_kwargs=None,
+                 parameter_to_minimize_gradient=None):
         self._nx = nexus
         self.parameters_to_fit = parameters_to_fit
         self.parameter_to_minimize = parameter_to_minimize
+        self.parameter_to_minimize_gradient = parameter_to_minimize_gradient
 
         # local cache
         self.__cache_stale = True
@@ -25,6 +27,8 @@ class NexusFitter(object):
         _par_name_val_map = self.fit_parameter_values
         if minimizer_kwargs == None:
             minimizer_kwargs = dict()
+        if self._par_to_minimize_gradient_node is not None and kc('core', 'fitters', 'nexus_fitter', 'use_gradient'):
+            minimizer_kwargs = dict(minimizer_kwargs, gradient_to_minimize=self._grad_wrapper)
 
         if minimizer is not None:
             _minimizer_class = get_minimizer(minimizer)
@@ -92,10 +96,15 @@ class NexusFitter(object):
         #         print fit_par_value_list
         #         print self.n_fit_par
         # set parameters to current values
-        _par_val_dict = {_pn: _pv for _pn, _pv in zip(self.parameters_to_fit, fit_par_value_list)}
-        self._nx.set(**_par_val_dict)
+        self._nx.set_vector(self._fit_par_slots, fit_par_value_list)
         # evaluate function and return value
-        return self._nx.get_values_by_name(self.parameter_to_minimize)
+        return self._par_to_minimize_node.value
+
+    def _grad_wrapper(self, *fit_par_value_list):
+        # set parameters to current values
+        self._nx.set_vector(self._fit_par_slots, fit_par_value_list)
+        # evaluate gradient and return value
+        return self._par_to_minimize_gradient_node.value
 
     # -- public properties
 
@@ -111,6 +120,7 @@ class NexusFitter(object):
     def parameters_to_fit(self, fit_parameters):
         self._check_parnames_in_par_space_raise(fit_parameters)
         self._fit_pars = fit_parameters
+        self._fit_par_slots = self._nx.bind_slots(fit_parameters)
 
     @property
     def parameter_to_minimize(self):
@@ -120,6 +130,21 @@ class NexusFitter(object):
     def parameter_to_minimize(self, parameter_to_minimize):
         self._check_parnames_in_par_space_raise((parameter_to_minimize,))
         self._parameter_to_minimize = parameter_to_minimize
+        self._par_to_minimize_node = self._nx.get_by_name(parameter_to_minimize)
+
+    @property
+    def parameter_to_minimize_gradient(self):
+        return self._parameter_to_minimize_gradient
+
+    @parameter_to_minimize_gradient.setter
+    def parameter_to_minimize_gradient(self, parameter_to_minimize_gradient):
+        if parameter_to_minimize_gradient is None:
+            self._parameter_to_minimize_gradient = None
+            self._par_to_minimize_gradient_node = None
+            return
+        self._check_parnames_in_par_space_raise((parameter_to_minimize_gradient,))
+        self._parameter_to_minimize_gradient = parameter_to_minimize_gradient
+        self._par_to_minimize_gradient_node = self._nx.get_by_name(parameter_to_minimize_gradient)
 
     @property
     def fit_parameter_values(self):
@@ -174,10 +199,10 @@ class NexusFitter(object):
             raise NexusFitterException("To calculate a contour the do_fit method has to be called first.")
         return self._minimizer.contour(parameter_name_1, parameter_name_2, sigma=sigma, **kwargs)
 
-    def profile(self, parameter_name, bins=20, bound=2, args=None, subtract_min=False):
+    def profile(self, parameter_name, bins=20, bound=2, args=None, subtract_min=False, **kwargs):
         if not self.__state_is_from_minimizer:
             raise NexusFitterException("To calculate a profile the do_fit method has to be called first.")
-        return self._minimizer.profile(parameter_name, bins=bins, bound=bound, subtract_min=subtract_min)
+        return self._minimizer.profile(parameter_name, bins=bins, bound=bound, subtract_min=subtract_min, **kwargs)
 
     def set_fit_parameter_values(self, **parameter_value_dict):
         _dict_key_set = set(parameter_value_dict.keys())
@@ -201,5 +226,8 @@ class NexusFitter(object):
                                        "but %d provided!"
                                        % (len(self.parameters_to_fit), len(fit_par_value_list)))
         # set values in nexus
-        _par_val_dict = {_pn: _pv for _pn, _pv in zip(self.parameters_to_fit, fit_par_value_list)}
-        self.set_fit_parameter_values(**_par_val_dict)
+        self._nx.set_vector(self._fit_par_slots, fit_par_value_list)
+        self._minimizer.set_several(self.parameters_to_fit, list(fit_par_value_list))
+        # set flags
+        self.__state_is_from_minimizer = False
+        self.__cache_stale = True
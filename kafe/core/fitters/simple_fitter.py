@@ -1,10 +1,10 @@
-from ..minimizers import MinimizerIMinuit
+from ..minimizers import get_minimizer
 
 class SimpleFitterException(Exception):
     pass
 
 class SimpleFitter(object):
-    def __init__(self, nexus, parameters_to_fit, parameter_to_minimize, minimizer_class=MinimizerIMinuit):
+    def __init__(self, nexus, parameters_to_fit, parameter_to_minimize, minimizer_class=None):
         self._nx = nexus
         self.parameters_to_fit = parameters_to_fit
         self.parameter_to_minimize = parameter_to_minimize
@@ -15,6 +15,8 @@ class SimpleFitter(object):
         self.__cache_fit_parameters_name_value_dict = None
         self.__cache_parameter_to_minimize_value = None
 
+        if minimizer_class is None:
+            minimizer_class = get_minimizer('iminuit')
         _par_name_val_map = self.fit_parameter_values
         self._minimizer = minimizer_class(parameters_to_fit,
                                           _par_name_val_map.values(),
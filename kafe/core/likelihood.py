@@ -0,0 +1,161 @@
+"""
+Vectorized likelihood kernels, evaluated in log space.
+
+All functions return twice the negative logarithm of the likelihood (or of its gradient), summed over
+all data points. Working with logarithms of the individual likelihoods avoids the underflow of the
+product of many small per-point likelihoods. Terms depending only on the data (like :math:`\\ln d!` for
+Poisson-distributed data) are cached for the most recently used datasets.
+"""
+
+import threading
+
+import numpy as np
+from scipy.special import gammaln, xlogy
+
+
+__all__ = ["log_factorial",
+           "nll_gaussian", "nll_poisson", "nllr_gaussian", "nllr_poisson",
+           "nll_gaussian_gradient", "nll_poisson_gradient"]
+
+
+_LOG_2PI = np.log(2.0 * np.pi)
+
+
+class _DataTermCache(object):
+    """Cache for a term computed from the data only, keeping the results for the most recent datasets."""
+
+    def __init__(self, func, max_size=4):
+        self._func = func
+        self._max_size = max_size
+        self._entries = []  # pairs of (data copy, result), most recent first
+        self._lock = threading.Lock()
+
+    def __call__(self, data):
+        with self._lock:
+            for _i, (_data, _result) in enumerate(self._entries):
+                if _data.shape == data.shape and np.array_equal(_data, data):
+                    if _i:
+                        self._entries.insert(0, self._entries.pop(_i))
+                    return _result
+        _result = self._func(data)
+        with self._lock:
+            self._entries.insert(0, (np.array(data, copy=True), _result))
+            del self._entries[self._max_size:]
+        return _result
+
+
+_log_factorial_cache = _DataTermCache(lambda data: gammaln(data + 1.0))
+
+
+def log_factorial(data):
+    """
+    Calculate :math:`\\ln d!` (the logarithm of the gamma function at :math:`d+1`) elementwise.
+    The result is cached for the most recently used datasets.
+
+    :param data: measurement data
+    :type data: :py:obj:`numpy.ndarray`
+    :rtype: :py:obj:`numpy.ndarray`
+    """
+    return _log_factorial_cache(np.asarray(data, dtype=float))
+
+
+def _sanitize_nll(nll):
+    # guard against returning NaN
+    if np.isnan(nll):
+        return np.inf
+    return nll
+
+
+def nll_gaussian(data, model, total_error):
+    """
+    Gaussian negative log-likelihood :math:`\\sum_j ((d_j - m_j)/\\sigma_j)^2 + \\ln(2\\pi\\sigma_j^2)`.
+
+    :param data: measurement data
+    :param model: model values
+    :param total_error: pointwise total uncertainties
+    :return: cost function value
+    """
+    _data = np.asarray(data, dtype=float)
+    _error = np.asarray(total_error, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _pulls = (_data - np.asarray(model, dtype=float)) / _error
+        _nll = np.sum(_pulls ** 2) + np.sum(2.0 * np.log(_error)) + _data.size * _LOG_2PI
+    return _sanitize_nll(_nll)
+
+
+def nll_poisson(data, model):
+    """
+    Poisson negative log-likelihood :math:`2 \\sum_j m_j - d_j \\ln m_j + \\ln d_j!`.
+
+    :param data: measurement data
+    :param model: model values
+    :return: cost function value
+    """
+    _data = np.asarray(data, dtype=float)
+    _model = np.asarray(model, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _nll = 2.0 * (np.sum(_model) - np.sum(xlogy(_data, _model)) + np.sum(log_factorial(_data)))
+    return _sanitize_nll(_nll)
+
+
+def nllr_gaussian(data, model, total_error):
+    """
+    Gaussian negative log-likelihood ratio: the Gaussian negative log-likelihood, divided by the
+    marginal likelihood :math:`\\prod_j m_j`.
+
+    :param data: measurement data
+    :param model: model values
+    :param total_error: pointwise total uncertainties
+    :return: cost function value
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _nll = nll_gaussian(data, model, total_error) + 2.0 * np.sum(np.log(np.asarray(model, dtype=float)))
+    return _sanitize_nll(_nll)
+
+
+def nllr_poisson(data, model):
+    """
+    Poisson negative log-likelihood ratio: the Poisson negative log-likelihood, divided by the
+    marginal likelihood :math:`\\prod_j m_j`.
+
+    :param data: measurement data
+    :param model: model values
+    :return: cost function value
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _nll = nll_poisson(data, model) + 2.0 * np.sum(np.log(np.asarray(model, dtype=float)))
+    return _sanitize_nll(_nll)
+
+
+def nll_gaussian_gradient(data, model, model_gradient, total_error):
+    """
+    Gradient of :py:func:`nll_gaussian` with respect to the model parameters.
+
+    :param data: measurement data
+    :param model: model values
+    :param model_gradient: derivatives of the model values by the parameters (one row per parameter)
+    :param total_error: pointwise total uncertainties
+    :return: cost function gradient
+    """
+    _model = np.asarray(model, dtype=float)
+    _jac = np.asarray(model_gradient, dtype=float).reshape(-1, _model.size)
+    _weights = (np.asarray(data, dtype=float) - _model) / np.asarray(total_error, dtype=float) ** 2
+    return -2.0 * _jac.dot(_weights.ravel())
+
+
+def nll_poisson_gradient(data, model, model_gradient):
+    """
+    Gradient of :py:func:`nll_poisson` with respect to the model parameters.
+
+    :param data: measurement data
+    :param model: model values
+    :param model_gradient: derivatives of the model values by the parameters (one row per parameter)
+    :return: cost function gradient
+    """
+    _data = np.asarray(data, dtype=float)
+    _model = np.asarray(model, dtype=float)
+    _jac = np.asarray(model_gradient, dtype=float).reshape(-1, _model.size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # empty bins contribute only through the model sum (consistent with 0 * ln(0) = 0)
+        _weights = np.where(_data == 0, 0.0, _data / _model) - 1.0
+    return -2.0 * _jac.dot(_weights.ravel())
@@ -1,57 +1,74 @@
 import abc
-import sys
+import importlib
+import six
+
+from collections import OrderedDict
 
 from ...config import kc
 
 __all__ = ['get_minimizer']
 
-AVAILABLE_MINIMIZERS = dict()
-
-_MINIMIZER_NAME_ALIASES = dict()
-
-_catch_error_class = ImportError
-if sys.version_info >= (3,6):
-    # python version 3.6+ throws a different exception type on import fail...
-    _catch_error_class = ModuleNotFoundError
+# minimizer classes which have been imported successfully
+AVAILABLE_MINIMIZERS = OrderedDict()
 
+# the scipy backend is always imported (its only heavy dependency, numdifftools, is imported on first use)
 try:
     from .scipy_optimize_minimizer import MinimizerScipyOptimize
     __all__.append('MinimizerScipyOptimize')
-    AVAILABLE_MINIMIZERS.update({
-        'scipy': MinimizerScipyOptimize,
-    })
-    _MINIMIZER_NAME_ALIASES['scipy.optimize'] = 'scipy'
-except _catch_error_class:
+    AVAILABLE_MINIMIZERS['scipy'] = MinimizerScipyOptimize
+except ImportError:
     pass
 
-try:
-    from .iminuit_minimizer import MinimizerIMinuit
-    __all__.append('MinimizerIMinuit')
-    AVAILABLE_MINIMIZERS.update({
-        'iminuit': MinimizerIMinuit,
-    })
-except _catch_error_class:
-    pass
+# registry of minimizer backends: name -> (module, class name)
+# the backends other than scipy are only imported when first requested via `get_minimizer`
+_MINIMIZER_REGISTRY = OrderedDict([
+    ('scipy', ('.scipy_optimize_minimizer', 'MinimizerScipyOptimize')),
+    ('iminuit', ('.iminuit_minimizer', 'MinimizerIMinuit')),
+    ('root.tminuit', ('.root_tminuit_minimizer', 'MinimizerROOTTMinuit')),
+])
+
+_MINIMIZER_NAME_ALIASES = {
+    'scipy.optimize': 'scipy',
+    'minuit': 'root.tminuit',
+    'root': 'root.tminuit',
+}
+
+# minimizers which could not be imported (e.g. because a Python package is missing)
+_UNAVAILABLE_MINIMIZERS = set() if AVAILABLE_MINIMIZERS else {'scipy'}
+
+
+def _load_minimizer(minimizer_name):
+    """Import and return the minimizer class registered under a name, or ``None`` if it is unavailable."""
+    _minimizer = AVAILABLE_MINIMIZERS.get(minimizer_name, None)
+    if _minimizer is not None or minimizer_name in _UNAVAILABLE_MINIMIZERS:
+        return _minimizer
+    _module_name, _class_name = _MINIMIZER_REGISTRY[minimizer_name]
+    try:
+        _module = importlib.import_module(_module_name, package=__name__)
+    except ImportError:
+        _UNAVAILABLE_MINIMIZERS.add(minimizer_name)
+        return None
+    _minimizer = AVAILABLE_MINIMIZERS[minimizer_name] = getattr(_module, _class_name)
+    # export the resolved class as a module attribute
+    globals()[_class_name] = _minimizer
+    __all__.append(_class_name)
+    return _minimizer
+
+
+def _get_available_minimizer_names():
+    return [_name for _name in _MINIMIZER_REGISTRY if _load_minimizer(_name) is not None]
 
-try:
-    from .root_tminuit_minimizer import MinimizerROOTTMinuit
-    __all__.append('MinimizerROOTTMinuit')
-    AVAILABLE_MINIMIZERS.update({
-        'root.tminuit': MinimizerROOTTMinuit,
-    })
-    _MINIMIZER_NAME_ALIASES['minuit'] = 'root.tminuit'
-    _MINIMIZER_NAME_ALIASES['root'] = 'root.tminuit'
-except _catch_error_class:
-    pass
-
-# raise if no minimizers can be imported
-if not AVAILABLE_MINIMIZERS:
-    raise RuntimeError("Fatal error: no minimizers found! Please ensure that "
-                       "at least one of the following Python packages is installed: "
-                       "['scipy', 'iminuit', 'ROOT']")
 
 def get_minimizer(minimizer_spec=None):
-    global AVAILABLE_MINIMIZERS
+    """
+    Get a minimizer class by name. The corresponding backend is imported on demand.
+
+    :param minimizer_spec: name of the minimizer (e.g. ``'scipy'``, ``'iminuit'`` or ``'root.tminuit'``).
+                           If ``None``, the first available minimizer from the default list in the
+                           configuration is returned.
+    :type minimizer_spec: str or ``None``
+    :return: the minimizer class
+    """
     # for 'None', return the default minimizer
     if minimizer_spec is None:
         # go through the default minimizers in the order specified in config
@@ -61,21 +78,41 @@ def get_minimizer(minimizer_spec=None):
         for _minimizer_spec in _minimizer_specs:
             _minimizer_spec = _minimizer_spec.lower()
             _minimizer_spec = _MINIMIZER_NAME_ALIASES.get(_minimizer_spec, _minimizer_spec)
-            _minimizer = AVAILABLE_MINIMIZERS.get(_minimizer_spec, None)
+            if _minimizer_spec not in _MINIMIZER_REGISTRY:
+                continue
+            _minimizer = _load_minimizer(_minimizer_spec)
             if _minimizer is not None:
                 return _minimizer
 
+        _available_minimizers = _get_available_minimizer_names()
+        if not _available_minimizers:
+            raise RuntimeError("Fatal error: no minimizers found! Please ensure that "
+                               "at least one of the following Python packages is installed: "
+                               "['scipy', 'iminuit', 'ROOT']")
         raise ValueError(
-            "Could not find any minimizer in default list: {}! Available: {}".format(_minimizer_specs, list(AVAILABLE_MINIMIZERS.keys())))
+            "Could not find any minimizer in default list: {}! Available: {}".format(_minimizer_specs, _available_minimizers))
     else:
         _minimizer_spec = minimizer_spec.lower()
         _minimizer_spec = _MINIMIZER_NAME_ALIASES.get(_minimizer_spec, _minimizer_spec)
-        _minimizer = AVAILABLE_MINIMIZERS.get(_minimizer_spec, None)
-        if _minimizer is not None:
-            return _minimizer
+        if _minimizer_spec in _MINIMIZER_REGISTRY:
+            _minimizer = _load_minimizer(_minimizer_spec)
+            if _minimizer is not None:
+                return _minimizer
 
         raise ValueError(
-            "Unknown minimizer '{}'! Available: {}".format(minimizer_spec, list(AVAILABLE_MINIMIZERS.keys())))
+            "Unknown minimizer '{}'! Available: {}".format(minimizer_spec, _get_available_minimizer_names()))
+
+
+def __getattr__(name):
+    # give access to the lazily imported minimizer classes as module attributes (Python 3.7+ only;
+    # on older versions, they become module attributes once resolved by `get_minimizer`)
+    for _minimizer_name, (_, _class_name) in six.iteritems(_MINIMIZER_REGISTRY):
+        if name == _class_name:
+            _minimizer = _load_minimizer(_minimizer_name)
+            if _minimizer is not None:
+                return _minimizer
+            break
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
 
 
 class MinimizerBase(object):
@@ -13,11 +13,12 @@ class MinimizerIMinuitException(Exception):
 class MinimizerIMinuit(object):
     def __init__(self,
                  parameter_names, parameter_values, parameter_errors,
-                 function_to_minimize, strategy = 1):
+                 function_to_minimize, strategy = 1, gradient_to_minimize=None):
         self._par_names = parameter_names
         self._strategy = strategy
         
         self._func_handle = function_to_minimize
+        self._grad_handle = gradient_to_minimize
         self._err_def = 1.0
         self._tol = 0.001
 
@@ -61,6 +62,7 @@ class MinimizerIMinuit(object):
             self.__iminuit = iminuit.Minuit(self._func_handle,
                                         forced_parameters=self._par_names,
                                         errordef=self._err_def,
+                                        grad=self._grad_handle,
                                         **self._minimizer_param_dict)
             self.__iminuit.set_print_level(-1)
             self.__iminuit.set_strategy(self._strategy)
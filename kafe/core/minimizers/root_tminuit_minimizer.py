@@ -19,11 +19,12 @@ class MinimizerROOTTMinuitException(Exception):
 class MinimizerROOTTMinuit(object):
     def __init__(self,
                  parameter_names, parameter_values, parameter_errors,
-                 function_to_minimize, strategy = 1):
+                 function_to_minimize, strategy = 1, gradient_to_minimize=None):
         self._par_names = parameter_names
         self._strategy = strategy
 
         self._func_handle = function_to_minimize
+        self._grad_handle = gradient_to_minimize
         self._err_def = 1.0
         self._tol = 0.001
 
@@ -80,6 +81,9 @@ class MinimizerROOTTMinuit(object):
 
         # set gMinuit parameters
         error_code = Long(0)
+        if self._grad_handle is not None:
+            # use the user-supplied gradient (without checking it against numerical derivatives)
+            self.__gMinuit.mnexcm("SET GRA", arr('d', [1]), 1, error_code)
         for _pid, (_pn, _pv, _pe) in enumerate(zip(self._par_names, self._par_val, self._par_err)):
             self.__gMinuit.mnparm(_pid,
                                   _pn,
@@ -135,9 +139,9 @@ class MinimizerROOTTMinuit(object):
 
         **derivatives** : C array
             If the user chooses to calculate the first derivative of the
-            function inside the `FCN`, this value should be written here. This
-            interface to `Minuit` ignores this derivative, however, so
-            calculating this inside the `FCN` has no effect (yet).
+            function inside the `FCN`, this value should be written here.
+            This is only done if a gradient handle has been supplied and
+            `Minuit` requests it (**internal_flag** equal to 2).
 
         **f** : C array
             The desired function value is in f[0] after execution.
@@ -161,6 +165,11 @@ class MinimizerROOTTMinuit(object):
         # call the Python implementation of FCN.
         f[0] = self._func_handle(*parameter_list)
 
+        # fill in the gradient, if requested
+        if internal_flag == 2 and self._grad_handle is not None:
+            for _par_id, _grad_val in enumerate(self._grad_handle(*parameter_list)):
+                derivatives[_par_id] = _grad_val
+
     def _insert_zeros_for_fixed(self, submatrix):
         """
         Takes the partial error matrix (submatrix) and adds
@@ -1,4 +1,8 @@
 from __future__ import print_function
+import contextlib
+import multiprocessing
+
+from kafe.config import kc
 from kafe.core.contour import ContourFactory
 from kafe.core.error import CovMat
 try:
@@ -8,15 +12,69 @@ except ImportError:
     raise
 
 import numpy as np
-import numdifftools as nd
+
+from kafe.tools import LazyModule, can_fork_worker_processes, get_worker_object, worker_pool
+
+nd = LazyModule('numdifftools')  # only needed for numerical Hessians/gradients, imported on first use
 
 class MinimizerScipyOptimizeException(Exception):
     pass
 
+
+# -- helpers for evaluating profile scans and contour grid points in a worker pool
+
+
+def _minimize_with_fixed_parameters(func_handle, start_values, fixed_ids, fixed_values,
+                                    constraints, bounds, tolerance):
+    """Minimize ``func_handle`` with the parameters at indices ``fixed_ids`` held at ``fixed_values``."""
+    _local_constraints = list(constraints)
+    for _id, _value in zip(fixed_ids, fixed_values):
+        _local_constraints.append({'type': 'eq', 'fun': lambda x, _id=_id, _value=_value: x[_id] - _value})
+    return opt.minimize(lambda args: func_handle(*args),
+                        start_values,
+                        args=(),
+                        method="slsqp",
+                        jac=None,
+                        bounds=bounds,
+                        constraints=_local_constraints,
+                        tol=tolerance,
+                        callback=None,
+                        options=dict(maxiter=6000, disp=False))
+
+
+def _scan_with_fixed_parameters(func_handle, start_values, fixed_ids, fixed_values_sequence,
+                                constraints, bounds, tolerance):
+    """
+    Minimize ``func_handle`` for each entry of ``fixed_values_sequence`` in turn, starting
+    each minimization from the solution found for the previous entry.
+    """
+    _start_values = np.array(start_values, dtype=float)
+    _fixed_ids = list(fixed_ids)
+    _funs = []
+    for _fixed_values in fixed_values_sequence:
+        _start_values[_fixed_ids] = _fixed_values
+        _result = _minimize_with_fixed_parameters(func_handle, _start_values, fixed_ids, _fixed_values,
+                                                  constraints, bounds, tolerance)
+        _start_values = np.array(_result.x, dtype=float)
+        _funs.append(_result.fun)
+    return _funs
+
+
+def _eval_grid_point_in_worker(fixed_values):
+    _func_handle, _start_values, _fixed_ids, _constraints, _bounds, _tolerance = get_worker_object()
+    return _minimize_with_fixed_parameters(_func_handle, _start_values, _fixed_ids, fixed_values,
+                                           _constraints, _bounds, _tolerance).fun
+
+
+def _scan_in_worker(fixed_values_sequence):
+    _func_handle, _start_values, _fixed_ids, _constraints, _bounds, _tolerance = get_worker_object()
+    return _scan_with_fixed_parameters(_func_handle, _start_values, _fixed_ids, fixed_values_sequence,
+                                       _constraints, _bounds, _tolerance)
+
 class MinimizerScipyOptimize(object):
     def __init__(self,
                  parameter_names, parameter_values, parameter_errors,
-                 function_to_minimize, method="slsqp"):
+                 function_to_minimize, method="slsqp", gradient_to_minimize=None):
         self._par_names = parameter_names
         self._par_val = parameter_values
         self._par_err = parameter_errors
@@ -31,6 +89,7 @@ class MinimizerScipyOptimize(object):
         """
 
         self._func_handle = function_to_minimize
+        self._grad_handle = gradient_to_minimize
         self._err_def = 1.0
         self._tol = 1e-6
 
@@ -161,6 +220,9 @@ class MinimizerScipyOptimize(object):
     def _func_wrapper_unpack_args(self, args):
         return self._func_handle(*args)
 
+    def _grad_wrapper_unpack_args(self, args):
+        return np.asarray(self._grad_handle(*args), dtype=float)
+
     def minimize(self, max_calls=6000):
         self._par_constraints = []
         for _par_id, (_pf, _pv) in enumerate(zip(self._par_fixed, self._par_val)):
@@ -174,7 +236,7 @@ class MinimizerScipyOptimize(object):
                                         self._par_val,
                                         args=(),
                                         method=self._method,
-                                        jac=None,
+                                        jac=self._grad_wrapper_unpack_args if self._grad_handle is not None else None,
                                         hess=None, hessp=None,
                                         bounds=self._par_bounds,
                                         constraints=self._par_constraints,
@@ -203,6 +265,8 @@ class MinimizerScipyOptimize(object):
             _initial_points = minimizer_contour_kwargs.pop("initial_points", 1)
             _iterations = minimizer_contour_kwargs.pop("iterations", 5)
             _area_scale_factor = minimizer_contour_kwargs.pop("area_scale_factor", 1.5)
+            _n_workers = minimizer_contour_kwargs.pop("n_workers", kc('core', 'minimizers', 'scipy', 'contour_n_workers'))
+            _backend = minimizer_contour_kwargs.pop("backend", kc('core', 'minimizers', 'scipy', 'contour_backend'))
         else:
             raise MinimizerScipyOptimizeException("Unknown algorithm: {}".format(_algorithm))
         
@@ -214,7 +278,8 @@ class MinimizerScipyOptimize(object):
         elif _algorithm == "heuristic_grid":
             return self._contour_heuristic_grid(parameter_name_1, parameter_name_2, sigma=sigma, 
                                                 initial_points=_initial_points, iterations=_iterations,
-                                                area_scale_factor=_area_scale_factor)
+                                                area_scale_factor=_area_scale_factor,
+                                                n_workers=_n_workers, backend=_backend)
 
     def _contour_old(self, parameter_name_1, parameter_name_2, sigma=1.0, numpoints = 20, strategy=1):
         if strategy == 0:
@@ -298,14 +363,14 @@ class MinimizerScipyOptimize(object):
         return _contour_array
     
     def _contour_heuristic_grid(self, parameter_name_1, parameter_name_2, sigma=1.0, initial_points=1,
-                                iterations=5, area_scale_factor=1.5):
+                                iterations=5, area_scale_factor=1.5, n_workers=1, backend="process"):
         initial_points = int(initial_points)
         iterations = int(iterations)
 
         if initial_points < 1:
-            raise MinimizerScipyOptimize("initial_points must be a >= 1")
+            raise MinimizerScipyOptimizeException("initial_points must be a >= 1")
         if iterations < 0:
-            raise MinimizerScipyOptimize("iterations must be a >= 0")
+            raise MinimizerScipyOptimizeException("iterations must be a >= 0")
         
         _initial_points_per_axis = 1 + initial_points * 2
         _target_points_per_axis = 1 + initial_points * 2 ** (iterations + 1)
@@ -326,88 +391,73 @@ class MinimizerScipyOptimize(object):
         _confirmed_coords = set()
         _unsure_coords = set()
 
-        for _x in range(0, _target_points_per_axis, _x_step):
-            for _y in range(0, _target_points_per_axis, _y_step):
-                    _local_constraints = [{'type' : 'eq', 'fun' : lambda x: x[_ids[0]] - _x_values[_x]},
-                                          {'type' : 'eq', 'fun' : lambda x: x[_ids[1]] - _y_values[_y]}]
-                    _grid[_x,_y] = self._calc_fun_with_constraints(_local_constraints)
-
-        
-        _min_fun = min(self.function_value, _grid[_min_coords,_min_coords])
-        _contour_fun = _min_fun + sigma ** 2
-
-        _iterations = 0
-        while _x_step > 0 and _y_step > 1:
-            if _iterations % 2 == 0:
-                _x_0 = int(_x_step / 2)
-                _y_0 = int(_y_step / 2)
-                _vector_1 = (int(_x_step / 2), int(_y_step / 2))
-                _vector_2 = (int(_x_step / 2), -int(_y_step / 2))
-            else:
-                _x_0 = 0
-                _y_0 = 0
-                _vector_1 = (_x_step, 0)
-                _vector_2 = (0, int(_y_step / 2))
-                
-            for _x in range(_x_0, _target_points_per_axis, _x_step):
-                if _iterations % 2 == 1 and _x % (2 * _x_step) == 0:
-                    _current_y_0 = _y_0 + int(_y_step / 2)
+        # grid points are independent of each other: evaluate each batch (initial grid, refinement passes
+        # and waves of unsure points) at once, optionally distributing it over a pool of workers
+        with self._worker_pool(_ids, n_workers, backend) as _pool:
+            _evaluate = lambda coords: self._evaluate_grid_points(
+                _pool, _ids, [(_x_values[_x], _y_values[_y]) for _x, _y in coords])
+
+            _initial_coords = [(_x, _y)
+                               for _x in range(0, _target_points_per_axis, _x_step)
+                               for _y in range(0, _target_points_per_axis, _y_step)]
+            for (_x, _y), _fun in zip(_initial_coords, _evaluate(_initial_coords)):
+                _grid[_x, _y] = _fun
+
+            _min_fun = min(self.function_value, _grid[_min_coords,_min_coords])
+            _contour_fun = _min_fun + sigma ** 2
+
+            _iterations = 0
+            while _x_step > 0 and _y_step > 1:
+                if _iterations % 2 == 0:
+                    _x_0 = int(_x_step / 2)
+                    _y_0 = int(_y_step / 2)
+                    _vector_1 = (int(_x_step / 2), int(_y_step / 2))
+                    _vector_2 = (int(_x_step / 2), -int(_y_step / 2))
                 else:
-                    _current_y_0 = _y_0
-                for _y in range(_current_y_0, _target_points_per_axis, _y_step):
-                    _point_value = self._heuristic_point_evaluation(_contour_fun, _grid, _x, _y, _vector_1, _vector_2)
-                    if _point_value == -1:
-                        _local_constraints = [{'type' : 'eq', 'fun' : lambda x: x[_ids[0]] - _x_values[_x]},
-                                              {'type' : 'eq', 'fun' : lambda x: x[_ids[1]] - _y_values[_y]}]
-                        _grid[_x, _y] = self._calc_fun_with_constraints(_local_constraints)
-                        _confirmed_coords.add((_x,_y))
-                        if _iterations % 2 == 0:
-                            _unsure_coords.add((_x - _x_step,   _y))
-                            _unsure_coords.add((_x,             _y - _y_step))
-                            _unsure_coords.add((_x + _x_step,   _y))
-                            _unsure_coords.add((_x,             _y + _y_step))
-                        else:
-                            _unsure_coords.add((_x - _x_step, _y - int(_y_step / 2)))
-                            _unsure_coords.add((_x - _x_step, _y + int(_y_step / 2)))
-                            _unsure_coords.add((_x + _x_step, _y - int(_y_step / 2)))
-                            _unsure_coords.add((_x + _x_step, _y + int(_y_step / 2)))
+                    _x_0 = 0
+                    _y_0 = 0
+                    _vector_1 = (_x_step, 0)
+                    _vector_2 = (0, int(_y_step / 2))
+
+                # the points of one pass only depend on points of previous passes
+                _pass_coords = []
+                for _x in range(_x_0, _target_points_per_axis, _x_step):
+                    if _iterations % 2 == 1 and _x % (2 * _x_step) == 0:
+                        _current_y_0 = _y_0 + int(_y_step / 2)
                     else:
-                        _grid[_x, _y] = _point_value
-            
-            while _unsure_coords:
-                _current_coords = _unsure_coords.pop()
-                if (_current_coords[0] < 0 or _current_coords[0] >= _target_points_per_axis or 
-                    _current_coords[1] < 0 or _current_coords[1] >= _target_points_per_axis):
-                    continue
-                if _current_coords in _confirmed_coords:
-                    continue
-                _x = _current_coords[0]
-                _y = _current_coords[1]
-                _local_constraints = [{'type' : 'eq', 'fun' : lambda x: x[_ids[0]] - _x_values[_x]},
-                                      {'type' : 'eq', 'fun' : lambda x: x[_ids[1]] - _y_values[_y]}]
-                _current_fun = self._calc_fun_with_constraints(_local_constraints)
-                _grid_fun = _grid[_current_coords[0], _current_coords[1]]
-                if ((_current_fun > _contour_fun and _grid_fun < _contour_fun) or
-                    (_current_fun < _contour_fun and _grid_fun > _contour_fun)):
-                        if _iterations % 2 == 0:
-                            _unsure_coords.add((_x - _x_step,   _y))
-                            _unsure_coords.add((_x,             _y - _y_step))
-                            _unsure_coords.add((_x + _x_step,   _y))
-                            _unsure_coords.add((_x,             _y + _y_step))
+                        _current_y_0 = _y_0
+                    for _y in range(_current_y_0, _target_points_per_axis, _y_step):
+                        _point_value = self._heuristic_point_evaluation(_contour_fun, _grid, _x, _y, _vector_1, _vector_2)
+                        if _point_value == -1:
+                            _pass_coords.append((_x, _y))
                         else:
-                            _unsure_coords.add((_x - _x_step, _y - int(_y_step / 2)))
-                            _unsure_coords.add((_x - _x_step, _y + int(_y_step / 2)))
-                            _unsure_coords.add((_x + _x_step, _y - int(_y_step / 2)))
-                            _unsure_coords.add((_x + _x_step, _y + int(_y_step / 2)))
-                _grid[_current_coords[0], _current_coords[1]] = _current_fun
-                _confirmed_coords.add(_current_coords)
-                
-            if _iterations % 2 == 0:
-                _x_step = int(_x_step / 2)
-            else:
-                _y_step = int(_y_step / 2)
-            _iterations += 1
-            
+                            _grid[_x, _y] = _point_value
+
+                for (_x, _y), _fun in zip(_pass_coords, _evaluate(_pass_coords)):
+                    _grid[_x, _y] = _fun
+                    _confirmed_coords.add((_x, _y))
+                    self._add_unsure_grid_neighbors(_unsure_coords, _x, _y, _x_step, _y_step, _iterations)
+
+                while _unsure_coords:
+                    _wave_coords = sorted(
+                        _coords for _coords in _unsure_coords
+                        if (0 <= _coords[0] < _target_points_per_axis and 0 <= _coords[1] < _target_points_per_axis
+                            and _coords not in _confirmed_coords))
+                    _unsure_coords = set()
+                    for (_x, _y), _current_fun in zip(_wave_coords, _evaluate(_wave_coords)):
+                        _grid_fun = _grid[_x, _y]
+                        if ((_current_fun > _contour_fun and _grid_fun < _contour_fun) or
+                            (_current_fun < _contour_fun and _grid_fun > _contour_fun)):
+                            self._add_unsure_grid_neighbors(_unsure_coords, _x, _y, _x_step, _y_step, _iterations)
+                        _grid[_x, _y] = _current_fun
+                        _confirmed_coords.add((_x, _y))
+
+                if _iterations % 2 == 0:
+                    _x_step = int(_x_step / 2)
+                else:
+                    _y_step = int(_y_step / 2)
+                _iterations += 1
+
         _left_cutoff = 0
         _right_cutoff = _target_points_per_axis - 1
         _bottom_cutoff = 0
@@ -447,6 +497,53 @@ class MinimizerScipyOptimize(object):
         self._func_wrapper_unpack_args(self._par_val)
         return ContourFactory.create_grid_contour(_x_values, _y_values, _grid, sigma)
     
+    @contextlib.contextmanager
+    def _worker_pool(self, ids, n_workers, backend):
+        """
+        Context providing a pool of workers for minimizations with the parameters ``ids`` fixed
+        (``None`` for serial evaluation).
+        """
+        if n_workers is None:
+            n_workers = multiprocessing.cpu_count()
+        n_workers = int(n_workers)
+        if n_workers < 1:
+            raise MinimizerScipyOptimizeException("n_workers must be a >= 1")
+        if backend not in ("process", "thread"):
+            raise MinimizerScipyOptimizeException("Unknown backend: {} (expected 'process' or 'thread')".format(backend))
+        if n_workers == 1:
+            yield None
+            return
+        if backend == "process" and not can_fork_worker_processes():
+            raise MinimizerScipyOptimizeException("Cannot use backend 'process': worker processes cannot be "
+                                                  "forked on this platform. Use backend 'thread' instead.")
+        _worker_object = (self._func_handle, np.array(self._par_val, dtype=float), ids,
+                          self._par_constraints, self._par_bounds, self.tolerance)
+        with worker_pool(_worker_object, n_workers, backend) as _pool:
+            yield _pool
+
+    def _evaluate_grid_points(self, pool, ids, points):
+        """Calculate the function minimum with the parameters ``ids`` fixed to each of the ``points``."""
+        if not points:
+            return []
+        if pool is None:
+            return [_minimize_with_fixed_parameters(self._func_handle, self._par_val, ids, _point,
+                                                    self._par_constraints, self._par_bounds, self.tolerance).fun
+                    for _point in points]
+        return pool.map(_eval_grid_point_in_worker, points)
+
+    @staticmethod
+    def _add_unsure_grid_neighbors(unsure_coords, x, y, x_step, y_step, iteration):
+        if iteration % 2 == 0:
+            unsure_coords.add((x - x_step,   y))
+            unsure_coords.add((x,            y - y_step))
+            unsure_coords.add((x + x_step,   y))
+            unsure_coords.add((x,            y + y_step))
+        else:
+            unsure_coords.add((x - x_step, y - int(y_step / 2)))
+            unsure_coords.add((x - x_step, y + int(y_step / 2)))
+            unsure_coords.add((x + x_step, y - int(y_step / 2)))
+            unsure_coords.add((x + x_step, y + int(y_step / 2)))
+
     @staticmethod
     def _heuristic_point_evaluation(contour_fun, grid, x, y, vector_1, vector_2):
         _adjacent_points = MinimizerScipyOptimize._get_adjacent_grid_points(grid, x, y, vector_1, vector_2)
@@ -606,15 +703,32 @@ class MinimizerScipyOptimize(object):
                                         options=dict(maxiter=6000, disp=False))
         return _result.fun
         
-    def profile(self, parameter_name, bins=21, bound=2, args=None, subtract_min=False):
+    def profile(self, parameter_name, bins=21, bound=2, args=None, subtract_min=False, n_workers=None, backend=None):
+        if n_workers is None:
+            n_workers = kc('core', 'minimizers', 'scipy', 'profile_n_workers')
+        if backend is None:
+            backend = kc('core', 'minimizers', 'scipy', 'profile_backend')
+
         _par_id = self._par_names.index(parameter_name)
         _par_err = self._par_err[_par_id]
         _par_min = self._par_val[_par_id]
         _par = np.linspace(start=_par_min - bound * _par_err, stop=_par_min + bound * _par_err, num=bins, endpoint=True)
         _y_offset = self.function_value if subtract_min else 0
-        
-        _y = np.empty(bins)
-        for i in range(bins):
-            _y[i] = self._calc_fun_with_constraints([{"type" : "eq", "fun" : lambda x: x[_par_id] - _par[i]}])
+
+        # walk outward from the minimum in two independent branches, so that every
+        # minimization can start from the solution found for the neighbouring point
+        _n_left = bins // 2
+        _branches = [[(_p,) for _p in _par[_n_left - 1::-1]] if _n_left else [],
+                     [(_p,) for _p in _par[_n_left:]]]
+
+        with self._worker_pool((_par_id,), min(n_workers, 2), backend) as _pool:
+            if _pool is None:
+                _left, _right = [_scan_with_fixed_parameters(self._func_handle, self._par_val, (_par_id,), _branch,
+                                                             self._par_constraints, self._par_bounds, self.tolerance)
+                                 for _branch in _branches]
+            else:
+                _left, _right = _pool.map(_scan_in_worker, _branches)
+
+        _y = np.asarray(_left[::-1] + _right)
         self._func_wrapper_unpack_args(self._par_val)
         return np.asarray([_par, _y - _y_offset])
@@ -0,0 +1,49 @@
+"""
+Custom ``matplotlib`` tick locators and formatters. Kept in a separate module, since subclassing
+the ``matplotlib`` base classes requires importing ``matplotlib``.
+"""
+
+import numpy as np
+
+from ...config import lazy_import_matplotlib
+
+plticker = lazy_import_matplotlib('matplotlib.ticker')
+
+
+class SigmaLocator(plticker.Locator):
+    """
+    Create ticks at evenly spaced offsets from a central value.
+    The offsets are integer multiples of a fixed value ('sigma')
+    """
+    def __init__(self, central_value, sigma):
+        self._cval = central_value
+        self._sigma = sigma
+
+    def __call__(self):
+        """Return the locations of the ticks"""
+        _vmin, _vmax = self.axis.get_view_interval()
+        return self.tick_values(_vmin, _vmax)
+
+    def tick_values(self, vmin, vmax):
+        _n_sigma_dn = int((vmin - self._cval)/self._sigma)
+        _n_sigma_up = int((vmax - self._cval)/self._sigma)
+        return self.raise_if_exceeds(
+            np.arange(_n_sigma_dn, _n_sigma_up+1, 1) * self._sigma + self._cval)
+
+
+class SigmaFormatter(plticker.Formatter):
+    """
+    Set the tick labels to indicate the distance to the
+    central value, in intervals
+    """
+    def __init__(self, central_value, sigma):
+        """set the tick labels to correspond to sigma"""
+        self._cval = central_value
+        self._sigma = sigma
+
+    def __call__(self, x, pos=None):
+        'Return the format for tick val *x* at position *pos*'
+        # _vmin, _vmax = self.axis.get_data_interval()
+        _numeric_label = (x - self._cval)/self._sigma
+        _str_label = r"%.2g$\sigma$" % (_numeric_label,)
+        return _str_label
@@ -138,8 +138,8 @@ class DataContainerBase(object):
         Add a matrix uncertainty source to the data container.
         Returns an error id which uniquely identifies the created error source.
 
-        :param err_matrix: covariance or correlation matrix
-        :param matrix_type: one of ``'covariance'``/``'cov'`` or ``'correlation'``/``'cor'``
+        :param err_matrix: covariance or correlation matrix (dense or :py:mod:`scipy.sparse`)
+        :param matrix_type: one of ``'covariance'``/``'cov'``, ``'correlation'``/``'cor'`` or ``'banded'`` (lower bands of a covariance matrix)
         :type matrix_type: str
         :param name: unique name for this uncertainty source. If ``None``, the name
                      of the error source will be set to a random alphanumeric string.
@@ -4,9 +4,9 @@ import numpy as np
 import re
 import string
 
+from ...core import likelihood
 from .format import ModelParameterFormatter, CostFunctionFormatter
 
-from scipy.stats import poisson, norm
 
 
 __all__ = ["CostFunctionBase",
@@ -19,7 +19,8 @@ def _generic_chi2(data, model,
                   cov_mat_inverse=None,
                   err=None, err_relative_to=None,
                   fail_on_no_matrix=False,
-                  fail_on_zero_errors=False):
+                  fail_on_zero_errors=False,
+                  cov_mat=None):
 
     data = np.asarray(data)
     model = np.asarray(model)
@@ -30,6 +31,14 @@ def _generic_chi2(data, model,
 
     _res = (data - model)
 
+    # if a covariance matrix object is given, use its factorization to whiten the residuals
+    if cov_mat is not None:
+        try:
+            _res_whitened = cov_mat.whiten(_res)
+            return _res_whitened.dot(_res_whitened)
+        except np.linalg.LinAlgError:
+            pass  # matrix is singular -> proceed as if no matrix was given
+
     # if a covariance matrix inverse is given, use it
     if cov_mat_inverse is not None:
         return _res.dot(cov_mat_inverse).dot(_res)[0, 0]
@@ -62,6 +71,47 @@ def _generic_chi2(data, model,
     # return sum of squared residuals
     return np.sum(_res ** 2)
 
+def _generic_chi2_gradient(data, model, model_gradient,
+                           err=None,
+                           fail_on_no_matrix=False,
+                           fail_on_zero_errors=False,
+                           cov_mat=None):
+    """gradient of :py:func:`_generic_chi2` with respect to the model parameters (same fallback behavior)"""
+
+    data = np.asarray(data)
+    model = np.asarray(model)
+
+    if model.shape != data.shape:
+        raise CostFunctionException("'data' and 'model' must have the same shape! Got %r and %r..."
+                                    % (data.shape, model.shape))
+
+    # one row per parameter: d(model)/d(par)
+    _jac = np.asarray(model_gradient, dtype=float).reshape(-1, model.size)
+    _res = (data - model).ravel()
+
+    # if a covariance matrix object is given, solve using its cached factorization
+    if cov_mat is not None:
+        try:
+            return -2.0 * _jac.dot(cov_mat.solve(_res))
+        except np.linalg.LinAlgError:
+            pass  # matrix is singular -> proceed as if no matrix was given
+
+    if fail_on_no_matrix:
+        raise np.linalg.LinAlgError("Covariance matrix is singular!")
+
+    # otherwise, if an array of pointwise errors is given, use that
+    if err is not None:
+        err = np.asarray(err).ravel()
+        if np.any(err==0.0):
+            if fail_on_zero_errors:
+                raise CostFunctionException("'err' must not contain any zero values!")
+            else:
+                pass  # assume err=1.0
+        else:
+            _res = _res/err**2
+
+    return -2.0 * _jac.dot(_res)
+
 def _generic_chi2_nuisance(data, model, nuisance_vector=np.array([]), nuisance_cor_design_mat=None, uncor_cov_mat_inverse=None,
                            fail_on_no_matrix=False):
 
@@ -119,13 +169,17 @@ class CostFunctionBase(object):
     EXCEPTION_TYPE = CostFunctionException
     FORMATTER_TYPE = CostFunctionFormatter
 
-    def __init__(self, cost_function):
+    def __init__(self, cost_function, cost_function_gradient=None):
         """
         Construct :py:class:`CostFunction` object (a wrapper for a native Python function):
 
         :param cost_function: function handle
+        :param cost_function_gradient: function handle for the gradient of the cost function with respect to
+                                       the fit parameters (optional). It takes the same arguments as the cost
+                                       function, plus the model gradient.
         """
         self._cost_function_handle = cost_function
+        self._cost_function_gradient_handle = cost_function_gradient
         self._cost_function_argspec = inspect.getargspec(self._cost_function_handle)
         self._cost_function_argcount = self._cost_function_handle.__code__.co_argcount
         self._validate_cost_function_raise()
@@ -163,6 +217,10 @@ class CostFunctionBase(object):
         self._formatter = self.__class__.FORMATTER_TYPE(self.name,
                                                         arg_formatters=self._arg_formatters)
 
+    def _get_builtin_gradient(self, builtin_cost_function):
+        """look up the gradient belonging to a built-in cost function (named ``<cost function name>_gradient``)"""
+        return getattr(self, builtin_cost_function.__name__ + '_gradient', None)
+
     def __call__(self, *args, **kwargs):
         return self._cost_function_handle(*args, **kwargs)
 
@@ -176,6 +234,11 @@ class CostFunctionBase(object):
         """The cost function handle"""
         return self._cost_function_handle
 
+    @property
+    def gradient_func(self):
+        """The handle of the cost function gradient (or ``None`` if no gradient is available)"""
+        return self._cost_function_gradient_handle
+
     @property
     def argspec(self):
         """The model function argument specification, as returned by :py:meth:`inspect.getargspec`"""
@@ -253,7 +316,8 @@ class CostFunctionBase_Chi2(CostFunctionBase):
         else:
             raise CostFunctionException("Unknown value '%s' for 'errors_to_use': must be one of ('covariance', 'pointwise', None)")
 
-        super(CostFunctionBase_Chi2, self).__init__(cost_function=_chi2_func)
+        super(CostFunctionBase_Chi2, self).__init__(cost_function=_chi2_func,
+                                                    cost_function_gradient=self._get_builtin_gradient(_chi2_func))
 
         self._formatter.latex_name = "\chi^2"
         self._formatter.name = "chi2"
@@ -277,7 +341,7 @@ class CostFunctionBase_Chi2(CostFunctionBase):
         return _generic_chi2(data=data, model=model, cov_mat_inverse=None, fail_on_no_matrix=False)
 
     @staticmethod
-    def chi2_covariance(data, model, total_cov_mat_inverse):
+    def chi2_covariance(data, model, total_cov_mat_object):
         r"""A least-squares cost function calculated from 'y' data and model values,
         considering the covariance matrix of the 'y' measurements.
 
@@ -286,13 +350,16 @@ class CostFunctionBase_Chi2(CostFunctionBase):
 
         In the above, :math:`{\bf d}` are the measurements, :math:`{\bf m}` are the model
         predictions, and :math:`{{\bf V}^{-1}}` is the inverse of the total covariance matrix.
+        The inverse is not calculated explicitly: :math:`\chi^2` is the squared norm of the residual
+        vector whitened by the (cached) Cholesky factor of :math:`{\bf V}`.
 
         :param y_data: measurement data
         :param y_model: model values
-        :param y_total_cov_mat_inverse: inverse of the total covariance matrix
+        :param total_cov_mat_object: the total covariance matrix
+        :type total_cov_mat_object: :py:class:`~kafe.core.error.CovMat`
         :return: cost function value
         """
-        return _generic_chi2(data=data, model=model, cov_mat_inverse=total_cov_mat_inverse, fail_on_no_matrix=True)
+        return _generic_chi2(data=data, model=model, cov_mat=total_cov_mat_object, fail_on_no_matrix=True)
 
     @staticmethod
     def chi2_pointwise_errors(data, model, total_error):
@@ -313,13 +380,76 @@ class CostFunctionBase_Chi2(CostFunctionBase):
         return _generic_chi2(data=data, model=model, cov_mat_inverse=None, err=total_error, fail_on_zero_errors=True)
 
     @staticmethod
-    def chi2_covariance_fallback(data, model, total_cov_mat_inverse):
-        return _generic_chi2(data=data, model=model, cov_mat_inverse=total_cov_mat_inverse, fail_on_no_matrix=False)
+    def chi2_covariance_fallback(data, model, total_cov_mat_object):
+        return _generic_chi2(data=data, model=model, cov_mat=total_cov_mat_object, fail_on_no_matrix=False)
 
     @staticmethod
     def chi2_pointwise_errors_fallback(data, model, total_error):
         return _generic_chi2(data=data, model=model, cov_mat_inverse=None, err=total_error, fail_on_zero_errors=False)
 
+    @staticmethod
+    def chi2_no_errors_gradient(data, model, model_gradient):
+        r"""Gradient of :py:meth:`chi2_no_errors` with respect to the model parameters:
+
+        .. math::
+            \nabla C = -2\,{\bf J}^{\top} ({\bf d} - {\bf m})
+
+        In the above, :math:`{\bf J}` is the derivative of the model predictions with respect
+        to the model parameters.
+
+        :param data: measurement data
+        :param model: model values
+        :param model_gradient: derivatives of the model values by the parameters (one row per parameter)
+        :return: cost function gradient
+        """
+        return _generic_chi2_gradient(data=data, model=model, model_gradient=model_gradient, fail_on_no_matrix=False)
+
+    @staticmethod
+    def chi2_covariance_gradient(data, model, model_gradient, total_cov_mat_object):
+        r"""Gradient of :py:meth:`chi2_covariance` with respect to the model parameters:
+
+        .. math::
+            \nabla C = -2\,{\bf J}^{\top} {{\bf V}^{-1}} ({\bf d} - {\bf m})
+
+        In the above, :math:`{\bf J}` is the derivative of the model predictions with respect
+        to the model parameters. The linear system is solved using the cached factorization of :math:`{\bf V}`.
+
+        :param data: measurement data
+        :param model: model values
+        :param model_gradient: derivatives of the model values by the parameters (one row per parameter)
+        :param total_cov_mat_object: the total covariance matrix
+        :type total_cov_mat_object: :py:class:`~kafe.core.error.CovMat`
+        :return: cost function gradient
+        """
+        return _generic_chi2_gradient(data=data, model=model, model_gradient=model_gradient,
+                                      cov_mat=total_cov_mat_object, fail_on_no_matrix=True)
+
+    @staticmethod
+    def chi2_pointwise_errors_gradient(data, model, model_gradient, total_error):
+        r"""Gradient of :py:meth:`chi2_pointwise_errors` with respect to the model parameters:
+
+        .. math::
+            \nabla C = -2 \sum_k \frac{d_k - m_k}{\sigma_k^2} \nabla m_k
+
+        :param data: measurement data
+        :param model: model values
+        :param model_gradient: derivatives of the model values by the parameters (one row per parameter)
+        :param total_error: total measurement uncertainties
+        :return: cost function gradient
+        """
+        return _generic_chi2_gradient(data=data, model=model, model_gradient=model_gradient,
+                                      err=total_error, fail_on_zero_errors=True)
+
+    @staticmethod
+    def chi2_covariance_fallback_gradient(data, model, model_gradient, total_cov_mat_object):
+        return _generic_chi2_gradient(data=data, model=model, model_gradient=model_gradient,
+                                      cov_mat=total_cov_mat_object, fail_on_no_matrix=False)
+
+    @staticmethod
+    def chi2_pointwise_errors_fallback_gradient(data, model, model_gradient, total_error):
+        return _generic_chi2_gradient(data=data, model=model, model_gradient=model_gradient,
+                                      err=total_error, fail_on_zero_errors=False)
+
 
 class CostFunctionBase_NegLogLikelihood(CostFunctionBase):
     def __init__(self, data_point_distribution='poisson'):
@@ -349,7 +479,8 @@ class CostFunctionBase_NegLogLikelihood(CostFunctionBase):
         else:
             raise CostFunctionException("Unknown value '%s' for 'data_point_distribution': must be one of ('gaussian', 'poisson')!")
 
-        super(CostFunctionBase_NegLogLikelihood, self).__init__(cost_function=_nll_func)
+        super(CostFunctionBase_NegLogLikelihood, self).__init__(cost_function=_nll_func,
+                                                                cost_function_gradient=self._get_builtin_gradient(_nll_func))
 
         self._formatter.latex_name = "-2\ln\mathcal{L}"
         self._formatter.name = "nll"
@@ -375,13 +506,7 @@ class CostFunctionBase_NegLogLikelihood(CostFunctionBase):
         :param total_error: total *y* uncertainties for data
         :return: cost function value
         """
-        _per_point_likelihoods = norm.pdf(data, loc=model, scale=total_error)
-
-        _nll = np.sum(np.log(_per_point_likelihoods)*(-2.0))
-        # guard against returning NaN
-        if np.isnan(_nll):
-            return np.inf
-        return _nll
+        return likelihood.nll_gaussian(data=data, model=model, total_error=total_error)
 
     @staticmethod
     def nll_poisson(data, model):
@@ -402,13 +527,37 @@ class CostFunctionBase_NegLogLikelihood(CostFunctionBase):
         :param model: model values
         :return: cost function value
         """
-        _per_point_likelihoods = poisson.pmf(data, mu=model, loc=0.0)
-        _total_likelihood = np.prod(_per_point_likelihoods)
-        # guard against returning NaN
-        _nll = -2.0 * np.log(_total_likelihood)
-        if np.isnan(_nll):
-            return np.inf
-        return _nll
+        return likelihood.nll_poisson(data=data, model=model)
+
+    @staticmethod
+    def nll_gaussian_gradient(data, model, model_gradient, total_error):
+        r"""Gradient of :py:meth:`nll_gaussian` with respect to the model parameters:
+
+        .. math::
+            \nabla C = -2 \sum_j \frac{d_j - m_j}{\sigma_j^2} \nabla m_j
+
+        :param data: measurement data
+        :param model: model values
+        :param model_gradient: derivatives of the model values by the parameters (one row per parameter)
+        :param total_error: total *y* uncertainties for data
+        :return: cost function gradient
+        """
+        return likelihood.nll_gaussian_gradient(data=data, model=model, model_gradient=model_gradient,
+                                                total_error=total_error)
+
+    @staticmethod
+    def nll_poisson_gradient(data, model, model_gradient):
+        r"""Gradient of :py:meth:`nll_poisson` with respect to the model parameters:
+
+        .. math::
+            \nabla C = -2 \sum_j \left(\frac{d_j}{m_j} - 1\right) \nabla m_j
+
+        :param data: measurement data
+        :param model: model values
+        :param model_gradient: derivatives of the model values by the parameters (one row per parameter)
+        :return: cost function gradient
+        """
+        return likelihood.nll_poisson_gradient(data=data, model=model, model_gradient=model_gradient)
 
 
 class CostFunctionBase_NegLogLikelihoodRatio(CostFunctionBase):
@@ -471,14 +620,7 @@ class CostFunctionBase_NegLogLikelihoodRatio(CostFunctionBase):
         :param total_error: total *y* uncertainties for data
         :return: cost function value
         """
-        _per_point_likelihoods = norm.pdf(data, loc=model, scale=total_error)
-        _total_likelihood = np.prod(_per_point_likelihoods)
-        _marginal_likelihood = np.prod(model)
-        # guard against returning NaN
-        _nll = -2.0 * np.log(_total_likelihood/_marginal_likelihood)
-        if np.isnan(_nll):
-            return np.inf
-        return _nll
+        return likelihood.nllr_gaussian(data=data, model=model, total_error=total_error)
 
     @staticmethod
     def nllr_poisson(data, model):
@@ -499,14 +641,7 @@ class CostFunctionBase_NegLogLikelihoodRatio(CostFunctionBase):
         :param model: model values
         :return: cost function value
         """
-        _per_point_likelihoods = poisson.pmf(data, mu=model, loc=0.0)
-        _total_likelihood = np.prod(_per_point_likelihoods)
-        _marginal_likelihood = np.prod(model)
-        # guard against returning NaN
-        _nll = -2.0 * np.log(_total_likelihood/_marginal_likelihood)
-        if np.isnan(_nll):
-            return np.inf
-        return _nll
+        return likelihood.nllr_poisson(data=data, model=model)
 
 class CostFunctionBase_Chi2_Nuisance(CostFunctionBase_Chi2):
 
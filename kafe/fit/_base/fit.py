@@ -40,6 +40,8 @@ class FitBase(object):
         self._fit_param_names = None
         self._model_function = None
         self._cost_function = None
+        self._cost_gradient_name = None
+        self._profile_report = None
 
     # -- private methods
 
@@ -65,7 +67,19 @@ class FitBase(object):
                                    parameters_to_fit=self._fit_param_names,
                                    parameter_to_minimize=self._cost_function.name,
                                    minimizer=minimizer,
-                                   minimizer_kwargs=minimizer_kwargs)
+                                   minimizer_kwargs=minimizer_kwargs,
+                                   parameter_to_minimize_gradient=self._cost_gradient_name)
+        self._profile_report = None
+
+    def _init_nexus_cost_gradient(self):
+        """register the gradient of the cost function in the nexus (if both the model function
+        and the cost function provide one); expects the model gradient node to exist already"""
+        if self._model_function.gradient is None or self._cost_function.gradient_func is None:
+            self._cost_gradient_name = None
+            return
+        self._nexus.new_function(self._cost_function.gradient_func, function_name='cost_gradient',
+                                 add_unknown_parameters=False)
+        self._cost_gradient_name = 'cost_gradient'
 
 
     @staticmethod
@@ -147,6 +161,12 @@ class FitBase(object):
         """the current value of the cost function"""
         return self._fitter.parameter_to_minimize_value
 
+    @property
+    def profile_report(self):
+        """per-node evaluation statistics recorded during the last call to ``do_fit(profile=True)``
+        (or ``None``)"""
+        return self._profile_report
+
     @property
     def data_size(self):
         """the size (number of points) of the data container"""
@@ -285,8 +305,8 @@ class FitBase(object):
         Add a matrix uncertainty source for use in the fit.
         Returns an error id which uniquely identifies the created error source.
 
-        :param err_matrix: covariance or correlation matrix
-        :param matrix_type: one of ``'covariance'``/``'cov'`` or ``'correlation'``/``'cor'``
+        :param err_matrix: covariance or correlation matrix (dense or :py:mod:`scipy.sparse`)
+        :param matrix_type: one of ``'covariance'``/``'cov'``, ``'correlation'``/``'cor'`` or ``'banded'`` (lower bands of a covariance matrix)
         :type matrix_type: str
         :param name: unique name for this uncertainty source. If ``None``, the name
                      of the error source will be set to a random alphanumeric string.
@@ -338,16 +358,31 @@ class FitBase(object):
         self._invalidate_total_error_cache()
         return _ret
 
-    def do_fit(self):
-        """
-        Perform the minimization of the cost function.
-        """
+    def _do_fit(self):
         self._fitter.do_fit()
         # update parameter formatters
         for _fpf, _pv, _pe in zip(self._model_function.argument_formatters, self.parameter_values, self.parameter_errors):
             _fpf.value = _pv
             _fpf.error = _pe
 
+    def do_fit(self, profile=False):
+        """
+        Perform the minimization of the cost function.
+
+        :param profile: if ``True``, record evaluation statistics for all nodes during the fit
+                        (see :py:attr:`profile_report`)
+        :type profile: bool
+        """
+        if not profile:
+            self._do_fit()
+            return
+        self._nexus.enable_profiling(reset=True)
+        try:
+            self._do_fit()
+        finally:
+            self._nexus.disable_profiling()
+            self._profile_report = self._nexus.get_profile_report()
+
     def assign_model_function_expression(self, expression_format_string):
         """Assign a plain-text-formatted expression string to the model function."""
         self._model_function.formatter.expression_format_string = expression_format_string
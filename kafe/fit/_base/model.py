@@ -1,5 +1,6 @@
 import abc
 import inspect
+import numpy as np
 
 from .format import ModelParameterFormatter, ModelFunctionFormatter
 
@@ -24,6 +25,9 @@ class ParametricModelBaseMixin(object):
     Derived classes should inherit from :py:class:`ParametricModelBaseMixin` and the
     relevant data container (in that order).
     """
+    # handle of the analytic model function gradient (set by derived classes, if available)
+    _model_function_gradient_handle = None
+
     def __init__(self, model_func, model_parameters, *args, **kwargs):
         """
         Mixin constructor: sets and initialized the model function.
@@ -32,6 +36,7 @@ class ParametricModelBaseMixin(object):
         :param model_parameters: iterable of parameter values with which the model function should be initialized
         """
         self._model_function_handle = model_func
+        self._model_parameters = None
         self.parameters = model_parameters
         super(ParametricModelBaseMixin, self).__init__(*args, **kwargs)
 
@@ -43,12 +48,37 @@ class ParametricModelBaseMixin(object):
     @parameters.setter
     def parameters(self, parameters):
         """Setter for parameter values"""
-        self._model_parameters = parameters
+        # keep a copy, so that changes to the passed object are detected the next time it is set
+        _parameters = list(parameters)
+        if self._model_parameters is not None and self._parameter_values_equal(_parameters, self._model_parameters):
+            return  # values unchanged -> keep the current model values
+
+        self._model_parameters = _parameters
 
         # flag: recalculate the model values next time they are requested
         self._pm_calculation_stale = True
         self._clear_total_error_cache()
 
+    @staticmethod
+    def _parameter_values_equal(parameters_1, parameters_2):
+        if len(parameters_1) != len(parameters_2):
+            return False
+        try:
+            return parameters_1 == list(parameters_2)
+        except ValueError:
+            # parameter values are arrays
+            return all(np.array_equal(_p1, _p2) for _p1, _p2 in zip(parameters_1, parameters_2))
+
+    @property
+    def has_analytic_gradient(self):
+        """``True`` if an analytic gradient of the model function with respect to the parameters is available"""
+        return self._model_function_gradient_handle is not None
+
+    def _eval_model_function_gradient(self, shape, *args):
+        """evaluate the analytic gradient and broadcast each component to the shape of the model values"""
+        _grad = self._model_function_gradient_handle(*args)
+        return np.array([np.broadcast_to(_g, shape) for _g in _grad], dtype=float)
+
 
 class ModelFunctionException(Exception):
     pass
@@ -74,16 +104,21 @@ class ModelFunctionBase(object):
     EXCEPTION_TYPE = ModelFunctionException
     FORMATTER_TYPE = ModelFunctionFormatter
 
-    def __init__(self, model_function):
+    def __init__(self, model_function, model_function_gradient=None):
         """
         Construct :py:class:`ModelFunction` object (a wrapper for a native Python function):
 
         :param model_function: function handle
+        :param model_function_gradient: function handle for the gradient of the model function with respect
+                                        to its parameters. It must have the same arguments as the model function
+                                        and return one value (or array of values) per parameter.
         """
         self._model_function_handle = model_function
         self._model_function_argspec = inspect.getargspec(self._model_function_handle)
         self._model_function_argcount = self._model_function_handle.__code__.co_argcount
+        self._model_function_gradient_handle = model_function_gradient
         self._validate_model_function_raise()
+        self._validate_model_function_gradient_raise()
         self._assign_parameter_formatters()
         self._assign_function_formatter()
 
@@ -101,6 +136,22 @@ class ModelFunctionBase(object):
                 "Model function with variable arguments (**%s) is not supported"
                 % (self._model_function_argspec.keywords,))
 
+    def _validate_auxiliary_function_raise(self, aux_function, description):
+        if aux_function is None:
+            return
+
+        _aux_func_argspec = inspect.getargspec(aux_function)
+
+        # require auxiliary functions (gradient, ...) to have the same arguments as the model function
+        if self.argspec.args != _aux_func_argspec.args:
+            raise self.__class__.EXCEPTION_TYPE(
+                "Model function and its %s have different argument structures:"
+                "(%r vs %r)"
+                % (description, self.argspec.args, _aux_func_argspec.args))
+
+    def _validate_model_function_gradient_raise(self):
+        self._validate_auxiliary_function_raise(self.gradient, "gradient")
+
     def _assign_parameter_formatters(self):
         self._arg_formatters = [ModelParameterFormatter(name=_pn, value=_pv, error=None)
                                 for _pn, _pv in zip(self.argspec.args, self.argvals)]
@@ -122,6 +173,11 @@ class ModelFunctionBase(object):
         """The model function handle"""
         return self._model_function_handle
 
+    @property
+    def gradient(self):
+        """The handle of the model function gradient with respect to the parameters (or ``None``)"""
+        return self._model_function_gradient_handle
+
     @property
     def argspec(self):
         """The model function argument specification, as returned by :py:meth:`inspect.getargspec`"""
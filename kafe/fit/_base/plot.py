@@ -3,13 +3,14 @@ import numpy as np
 import six
 
 from ...config import matplotlib as mpl
-from ...config import kc, ConfigError
+from ...config import kc, ConfigError, lazy_import_matplotlib
 from .fit import FitBase
 
 from collections import OrderedDict
 from copy import copy
-from matplotlib import pyplot as plt
-from matplotlib import gridspec as gs
+
+plt = lazy_import_matplotlib('matplotlib.pyplot')
+gs = lazy_import_matplotlib('matplotlib.gridspec')
 
 
 __all__ = ["PlotContainerBase", "PlotFigureBase", "PlotContainerException", "PlotFigureException",
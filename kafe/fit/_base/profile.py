@@ -1,12 +1,13 @@
 import numpy as np
 import six
 
-from ...config import matplotlib as mpl
+from ...config import matplotlib as mpl, lazy_import_matplotlib
 from ...core.confidence import ConfidenceLevel
 from . import FitBase
-from matplotlib import pyplot as plt, rcParams
-from matplotlib import gridspec as gs
-from matplotlib import ticker as plticker
+
+plt = lazy_import_matplotlib('matplotlib.pyplot')
+gs = lazy_import_matplotlib('matplotlib.gridspec')
+plticker = lazy_import_matplotlib('matplotlib.ticker')
 
 
 __all__ = ["ContoursProfiler"]
@@ -30,45 +31,6 @@ class ConfidenceLevelFormatted(ConfidenceLevel):
         return r"$%.4g\%%$ CL" % (self.cl*100,)
 
 
-class SigmaLocator(plticker.Locator):
-    """
-    Create ticks at evenly spaced offsets from a central value.
-    The offsets are integer multiples of a fixed value ('sigma')
-    """
-    def __init__(self, central_value, sigma):
-        self._cval = central_value
-        self._sigma = sigma
-
-    def __call__(self):
-        """Return the locations of the ticks"""
-        _vmin, _vmax = self.axis.get_view_interval()
-        return self.tick_values(_vmin, _vmax)
-
-    def tick_values(self, vmin, vmax):
-        _n_sigma_dn = int((vmin - self._cval)/self._sigma)
-        _n_sigma_up = int((vmax - self._cval)/self._sigma)
-        return self.raise_if_exceeds(
-            np.arange(_n_sigma_dn, _n_sigma_up+1, 1) * self._sigma + self._cval)
-
-
-class SigmaFormatter(plticker.Formatter):
-    """
-    Set the tick labels to indicate the distance to the
-    central value, in intervals
-    """
-    def __init__(self, central_value, sigma):
-        """set the tick labels to correspond to sigma"""
-        self._cval = central_value
-        self._sigma = sigma
-
-    def __call__(self, x, pos=None):
-        'Return the format for tick val *x* at position *pos*'
-        # _vmin, _vmax = self.axis.get_data_interval()
-        _numeric_label = (x - self._cval)/self._sigma
-        _str_label = r"%.2g$\sigma$" % (_numeric_label,)
-        return _str_label
-
-
 class ContoursProfilerException(Exception):
     pass
 
@@ -100,7 +62,7 @@ class ContoursProfiler(object):
     _DEFAULT_PLOT_FILL_CONTOUR_KWARGS = dict(alpha=0.3, linewidth=2)
 
     def __init__(self, fit_object,
-                 profile_points=100, profile_subtract_min=False, profile_bound=2,
+                 profile_points=100, profile_subtract_min=False, profile_bound=2, profile_method_kwargs=None,
                  contour_points=100, contour_sigma_values=(1.0, 2.0), contour_smoothing_sigma=0.0,
                  contour_method_kwargs=None):
         """
@@ -115,6 +77,9 @@ class ContoursProfiler(object):
         :type profile_subtract_min: bool
         :param profile_bound: sample the profile at most this far from the minimum (in sigma)
         :type profile_bound: float
+        :param profile_method_kwargs: additional keyword arguments passed on to the minimizer when calculating
+                                      profiles (e.g. ``n_workers`` and ``backend`` for ``scipy``)
+        :type profile_method_kwargs: dict
         :param contour_points: number of points at which to sample each contour
         :type contour_points: int
         :param contour_sigma_values: evaluate and show contours for these confidences (in sigma)
@@ -129,7 +94,8 @@ class ContoursProfiler(object):
         _contour_confidence_levels = [ConfidenceLevelFormatted.from_sigma(2, _sigma) for _sigma in contour_sigma_values]
 
         self._fit = fit_object
-        self._profile_kwargs = dict(points=profile_points, subtract_min=profile_subtract_min, bound=profile_bound)
+        self._profile_kwargs = dict(points=profile_points, subtract_min=profile_subtract_min, bound=profile_bound,
+                                    method_kwargs=profile_method_kwargs)
         self._contour_kwargs = dict(points=contour_points,
                                     confidence_levels=_contour_confidence_levels,
                                     smoothing_sigma=contour_smoothing_sigma,
@@ -219,6 +185,7 @@ class ContoursProfiler(object):
         """
         _kwargs = dict(bins=self._profile_kwargs['points'], bound=self._profile_kwargs['bound'],
                        args=None, subtract_min=self._profile_kwargs['subtract_min'])
+        _kwargs.update(self._profile_kwargs['method_kwargs'] or dict())
         return self._fit._fitter.profile(parameter, **_kwargs)
 
     def get_contours(self, parameter_1, parameter_2, smoothing_sigma=None):
@@ -332,6 +299,7 @@ class ContoursProfiler(object):
             _axes.grid('on')
 
         if show_ticks:
+            from ._ticker import SigmaLocator, SigmaFormatter
             _loc_x = SigmaLocator(central_value=_par_val, sigma=_par_err)
             _axes.xaxis.set_major_locator(_loc_x)
             if label_ticks_in_sigma:
@@ -400,7 +368,7 @@ class ContoursProfiler(object):
         _cl_contour_pairs = self.get_contours(parameter_1, parameter_2)
 
         _contour_artists = []
-        for _cl_contour_pair, _prop_cycler in zip(_cl_contour_pairs, rcParams["axes.prop_cycle"]):
+        for _cl_contour_pair, _prop_cycler in zip(_cl_contour_pairs, mpl.rcParams["axes.prop_cycle"]):
             _cl, _contour_xy = _cl_contour_pair
             _artists = []
             if _contour_xy is not None:
@@ -430,6 +398,7 @@ class ContoursProfiler(object):
             _axes.grid('on')
 
         if show_ticks:
+            from ._ticker import SigmaLocator, SigmaFormatter
             _loc_x = SigmaLocator(central_value=_par_1_val, sigma=_par_1_err)
             _loc_y = SigmaLocator(central_value=_par_2_val, sigma=_par_2_err)
             _axes.xaxis.set_major_locator(_loc_x)
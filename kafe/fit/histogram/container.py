@@ -1,4 +1,5 @@
 import numpy as np
+import six
 
 from ..indexed import IndexedContainer
 from ..indexed.container import IndexedContainerException
@@ -24,7 +25,10 @@ class HistContainer(IndexedContainer):
     ..    :parts: 1
 
     """
-    def __init__(self, n_bins, bin_range, bin_edges=None, fill_data=None, dtype=int):
+    # default number of entries read at a time by :py:meth:`fill_from_file`
+    FILE_CHUNK_SIZE = 2**20
+
+    def __init__(self, n_bins, bin_range, bin_edges=None, fill_data=None, dtype=int, keep_raw_entries=True):
         """
         Construct a histogram:
 
@@ -38,11 +42,28 @@ class HistContainer(IndexedContainer):
         :type fill_data: list of floats
         :param dtype: data type of histogram entries
         :type dtype: type
+        :param keep_raw_entries: if ``False``, entries are binned as soon as they are filled and then
+                                 discarded, so that only the bin contents are kept in memory. The raw entries
+                                 are then not available and the histogram can only be rebinned by merging
+                                 bins.
+        :type keep_raw_entries: bool
         """
         super(HistContainer, self).__init__(data=np.zeros(n_bins+2), dtype=dtype)  # underflow and overflow bins
-        self._processed_entries = []
-        self._unprocessed_entries = []
-        # TODO: think of a way to implement weights
+        # raw entries are kept in a growable buffer: the first `_n_processed_entries` have been
+        # filled into the bins, the rest up to `_n_entries` are still outstanding.
+        # The first `_n_sorted_entries` are kept in ascending order, so that rebinning only
+        # requires looking up the new bin edges in the sorted entries.
+        self._entry_buffer = np.empty(0)
+        self._n_entries = 0
+        self._n_processed_entries = 0
+        self._n_sorted_entries = 0
+        # entry weights are only stored once the first weighted entries have been filled
+        self._weight_buffer = None
+        self._keep_raw_entries = keep_raw_entries
+        self._weighted = False
+        # running sum of entry weights (only used if raw entries are not kept)
+        self._sum_of_weights = 0.0
+        self._sum_of_squared_weights = np.zeros(n_bins+2)
 
         if len(bin_range) != 2:
             raise HistContainerException(
@@ -77,54 +98,142 @@ class HistContainer(IndexedContainer):
 
     # -- private methods
 
+    def _prepare_entries(self, entries, weights=None):
+        """convert entries (and weights) to flat float arrays and switch to weighted mode if needed"""
+        _entries = np.asarray(entries, dtype=float).ravel()
+        _weights = None
+        if weights is not None:
+            try:
+                _weights = np.broadcast_to(np.asarray(weights, dtype=float), _entries.shape)
+            except ValueError:
+                raise HistContainerException(
+                    "Number of weights does not match number of entries (%d)!" % (len(_entries),))
+            if not self._weighted:
+                # switch to weighted mode: all previous entries have unit weight
+                self._weighted = True
+                self._idx_data = self._idx_data.astype(float)
+                if self._keep_raw_entries:
+                    self._weight_buffer = np.ones_like(self._entry_buffer)
+        return _entries, _weights
+
+    def _append_entries(self, entries, weights=None):
+        """append entries (and weights) to the raw entry buffer, growing it geometrically if needed"""
+        _entries, _weights = self._prepare_entries(entries, weights=weights)
+        _n_new_entries = self._n_entries + len(_entries)
+        if _n_new_entries > len(self._entry_buffer):
+            _new_size = max(_n_new_entries, 2 * len(self._entry_buffer))
+            _new_buffer = np.empty(_new_size)
+            _new_buffer[:self._n_entries] = self._entry_buffer[:self._n_entries]
+            self._entry_buffer = _new_buffer
+            if self._weight_buffer is not None:
+                _new_buffer = np.empty(_new_size)
+                _new_buffer[:self._n_entries] = self._weight_buffer[:self._n_entries]
+                self._weight_buffer = _new_buffer
+        self._entry_buffer[self._n_entries:_n_new_entries] = _entries
+        if self._weight_buffer is not None:
+            self._weight_buffer[self._n_entries:_n_new_entries] = 1.0 if weights is None else _weights
+        self._n_entries = _n_new_entries
+
+    def _fill_into_bins(self, entries, weights=None):
+        """add entries (and weights) to the bin contents"""
+        # bin index 0 is the underflow bin (entry < low), index `size + 1` the overflow bin (entry >= high)
+        _bin_indices = np.searchsorted(self._bin_edges, entries, side='right')
+        if weights is None:
+            _counts = np.bincount(_bin_indices, minlength=len(self._idx_data))
+            self._idx_data += _counts
+            self._sum_of_squared_weights += _counts
+        else:
+            self._idx_data += np.bincount(_bin_indices, weights=weights, minlength=len(self._idx_data))
+            self._sum_of_squared_weights += np.bincount(_bin_indices, weights=weights**2,
+                                                        minlength=len(self._idx_data))
+
     def _fill_unprocessed(self):
         """fill any entries marked as unprocessed into the histogram"""
-        if not self._unprocessed_entries:
+        if self._n_processed_entries == self._n_entries:
             return
-        _entries_sorted = np.sort(self._unprocessed_entries)
-
-        _current_entry_index = 0
-        _current_entry_value = _entries_sorted[0]
-        _current_bin_index = 0  # start with underflow bin
-        _current_bin_upper_edge = self.low
-        _current_bin_lower_edge = -np.inf
-
-        # print "Bin %d (%5.3f, %5.3f)" % (_current_bin_index, _current_bin_lower_edge, _current_bin_upper_edge)
-        while _current_bin_upper_edge <= self.high:
-            if _current_entry_value >= _current_bin_upper_edge:
-                # if last bin, quit
-                if _current_bin_upper_edge == self.high:
-                    # print "\tthis is the last bin: quitting loop"
-                    break
-                # move to next bin
-                _current_bin_index += 1
-                _current_bin_upper_edge = self._bin_edges[_current_bin_index]
-                _current_bin_lower_edge = self._bin_edges[_current_bin_index - 1]
-                # print "\tmove to next bin"
-                # print "Bin %d (%5.3f, %5.3f)" % (_current_bin_index, _current_bin_lower_edge, _current_bin_upper_edge)
-                continue
-            # increment histogram bin and move to next entry
-            # print "\tputting entry #%d '%s' in bin %d (%5.3f, %5.3f)" % (
-            #     _current_entry_index, _current_entry_value, _current_bin_index, _current_bin_lower_edge, _current_bin_upper_edge)
-            # add to processed entries
-            self._processed_entries.append(_current_entry_value)
-            self._idx_data[_current_bin_index] += 1
-            _current_entry_index += 1
-            if _current_entry_index >= len(_entries_sorted):    # important BUGFIX!!!!!!!!!!
-                break
-            _current_entry_value = _entries_sorted[_current_entry_index]
-
-        # any remaining entries are overflows
-        if _current_entry_index < len(_entries_sorted):    # important BUGFIX!!!!!!!!!!
-
-            _overflow_entries = _entries_sorted[_current_entry_index:]
-            self._idx_data[-1] += len(_overflow_entries)
-            # print "Bin %d (of): add %d entries" % (_current_bin_index+1, len(_overflow_entries))
-            # for i in _overflow_entries:
-            #     print '\t', i
-            self._processed_entries += list(_overflow_entries)
-
-        self._unprocessed_entries = []
+        _entries = self._entry_buffer[self._n_processed_entries:self._n_entries]
+        _weights = None
+        if self._weight_buffer is not None:
+            _weights = self._weight_buffer[self._n_processed_entries:self._n_entries]
+        self._fill_into_bins(_entries, weights=_weights)
+        self._n_processed_entries = self._n_entries
+
+    def _sort_entries(self):
+        """merge the entries filled since the last call into the sorted part of the raw entry buffer"""
+        if self._n_sorted_entries == self._n_entries:
+            return
+        # sorting reorders processed and unprocessed entries -> process all of them first
+        self._fill_unprocessed()
+        _n_sorted = self._n_sorted_entries
+        _new_entries = self._entry_buffer[_n_sorted:self._n_entries]
+        _order = np.argsort(_new_entries, kind='mergesort')
+        _new_entries = _new_entries[_order]
+        _insert_positions = np.searchsorted(self._entry_buffer[:_n_sorted], _new_entries, side='right')
+        self._entry_buffer[:self._n_entries] = np.insert(self._entry_buffer[:_n_sorted],
+                                                         _insert_positions, _new_entries)
+        if self._weight_buffer is not None:
+            _new_weights = self._weight_buffer[_n_sorted:self._n_entries][_order]
+            self._weight_buffer[:self._n_entries] = np.insert(self._weight_buffer[:_n_sorted],
+                                                              _insert_positions, _new_weights)
+        self._n_sorted_entries = self._n_entries
+
+    @staticmethod
+    def _sum_segments(values, segment_starts):
+        """sum up consecutive segments of an array given the segment start indices (empty segments are allowed)"""
+        _segment_bounds = np.append(segment_starts, len(values))
+        _non_empty = _segment_bounds[1:] > _segment_bounds[:-1]
+        _sums = np.zeros(len(segment_starts))
+        if np.any(_non_empty):
+            _sums[_non_empty] = np.add.reduceat(values, _segment_bounds[:-1][_non_empty])
+        return _sums
+
+    def _rebin_sorted_entries(self, new_bin_edges):
+        """recalculate the bin contents for new bin edges, looking them up in the sorted raw entries"""
+        self._sort_entries()
+        _entries = self._entry_buffer[:self._n_entries]
+        # index of the first entry in each bin (including underflow and overflow bins)
+        _bin_starts = np.append(0, np.searchsorted(_entries, new_bin_edges, side='left'))
+        if self._weight_buffer is None:
+            _counts = np.diff(np.append(_bin_starts, self._n_entries)).astype(float)
+            self._idx_data = _counts
+            self._sum_of_squared_weights = _counts.copy()
+        else:
+            _weights = self._weight_buffer[:self._n_entries]
+            self._idx_data = self._sum_segments(_weights, _bin_starts)
+            self._sum_of_squared_weights = self._sum_segments(_weights**2, _bin_starts)
+
+    def _merge_bins(self, new_bin_edges):
+        """rebin by merging adjacent bins: each new bin edge must coincide with one of the current ones"""
+        _edge_indices = np.searchsorted(self._bin_edges, new_bin_edges)
+        _edge_indices_valid = np.minimum(_edge_indices, len(self._bin_edges) - 1)
+        if not np.array_equal(self._bin_edges[_edge_indices_valid], new_bin_edges):
+            raise HistContainerException(
+                "Cannot rebin a histogram filled with 'keep_raw_entries=False': new bin edges must be "
+                "a subset of the current bin edges!")
+        # the new underflow bin collects everything up to the first new edge, and so on
+        _bin_starts = np.append(0, _edge_indices + 1)
+        self._idx_data = self._sum_segments(self._idx_data, _bin_starts)
+        self._sum_of_squared_weights = self._sum_segments(self._sum_of_squared_weights, _bin_starts)
+
+    def _check_raw_entries_kept_raise(self):
+        if not self._keep_raw_entries:
+            raise HistContainerException("Raw entries are not available: histogram was created "
+                                         "with 'keep_raw_entries=False'!")
+
+    def _fill_without_raw_entries(self, entries, weights=None):
+        """bin entries right away, without keeping them"""
+        _entries, _weights = self._prepare_entries(entries, weights=weights)
+        self._fill_into_bins(_entries, weights=_weights)
+        self._n_entries += len(_entries)
+        self._sum_of_weights += len(_entries) if _weights is None else np.sum(_weights)
+
+    @staticmethod
+    def _memory_map_file(filename, dtype=float, offset=0):
+        if filename.endswith('.npy'):
+            _array = np.load(filename, mmap_mode='r')
+        else:
+            _array = np.memmap(filename, dtype=dtype, mode='r', offset=offset)
+        return _array.reshape(-1)
 
     # -- public properties
 
@@ -136,13 +245,37 @@ class HistContainer(IndexedContainer):
     @property
     def n_entries(self):
         """the number of entries"""
-        return len(self._processed_entries) + len(self._unprocessed_entries)
+        return self._n_entries
+
+    @property
+    def weighted(self):
+        """``True`` if weighted entries have been filled into the histogram"""
+        return self._weighted
+
+    @property
+    def keeps_raw_entries(self):
+        """``True`` if the raw entries are kept in memory (see :py:attr:`raw_data`)"""
+        return self._keep_raw_entries
+
+    @property
+    def sum_of_weights(self):
+        """the sum of the weights of all entries (equal to :py:attr:`n_entries` for unweighted histograms)"""
+        if not self._weighted:
+            return self._n_entries
+        if not self._keep_raw_entries:
+            return self._sum_of_weights
+        return np.sum(self._weight_buffer[:self._n_entries])
+
+    @property
+    def sum_of_squared_weights(self):
+        """the sum of the squared entry weights in each bin"""
+        self._fill_unprocessed()  # process outstanding entries
+        return self._sum_of_squared_weights[1:-1]  # don't consider underflow and overflow bins
 
     @property
     def data(self):
-        """the number of entries in each bin"""
-        if self._unprocessed_entries:  # process outstanding entries
-            self._fill_unprocessed()
+        """the number of entries (or the sum of entry weights) in each bin"""
+        self._fill_unprocessed()  # process outstanding entries
         # NOTE: returned array starts at 0
         return self._idx_data[1:-1]  # don't consider underflow and overflow bins
 
@@ -152,9 +285,19 @@ class HistContainer(IndexedContainer):
 
     @property
     def raw_data(self):
-        """the number of entries in each bin"""
-        # TODO: commit unprocessed entries (?)
-        return self._processed_entries + self._unprocessed_entries
+        """array of all raw entries, in ascending order"""
+        self._check_raw_entries_kept_raise()
+        self._sort_entries()
+        return self._entry_buffer[:self._n_entries].copy()
+
+    @property
+    def raw_weights(self):
+        """array of the weights of all raw entries (in the same order as :py:attr:`raw_data`)"""
+        self._check_raw_entries_kept_raise()
+        self._sort_entries()
+        if self._weight_buffer is None:
+            return np.ones(self._n_entries)
+        return self._weight_buffer[:self._n_entries].copy()
 
     @property
     def low(self):
@@ -174,11 +317,13 @@ class HistContainer(IndexedContainer):
     @property
     def overflow(self):
         """the number of entries in the overflow bin"""
+        self._fill_unprocessed()  # process outstanding entries
         return self._idx_data[-1]
 
     @property
     def underflow(self):
         """the number of entries in the underflow bin"""
+        self._fill_unprocessed()  # process outstanding entries
         return self._idx_data[0]
 
     @property
@@ -200,22 +345,89 @@ class HistContainer(IndexedContainer):
 
     # -- public methods
 
-    def fill(self, entries):
+    def fill(self, entries, weights=None):
        """
-       Fill new entries into the histogram.
+       Fill new entries into the histogram. The entries are binned lazily, so calling this
+       repeatedly with chunks of entries only costs time proportional to the chunk size.
+
+       If weights are given, the histogram keeps track of the sum of weights and the sum of squared
+       weights in each bin.
 
        :param entries: list of entries
-       :type entries: list of floats
+       :type entries: list of floats or float
+       :param weights: the entry weights (if ``None``, each entry has unit weight)
+       :type weights: list of floats, float or ``None``
        """
-       try:
-           self._unprocessed_entries += list(entries)
-       except TypeError:
-           self._unprocessed_entries.append(entries)
+       if self._keep_raw_entries:
+           self._append_entries(entries, weights=weights)
+       else:
+           self._fill_without_raw_entries(entries, weights=weights)
+
+    def fill_from_chunks(self, chunks, weight_chunks=None):
+        """
+        Fill entries from an iterable of chunks (e.g. arrays read successively from a large file)
+        into the histogram. Only one chunk needs to be held in memory at a time, as long as
+        the histogram does not keep its raw entries (see ``keep_raw_entries``).
+
+        :param chunks: iterable yielding arrays of entries
+        :type chunks: iterable of :py:obj:`numpy.ndarray` or lists of floats
+        :param weight_chunks: iterable yielding the weights corresponding to each chunk (if ``None``,
+                              each entry has unit weight)
+        :type weight_chunks: iterable of :py:obj:`numpy.ndarray` or ``None``
+        """
+        if weight_chunks is None:
+            for _chunk in chunks:
+                self.fill(_chunk)
+        else:
+            _chunks_iter, _weight_chunks_iter = iter(chunks), iter(weight_chunks)
+            for _chunk in _chunks_iter:
+                try:
+                    _weight_chunk = next(_weight_chunks_iter)
+                except StopIteration:
+                    raise HistContainerException("Fewer weight chunks than entry chunks provided!")
+                self.fill(_chunk, weights=_weight_chunk)
+
+    def fill_from_file(self, filename, dtype=float, offset=0, chunk_size=None, weights_filename=None):
+        """
+        Fill entries from a file into the histogram. The file is memory-mapped and
+        read in chunks, so it does not need to fit into memory.
+
+        :param filename: path to a NumPy ``.npy`` file or a raw binary file containing the entries
+        :type filename: str
+        :param dtype: data type of the entries in a raw binary file (ignored for ``.npy`` files)
+        :type dtype: :py:obj:`numpy.dtype` or type
+        :param offset: offset in bytes of the first entry in a raw binary file (ignored for ``.npy`` files)
+        :type offset: int
+        :param chunk_size: number of entries to read at a time (if ``None``, use :py:attr:`FILE_CHUNK_SIZE`)
+        :type chunk_size: int or ``None``
+        :param weights_filename: path to a file with the same layout containing the entry weights (optional)
+        :type weights_filename: str or ``None``
+        """
+        if chunk_size is None:
+            chunk_size = self.FILE_CHUNK_SIZE
+        _entries = self._memory_map_file(filename, dtype=dtype, offset=offset)
+        _weights = None
+        if weights_filename is not None:
+            _weights = self._memory_map_file(weights_filename, dtype=dtype, offset=offset)
+            if len(_weights) != len(_entries):
+                raise HistContainerException("Number of weights (%d) in '%s' does not match number of entries "
+                                             "(%d) in '%s'!" % (len(_weights), weights_filename,
+                                                                len(_entries), filename))
+        _chunk_starts = six.moves.range(0, len(_entries), chunk_size)
+        self.fill_from_chunks(
+            (_entries[_start:_start + chunk_size] for _start in _chunk_starts),
+            weight_chunks=None if _weights is None else (_weights[_start:_start + chunk_size]
+                                                         for _start in _chunk_starts))
 
     def rebin(self, new_bin_edges):
         """
         Change the histogram binning.
 
+        The raw entries are kept sorted, so the new bin contents are obtained by looking up the
+        new bin edges in the entries. If the raw entries are not kept (``keep_raw_entries=False``),
+        the histogram can only be rebinned to a coarser binning by merging bins, i.e. each new bin
+        edge must be one of the current bin edges.
+
         :param new_bin_edges: list of new bin edges in ascending order
         :type new_bin_edges: list of float
         """
@@ -224,9 +436,11 @@ class HistContainer(IndexedContainer):
         if not (np.diff(_new_bin_edges) >= 0).all():
             raise HistContainerException(
                 "Invalid bin edge specification! Edge sequence must be sorted in ascending order!")
-        self._bin_edges = _new_bin_edges
-        self._idx_data = np.zeros(len(self._bin_edges) -1 + 2)
-
-        # mark all entries as unprocessed
-        self._unprocessed_entries += self._processed_entries
-        self._processed_entries = []
\ No newline at end of file
+        if self._n_entries == 0:
+            self._idx_data = np.zeros(len(_new_bin_edges) - 1 + 2)
+            self._sum_of_squared_weights = np.zeros(len(_new_bin_edges) - 1 + 2)
+        elif self._keep_raw_entries:
+            self._rebin_sorted_entries(_new_bin_edges)
+        else:
+            self._merge_bins(_new_bin_edges)
+        self._bin_edges = _new_bin_edges
\ No newline at end of file
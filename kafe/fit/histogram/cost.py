@@ -51,7 +51,7 @@ class HistCostFunction_Chi2(CostFunctionBase_Chi2):
         return CostFunctionBase_Chi2.chi2_no_errors(data=data, model=model)
 
     @staticmethod
-    def chi2_covariance(data, model, total_cov_mat_inverse):
+    def chi2_covariance(data, model, total_cov_mat_object):
         r"""A least-squares cost function calculated from 'y' data and model values,
         considering the covariance matrix of the 'y' measurements.
 
@@ -63,10 +63,10 @@ class HistCostFunction_Chi2(CostFunctionBase_Chi2):
 
         :param data: measurement data
         :param model: model values
-        :param total_cov_mat_inverse: inverse of the total covariance matrix
+        :param total_cov_mat_object: the total covariance matrix
         :return: cost function value
         """
-        return CostFunctionBase_Chi2.chi2_covariance(data=data, model=model, total_cov_mat_inverse=total_cov_mat_inverse)
+        return CostFunctionBase_Chi2.chi2_covariance(data=data, model=model, total_cov_mat_object=total_cov_mat_object)
 
     @staticmethod
     def chi2_pointwise_errors(data, model, total_error):
@@ -2,6 +2,7 @@ from collections import OrderedDict
 from copy import deepcopy
 
 import numpy as np
+import warnings
 
 from ...config import kc
 from ...core import NexusFitter, Nexus
@@ -25,21 +26,29 @@ class HistFit(FitBase):
     MODEL_TYPE = HistParametricModel
     MODEL_FUNCTION_TYPE = HistModelFunction
     EXCEPTION_TYPE = HistFitException
-    RESERVED_NODE_NAMES = {'data', 'model', 'model_density', 'cost',
+    RESERVED_NODE_NAMES = {'data', 'model', 'model_density', 'cost', 'model_gradient', 'cost_gradient',
                           'data_error', 'model_error', 'total_error',
-                          'data_cov_mat', 'model_cov_mat', 'total_cov_mat',
+                          'data_cov_mat', 'model_cov_mat', 'total_cov_mat', 'total_cov_mat_object',
                           'data_cor_mat', 'model_cor_mat', 'total_cor_mat'}
 
-    def __init__(self, data, model_density_function, cost_function=HistCostFunction_NegLogLikelihood(data_point_distribution='poisson'), model_density_antiderivative=None, minimizer=None, minimizer_kwargs=None):
+    def __init__(self, data, model_density_function, cost_function=HistCostFunction_NegLogLikelihood(data_point_distribution='poisson'), model_density_antiderivative=None, minimizer=None, minimizer_kwargs=None,
+                 model_density_gradient=None):
         """
         Construct a fit of a model to a histogram.
 
+        For weighted histograms, the bin uncertainties are taken from the sum of squared entry weights in each
+        bin. These are only taken into account by cost functions which use the data uncertainties (e.g.
+        :py:class:`~kafe.fit.histogram.cost.HistCostFunction_Chi2`). The default Poisson likelihood ignores them,
+        so a warning is issued if it is used with a weighted histogram.
+
         :param data: the measurement values
         :type data: iterable of float
         :param model_density_function: the model density function
         :type model_density_function: :py:class:`~kafe.fit.hist.HistModelFunction` or unwrapped native Python function
         :param cost_function: the cost function
         :type cost_function: :py:class:`~kafe.fit._base.CostFunctionBase`-derived or unwrapped native Python function
+        :param model_density_gradient: the gradient of the model density with respect to its parameters (optional)
+        :type model_density_gradient: unwrapped native Python function
         """
         # set the data
         self.data = data
@@ -50,9 +59,14 @@ class HistFit(FitBase):
                 raise HistFitException("Antiderivative (%r) provided in constructor for %r, "
                                        "but histogram model function object (%r) already constructed!"
                                        % (model_density_antiderivative, self.__class__, model_density_function))
+            if model_density_gradient is not None:
+                raise HistFitException("Gradient (%r) provided in constructor for %r, "
+                                       "but histogram model function object (%r) already constructed!"
+                                       % (model_density_gradient, self.__class__, model_density_function))
             self._model_function = model_density_function
         else:
-            self._model_function = self.__class__.MODEL_FUNCTION_TYPE(model_density_function, model_density_antiderivative=model_density_antiderivative)
+            self._model_function = self.__class__.MODEL_FUNCTION_TYPE(model_density_function, model_density_antiderivative=model_density_antiderivative,
+                                                                      model_density_gradient=model_density_gradient)
 
         # validate the model function for this fit
         self._validate_model_function_for_fit_raise()
@@ -69,10 +83,18 @@ class HistFit(FitBase):
         self.__cache_total_error = None
         self.__cache_total_cov_mat = None
         self.__cache_total_cov_mat_inverse = None
+        self.__cache_total_cov_mat_object = None
 
         # initialize the Nexus
         self._init_nexus()
 
+        if self._data_container.weighted:
+            # the uncertainties of weighted histograms are only considered if the cost function uses them
+            _error_node_names = set(_node.name for _node in self._nexus.get_group('errors'))
+            if not _error_node_names.intersection(self._cost_function.argspec.args):
+                warnings.warn("Fitting a weighted histogram with a cost function that does not use the data "
+                              "uncertainties: the sum of squared weights in each bin will be ignored!")
+
         # initialize the Fitter
         self._initialize_fitter(minimizer, minimizer_kwargs)
 
@@ -83,7 +105,8 @@ class HistFit(FitBase):
             self._model_function.func,
             self.parameter_values,
             self._data_container.bin_edges,
-            model_density_func_antiderivative=self._model_function.antiderivative)
+            model_density_func_antiderivative=self._model_function.antiderivative,
+            model_density_func_gradient=self._model_function.gradient)
 
         # TODO: check where to update this (set/release/etc.)
         # FIXME: nicer way than len()?
@@ -122,42 +145,42 @@ class HistFit(FitBase):
         #self._nexus.new_alias(**{'model_density': self._model_func_handle.__name__})
 
         # bind 'model' node
-        self._nexus.new_function(lambda: self.model, function_name='model')
+        self._nexus.new_function(lambda: self.model, function_name='model', memoize=True)
         # need to set dependencies manually
         for _fpn in self._fit_param_names:
             self._nexus.add_dependency(_fpn, 'model')
         # bind other reserved nodes
-        self._nexus.new_function(lambda: self.data_error, function_name='data_error')
-        self._nexus.new_function(lambda: self.data_cov_mat, function_name='data_cov_mat')
-        self._nexus.new_function(lambda: self.data_cov_mat_inverse, function_name='data_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.model_error, function_name='model_error')
-        self._nexus.new_function(lambda: self.model_cov_mat, function_name='model_cov_mat')
-        self._nexus.new_function(lambda: self.model_cov_mat, function_name='model_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.total_error, function_name='total_error')
-        self._nexus.new_function(lambda: self.total_cov_mat, function_name='total_cov_mat')
-        self._nexus.new_function(lambda: self.total_cov_mat_inverse, function_name='total_cov_mat_inverse')
+        self._nexus.new_function(lambda: self.data_error, function_name='data_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.data_cov_mat, function_name='data_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.data_cov_mat_inverse, function_name='data_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.model_error, function_name='model_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.model_cov_mat, function_name='model_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.model_cov_mat, function_name='model_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.total_error, function_name='total_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.total_cov_mat, function_name='total_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.total_cov_mat_inverse, function_name='total_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.total_cov_mat_object, function_name='total_cov_mat_object', groups=('errors',))
+
+        # bind the model gradient, if available
+        if self._model_function.gradient is not None:
+            self._nexus.new_function(lambda: self.model_gradient, function_name='model_gradient', memoize=True)
+            # need to set dependencies manually
+            for _fpn in self._fit_param_names:
+                self._nexus.add_dependency(_fpn, 'model_gradient')
 
         # the cost function (the function to be minimized)
         self._nexus.new_function(self._cost_function.func, function_name=self._cost_function.name, add_unknown_parameters=False)
         self._nexus.new_alias(**{'cost': self._cost_function.name})
+        self._init_nexus_cost_gradient()
 
     def _invalidate_total_error_cache(self):
         self.__cache_total_error = None
         self.__cache_total_cov_mat = None
         self.__cache_total_cov_mat_inverse = None
+        self.__cache_total_cov_mat_object = None
 
     def _mark_errors_for_update(self):
-        # TODO: implement a mass 'mark_for_update' routine in Nexus
-        self._nexus.get_by_name('model').mark_for_update()
-        self._nexus.get_by_name('data_error').mark_for_update()
-        self._nexus.get_by_name('data_cov_mat').mark_for_update()
-        self._nexus.get_by_name('data_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('model_error').mark_for_update()
-        self._nexus.get_by_name('model_cov_mat').mark_for_update()
-        self._nexus.get_by_name('model_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('total_error').mark_for_update()
-        self._nexus.get_by_name('total_cov_mat').mark_for_update()
-        self._nexus.get_by_name('total_cov_mat_inverse').mark_for_update()
+        self._nexus.mark_group_for_update('errors')
 
     # -- public properties
 
@@ -170,6 +193,12 @@ class HistFit(FitBase):
     def data(self, new_data):
         if isinstance(new_data, self.CONTAINER_TYPE):
             self._data_container = deepcopy(new_data)
+            if self._data_container.weighted and not self._data_container.get_matching_errors(
+                    matching_criteria=dict(name='sum_of_squared_weights')):
+                # bin uncertainties of weighted histograms follow from the sum of squared weights
+                self._data_container.add_simple_error(
+                    err_val=np.sqrt(self._data_container.sum_of_squared_weights),
+                    name='sum_of_squared_weights', correlation=0, relative=False)
         elif isinstance(new_data, DataContainerBase):
             raise HistFitException("Incompatible container type '%s' (expected '%s')"
                                       % (type(new_data), self.CONTAINER_TYPE))
@@ -195,7 +224,13 @@ class HistFit(FitBase):
     def model(self):
         """array of model predictions for the data points"""
         self._param_model.parameters = self.parameter_values  # this is lazy, so just do it
-        return self._param_model.data * self._data_container.n_entries  # NOTE: model is just a density->scale up
+        return self._param_model.data * self._data_container.sum_of_weights  # NOTE: model is just a density->scale up
+
+    @property
+    def model_gradient(self):
+        """derivatives of the model predictions with respect to the parameters (one row per parameter)"""
+        self._param_model.parameters = self.parameter_values  # this is lazy, so just do it
+        return self._param_model.eval_model_function_derivative_by_parameters() * self._data_container.sum_of_weights
 
     @property
     def model_error(self):
@@ -228,21 +263,24 @@ class HistFit(FitBase):
     def total_cov_mat(self):
         """the total covariance matrix"""
         if self.__cache_total_cov_mat is None:
-            _tmp = self.data_cov_mat
-            _tmp += self.model_cov_mat
-            self.__cache_total_cov_mat = _tmp
+            self.__cache_total_cov_mat = self.total_cov_mat_object.mat
         return self.__cache_total_cov_mat
 
+    @property
+    def total_cov_mat_object(self):
+        """the total covariance matrix as a :py:class:`~kafe.core.error.CovMat` object (caches its factorization)"""
+        if self.__cache_total_cov_mat_object is None:
+            self._param_model.parameters = self.parameter_values  # this is lazy, so just do it
+            # sum the covariance matrix objects, preserving the diagonal + low-rank structure where possible
+            self.__cache_total_cov_mat_object = (self._data_container.get_total_error().get_cov_mat_object()
+                                                 + self._param_model.get_total_error().get_cov_mat_object())
+        return self.__cache_total_cov_mat_object
+
     @property
     def total_cov_mat_inverse(self):
         """inverse of the total covariance matrix (or ``None`` if singular)"""
         if self.__cache_total_cov_mat_inverse is None:
-            _tmp = self.total_cov_mat
-            try:
-                _tmp = _tmp.I
-                self.__cache_total_cov_mat_inverse = _tmp
-            except np.linalg.LinAlgError:
-                pass
+            self.__cache_total_cov_mat_inverse = self.total_cov_mat_object.I
         return self.__cache_total_cov_mat_inverse
 
     # -- public methods
@@ -1,6 +1,7 @@
 import inspect
 import numpy as np
 
+from ...config import kc
 from .._base import ParametricModelBaseMixin, ModelFunctionBase, ModelFunctionException, ModelParameterFormatter
 from .container import HistContainer, HistContainerException
 from .format import HistModelDensityFunctionFormatter
@@ -9,6 +10,10 @@ from .format import HistModelDensityFunctionFormatter
 __all__ = ["HistParametricModel", "HistModelFunction"]
 
 
+# Gauss-Legendre nodes and weights on [-1, 1], by order
+_GAUSS_LEGENDRE_CACHE = dict()
+
+
 class HistModelFunctionException(ModelFunctionException):
     pass
 
@@ -17,15 +22,18 @@ class HistModelFunction(ModelFunctionBase):
     EXCEPTION_TYPE = HistModelFunctionException
     FORMATTER_TYPE = HistModelDensityFunctionFormatter
 
-    def __init__(self, model_density_function, model_density_antiderivative=None):
+    def __init__(self, model_density_function, model_density_antiderivative=None, model_density_gradient=None):
         """
         Construct :py:class:`XYModelFunction` object (a wrapper for a native Python function):
 
         :param model_density_function: function handle
         :param model_density_antiderivative: function handle for model density antiderivative
+        :param model_density_gradient: function handle for the gradient of the model density with respect to
+                                       its parameters (same arguments as the model density)
         """
         self._x_name = 'x'
-        super(HistModelFunction, self).__init__(model_function=model_density_function)
+        super(HistModelFunction, self).__init__(model_function=model_density_function,
+                                                model_function_gradient=model_density_gradient)
         self._antiderivative = model_density_antiderivative
         self._validate_model_function_antiderivative_raise()
 
@@ -84,14 +92,101 @@ class HistParametricModelException(HistContainerException):
 
 
 class HistParametricModel(ParametricModelBaseMixin, HistContainer):
-    def __init__(self, n_bins, bin_range, model_density_func, model_parameters, bin_edges=None, model_density_func_antiderivative=None):
+    # number of Gauss-Legendre nodes per bin used for integrating the model density gradient
+    GRADIENT_QUADRATURE_ORDER = 10
+    # available methods for integrating the model density over the bins (if no antiderivative is given)
+    BIN_INTEGRATION_METHODS = ('gauss-legendre', 'simpson', 'quad')
+
+    def __init__(self, n_bins, bin_range, model_density_func, model_parameters, bin_edges=None,
+                 model_density_func_antiderivative=None, model_density_func_gradient=None,
+                 bin_integration_method=None, bin_integration_order=None):
         # print "IndexedParametricModel.__init__(model_func=%r, model_parameters=%r)" % (model_func, model_parameters)
         self._model_density_func_antider_handle = model_density_func_antiderivative
+        self._model_function_gradient_handle = model_density_func_gradient
+        if bin_integration_method is None:
+            bin_integration_method = kc('fit', 'histogram', 'bin_integration', 'method')
+        if bin_integration_method not in self.BIN_INTEGRATION_METHODS:
+            raise HistParametricModelException("Unknown bin integration method '%s'! Expected one of: %r"
+                                               % (bin_integration_method, self.BIN_INTEGRATION_METHODS))
+        if bin_integration_order is None:
+            bin_integration_order = kc('fit', 'histogram', 'bin_integration', 'order')
+        if bin_integration_order < 2:
+            raise HistParametricModelException("Bin integration order must be at least 2, got %r!"
+                                               % (bin_integration_order,))
+        self._bin_integration_method = bin_integration_method
+        self._bin_integration_order = int(bin_integration_order)
         super(HistParametricModel, self).__init__(model_density_func, model_parameters, n_bins, bin_range,
                                                   bin_edges=bin_edges, fill_data=None, dtype=float)
 
     # -- private methods
 
+    def _get_gauss_legendre_nodes(self, order):
+        """return the Gauss-Legendre nodes for all bins (shape ``(n_bins, order)``), the weights and the bin half-widths"""
+        _nodes_and_weights = _GAUSS_LEGENDRE_CACHE.get(order, None)
+        if _nodes_and_weights is None:
+            _nodes_and_weights = _GAUSS_LEGENDRE_CACHE[order] = np.polynomial.legendre.leggauss(order)
+        _nodes, _weights = _nodes_and_weights
+        _as = self._bin_edges[:-1]
+        _bs = self._bin_edges[1:]
+        _half_widths = 0.5 * (_bs - _as)
+        _x = (0.5 * (_as + _bs))[:, np.newaxis] + _half_widths[:, np.newaxis] * _nodes[np.newaxis, :]
+        return _x, _weights, _half_widths
+
+    def _eval_model_func_density_on_nodes(self, x):
+        # evaluate the density on a 2D array of nodes in a single call; 'None' if the function is not vectorized
+        try:
+            _fvals = np.asarray(self._model_function_handle(x, *self._model_parameters), dtype=float)
+        except (TypeError, ValueError):
+            return None
+        if _fvals.shape != x.shape:
+            return None
+        return _fvals
+
+    def _integrate_gauss_legendre(self):
+        # rules of order n and n+1 are evaluated in a single model call; their difference is the error estimate
+        _n = self._bin_integration_order
+        _x_lo, _w_lo, _half_widths = self._get_gauss_legendre_nodes(_n)
+        _x_hi, _w_hi, _ = self._get_gauss_legendre_nodes(_n + 1)
+        _fvals = self._eval_model_func_density_on_nodes(np.hstack([_x_lo, _x_hi]))
+        if _fvals is None:
+            return None, None
+        _int_lo = _fvals[:, :_n].dot(_w_lo) * _half_widths
+        _int_hi = _fvals[:, _n:].dot(_w_hi) * _half_widths
+        return _int_hi, np.abs(_int_hi - _int_lo)
+
+    def _integrate_simpson(self):
+        # composite Simpson rule; the rule with half the intervals uses every other node,
+        # so the Richardson error estimate needs no extra function evaluations
+        _n_intervals = 4 * int(np.ceil(self._bin_integration_order / 4.))
+        _as = self._bin_edges[:-1]
+        _bs = self._bin_edges[1:]
+        _steps = np.linspace(0., 1., _n_intervals + 1)
+        _x = _as[:, np.newaxis] + (_bs - _as)[:, np.newaxis] * _steps[np.newaxis, :]
+        _fvals = self._eval_model_func_density_on_nodes(_x)
+        if _fvals is None:
+            return None, None
+
+        def _simpson(fvals, n_intervals):
+            _weights = np.ones(n_intervals + 1)
+            _weights[1:-1:2] = 4.
+            _weights[2:-1:2] = 2.
+            return fvals.dot(_weights) * (_bs - _as) / (3. * n_intervals)
+
+        _int_fine = _simpson(_fvals, _n_intervals)
+        _int_coarse = _simpson(_fvals[:, ::2], _n_intervals // 2)
+        _err = np.abs(_int_fine - _int_coarse) / 15.
+        return _int_fine + (_int_fine - _int_coarse) / 15., _err
+
+    def _integrate_quad(self, bin_indices=None):
+        import scipy.integrate as integrate
+        _integrand_func = lambda x: self._model_function_handle(x, *self._model_parameters)
+        if bin_indices is None:
+            bin_indices = np.arange(self.size)
+        _int_val = np.zeros(len(bin_indices))
+        for _i, _bin_idx in enumerate(bin_indices):
+            _int_val[_i], _ = integrate.quad(_integrand_func, self._bin_edges[_bin_idx], self._bin_edges[_bin_idx + 1])
+        return _int_val
+
     def _eval_model_func_density_integral_over_bins(self):
         _as = self._bin_edges[:-1]
         _bs = self._bin_edges[1:]
@@ -100,14 +195,25 @@ class HistParametricModel(ParametricModelBaseMixin, HistContainer):
             _fval_antider_as = self._model_density_func_antider_handle(_as, *self._model_parameters)
             _fval_antider_bs = self._model_density_func_antider_handle(_bs, *self._model_parameters)
             assert len(_fval_antider_as) == len(_fval_antider_bs) == self.size
-            _int_val = np.asarray(_fval_antider_bs) - np.asarray(_fval_antider_as)
+            return np.asarray(_fval_antider_bs) - np.asarray(_fval_antider_as)
+
+        if self._bin_integration_method == 'gauss-legendre':
+            _int_val, _int_err = self._integrate_gauss_legendre()
+        elif self._bin_integration_method == 'simpson':
+            _int_val, _int_err = self._integrate_simpson()
         else:
-            import scipy.integrate as integrate
-            _integrand_func = lambda x: self._model_function_handle(x, *self._model_parameters)
-            # TODO: find more efficient alternative
-            _int_val = np.zeros(self.size)
-            for _i, (_a, _b) in enumerate(zip(_as, _bs)):
-                _int_val[_i], _ = integrate.quad(_integrand_func, _a, _b)
+            _int_val, _int_err = None, None
+
+        if _int_val is None:
+            # adaptive integration of each bin (also used if the density cannot be evaluated on arrays of nodes)
+            return self._integrate_quad()
+
+        # fall back to adaptive integration only for bins where the fixed-order rule is not accurate enough
+        _tolerance = np.maximum(kc('fit', 'histogram', 'bin_integration', 'atol'),
+                                kc('fit', 'histogram', 'bin_integration', 'rtol') * np.abs(_int_val))
+        _failed_bins = np.flatnonzero(~(_int_err <= _tolerance))
+        if len(_failed_bins):
+            _int_val[_failed_bins] = self._integrate_quad(_failed_bins)
         return _int_val
 
     def _recalculate(self):
@@ -145,5 +251,23 @@ class HistParametricModel(ParametricModelBaseMixin, HistContainer):
         _pars = model_parameters if model_parameters is not None else self._model_parameters
         return self._model_function_handle(x, *_pars)
 
+    def eval_model_function_derivative_by_parameters(self, model_parameters=None):
+        """
+        Evaluate the derivative of the bin contents (the model density integrated over each bin)
+        with respect to the model parameters. The analytic gradient of the model density is
+        integrated over the bins using Gauss-Legendre quadrature.
+
+        :param model_parameters: values of the model parameters (if ``None``, the current values are used)
+        :type model_parameters: list or ``None``
+        :return: derivatives of the bin contents, one row per parameter
+        :rtype: :py:obj:`numpy.ndarray`
+        """
+        if not self.has_analytic_gradient:
+            raise HistParametricModelException("No analytic gradient of the model density available!")
+        _pars = model_parameters if model_parameters is not None else self._model_parameters
+        _x, _weights, _half_widths = self._get_gauss_legendre_nodes(self.GRADIENT_QUADRATURE_ORDER)
+        _grad = self._eval_model_function_gradient(_x.shape, _x, *_pars)
+        return _grad.dot(_weights) * _half_widths
+
     def fill(self, entries):
         raise HistParametricModelException("Parametric model of histogram cannot be filled!")
\ No newline at end of file
@@ -74,7 +74,7 @@ class HistPlotContainer(PlotContainerBase):
         """value of model density at the support points"""
         _hist_cont = self._fitter._data_container
         _mean_bin_size = float(_hist_cont.high - _hist_cont.low)/_hist_cont.size
-        _factor = _hist_cont.n_entries * _mean_bin_size
+        _factor = _hist_cont.sum_of_weights * _mean_bin_size
         return _factor * self._fitter.eval_model_function_density(x=self.model_density_x)
 
     @property
@@ -1,6 +1,6 @@
 import numpy as np
 
-from ...core.error import MatrixGaussianError, SimpleGaussianError
+from ...core.error import MatrixGaussianError, SimpleGaussianError, LowRankCovMat
 from .._base import DataContainerException, DataContainerBase
 
 
@@ -32,12 +32,12 @@ class IndexedContainer(DataContainerBase):
     # -- private methods
 
     def _calculate_total_error(self):
-        _sz = self.size
-        _tmp_cov_mat = np.zeros((_sz, _sz))
+        # sum the covariance matrix objects, preserving the diagonal + low-rank structure where possible
+        _tmp_cov_mat = LowRankCovMat(np.zeros(self.size))
         for _err_dict in self._error_dicts.values():
             if not _err_dict['enabled']:
                 continue
-            _tmp_cov_mat += _err_dict['err'].cov_mat
+            _tmp_cov_mat = _tmp_cov_mat + _err_dict['err'].get_cov_mat_object()
 
         _total_err = MatrixGaussianError(_tmp_cov_mat, 'cov', relative=False, reference=self.data)
         self._total_error = _total_err
@@ -126,8 +126,8 @@ class IndexedContainer(DataContainerBase):
         Add a matrix uncertainty source to the data container.
         Returns an error id which uniquely identifies the created error source.
 
-        :param err_matrix: covariance or correlation matrix
-        :param matrix_type: one of ``'covariance'``/``'cov'`` or ``'correlation'``/``'cor'``
+        :param err_matrix: covariance or correlation matrix (dense or :py:mod:`scipy.sparse`)
+        :param matrix_type: one of ``'covariance'``/``'cov'``, ``'correlation'``/``'cor'`` or ``'banded'`` (lower bands of a covariance matrix)
         :type matrix_type: str
         :param name: unique name for this uncertainty source. If ``None``, the name
                      of the error source will be set to a random alphanumeric string.
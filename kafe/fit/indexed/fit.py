@@ -28,12 +28,13 @@ class IndexedFit(FitBase):
     MODEL_TYPE = IndexedParametricModel
     MODEL_FUNCTION_TYPE = IndexedModelFunction
     EXCEPTION_TYPE = IndexedFitException
-    RESERVED_NODE_NAMES = {'data', 'model', 'cost',
+    RESERVED_NODE_NAMES = {'data', 'model', 'cost', 'model_gradient', 'cost_gradient',
                           'data_error', 'model_error', 'total_error',
-                          'data_cov_mat', 'model_cov_mat', 'total_cov_mat',
+                          'data_cov_mat', 'model_cov_mat', 'total_cov_mat', 'total_cov_mat_object',
                           'data_cor_mat', 'model_cor_mat', 'total_cor_mat'}
 
-    def __init__(self, data, model_function, cost_function=IndexedCostFunction_Chi2(errors_to_use='covariance', fallback_on_singular=True), minimizer=None, minimizer_kwargs=None):
+    def __init__(self, data, model_function, cost_function=IndexedCostFunction_Chi2(errors_to_use='covariance', fallback_on_singular=True), minimizer=None, minimizer_kwargs=None,
+                 model_function_gradient=None):
         """
         Construct a fit of a model to a series of indexed measurements.
 
@@ -43,15 +44,22 @@ class IndexedFit(FitBase):
         :type model_function: :py:class:`~kafe.fit.indexed.IndexedModelFunction` or unwrapped native Python function
         :param cost_function: the cost function
         :type cost_function: :py:class:`~kafe.fit._base.CostFunctionBase`-derived or unwrapped native Python function
+        :param model_function_gradient: the gradient of the model function with respect to its parameters (optional)
+        :type model_function_gradient: unwrapped native Python function
         """
         # set the data
         self.data = data
 
         # set/construct the model function object
         if isinstance(model_function, self.__class__.MODEL_FUNCTION_TYPE):
+            if model_function_gradient is not None:
+                raise IndexedFitException("Gradient (%r) provided in constructor for %r, "
+                                          "but model function object (%r) already constructed!"
+                                          % (model_function_gradient, self.__class__, model_function))
             self._model_function = model_function
         else:
-            self._model_function = self.__class__.MODEL_FUNCTION_TYPE(model_function)
+            self._model_function = self.__class__.MODEL_FUNCTION_TYPE(model_function,
+                                                                      model_function_gradient=model_function_gradient)
 
         # validate the model function for this fit
         self._validate_model_function_for_fit_raise()
@@ -68,6 +76,7 @@ class IndexedFit(FitBase):
         self.__cache_total_error = None
         self.__cache_total_cov_mat = None
         self.__cache_total_cov_mat_inverse = None
+        self.__cache_total_cov_mat_object = None
 
         # initialize the Nexus
         self._init_nexus()
@@ -75,7 +84,8 @@ class IndexedFit(FitBase):
         # initialize the Fitter
         self._initialize_fitter(minimizer, minimizer_kwargs)
         # create the child ParametricModel objet
-        self._param_model = self._new_parametric_model(self._model_function.func, self.parameter_values, shape_like=self.data)
+        self._param_model = self._new_parametric_model(self._model_function.func, self.parameter_values, shape_like=self.data,
+                                                       model_func_gradient=self._model_function.gradient)
 
         # TODO: check where to update this (set/release/etc.)
         # FIXME: nicer way than len()?
@@ -104,42 +114,44 @@ class IndexedFit(FitBase):
 
         self._nexus.new(**_nexus_new_dict)  # Create nexus Nodes for function parameters
 
-        self._nexus.new_function(self._model_function.func, function_name=self._model_function.name, add_unknown_parameters=False)
+        self._nexus.new_function(self._model_function.func, function_name=self._model_function.name, add_unknown_parameters=False,
+                                 memoize=True)
 
         # add an alias 'model' for accessing the model values
         self._nexus.new_alias(**{'model': self._model_function.name})
 
         # bind other reserved nodes
-        self._nexus.new_function(lambda: self.data_error, function_name='data_error')
-        self._nexus.new_function(lambda: self.data_cov_mat, function_name='data_cov_mat')
-        self._nexus.new_function(lambda: self.data_cov_mat_inverse, function_name='data_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.model_error, function_name='model_error')
-        self._nexus.new_function(lambda: self.model_cov_mat, function_name='model_cov_mat')
-        self._nexus.new_function(lambda: self.model_cov_mat, function_name='model_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.total_error, function_name='total_error')
-        self._nexus.new_function(lambda: self.total_cov_mat, function_name='total_cov_mat')
-        self._nexus.new_function(lambda: self.total_cov_mat_inverse, function_name='total_cov_mat_inverse')
+        self._nexus.new_function(lambda: self.data_error, function_name='data_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.data_cov_mat, function_name='data_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.data_cov_mat_inverse, function_name='data_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.model_error, function_name='model_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.model_cov_mat, function_name='model_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.model_cov_mat, function_name='model_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.total_error, function_name='total_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.total_cov_mat, function_name='total_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.total_cov_mat_inverse, function_name='total_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.total_cov_mat_object, function_name='total_cov_mat_object', groups=('errors',))
+
+        # bind the model gradient, if available
+        if self._model_function.gradient is not None:
+            self._nexus.new_function(lambda: self.model_gradient, function_name='model_gradient', memoize=True)
+            # need to set dependencies manually
+            for _fpn in self._fit_param_names:
+                self._nexus.add_dependency(_fpn, 'model_gradient')
 
         # the cost function (the function to be minimized)
         self._nexus.new_function(self._cost_function.func, function_name=self._cost_function.name, add_unknown_parameters=False)
         self._nexus.new_alias(**{'cost': self._cost_function.name})
+        self._init_nexus_cost_gradient()
 
     def _invalidate_total_error_cache(self):
         self.__cache_total_error = None
         self.__cache_total_cov_mat = None
         self.__cache_total_cov_mat_inverse = None
+        self.__cache_total_cov_mat_object = None
 
     def _mark_errors_for_update(self):
-        # TODO: implement a mass 'mark_for_update' routine in Nexus
-        self._nexus.get_by_name('data_error').mark_for_update()
-        self._nexus.get_by_name('data_cov_mat').mark_for_update()
-        self._nexus.get_by_name('data_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('model_error').mark_for_update()
-        self._nexus.get_by_name('model_cov_mat').mark_for_update()
-        self._nexus.get_by_name('model_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('total_error').mark_for_update()
-        self._nexus.get_by_name('total_cov_mat').mark_for_update()
-        self._nexus.get_by_name('total_cov_mat_inverse').mark_for_update()
+        self._nexus.mark_group_for_update('errors')
 
     # -- public properties
 
@@ -184,6 +196,12 @@ class IndexedFit(FitBase):
         self._param_model.parameters = self.parameter_values  # this is lazy, so just do it
         return self._param_model.data
 
+    @property
+    def model_gradient(self):
+        """derivatives of the model predictions with respect to the parameters (one row per parameter)"""
+        self._param_model.parameters = self.parameter_values  # this is lazy, so just do it
+        return self._param_model.eval_model_function_derivative_by_parameters()
+
     @property
     def model_error(self):
         """array of pointwise model uncertainties"""
@@ -221,21 +239,24 @@ class IndexedFit(FitBase):
     def total_cov_mat(self):
         """the total covariance matrix"""
         if self.__cache_total_cov_mat is None:
-            _tmp = self.data_cov_mat
-            _tmp += self.model_cov_mat
-            self.__cache_total_cov_mat = _tmp
+            self.__cache_total_cov_mat = self.total_cov_mat_object.mat
         return self.__cache_total_cov_mat
 
+    @property
+    def total_cov_mat_object(self):
+        """the total covariance matrix as a :py:class:`~kafe.core.error.CovMat` object (caches its factorization)"""
+        if self.__cache_total_cov_mat_object is None:
+            self._param_model.parameters = self.parameter_values  # this is lazy, so just do it
+            # sum the covariance matrix objects, preserving the diagonal + low-rank structure where possible
+            self.__cache_total_cov_mat_object = (self._data_container.get_total_error().get_cov_mat_object()
+                                                 + self._param_model.get_total_error().get_cov_mat_object())
+        return self.__cache_total_cov_mat_object
+
     @property
     def total_cov_mat_inverse(self):
         """inverse of the total covariance matrix (or ``None`` if singular)"""
         if self.__cache_total_cov_mat_inverse is None:
-            _tmp = self.total_cov_mat
-            try:
-                _tmp = _tmp.I
-                self.__cache_total_cov_mat_inverse = _tmp
-            except np.linalg.LinAlgError:
-                pass
+            self.__cache_total_cov_mat_inverse = self.total_cov_mat_object.I
         return self.__cache_total_cov_mat_inverse
 
     # -- public methods
@@ -1,7 +1,7 @@
 import numpy as np
 
-from scipy.misc import derivative
-
+from ...config import kc
+from ...core.derivative import derivative_by_parameters
 from .._base import ParametricModelBaseMixin, ModelFunctionBase, ModelFunctionException
 from .container import IndexedContainer, IndexedContainerException
 from .format import IndexedModelFunctionFormatter
@@ -17,14 +17,17 @@ class IndexedModelFunction(ModelFunctionBase):
     EXCEPTION_TYPE = IndexedModelFunctionException
     FORMATTER_TYPE = IndexedModelFunctionFormatter
 
-    def __init__(self, model_function):
+    def __init__(self, model_function, model_function_gradient=None):
         """
         Construct :py:class:`IndexedModelFunction` object (a wrapper for a native Python function):
 
         :param model_function: function handle
+        :param model_function_gradient: function handle for the gradient of the model function with respect
+                                        to its parameters (same arguments as the model function)
         """
         self._index_name = 'i'
-        super(IndexedModelFunction, self).__init__(model_function=model_function)
+        super(IndexedModelFunction, self).__init__(model_function=model_function,
+                                                   model_function_gradient=model_function_gradient)
 
     def _validate_model_function_raise(self):
         # require 'indexed' model functions to have at least one argument
@@ -46,15 +49,18 @@ class IndexedParametricModelException(IndexedContainerException):
 
 
 class IndexedParametricModel(ParametricModelBaseMixin, IndexedContainer):
-    def __init__(self, model_func, model_parameters, shape_like=None):
+    def __init__(self, model_func, model_parameters, shape_like=None, model_func_gradient=None):
         """
         Construct an :py:obj:`IndexedParametricModel` object:
 
         :param model_func: handle of Python function (the model function)
         :param model_parameters: iterable of parameter values with which the model function should be initialized
         :param shape_like: array with the same shape as the model
+        :param model_func_gradient: handle of Python function returning the model function gradient
+                                    with respect to the parameters (optional)
         """
         # print "IndexedParametricModel.__init__(model_func=%r, model_parameters=%r)" % (model_func, model_parameters)
+        self._model_function_gradient_handle = model_func_gradient
         if shape_like is not None:
             _data = np.zeros_like(shape_like)
             _data[:] = model_func(*model_parameters)
@@ -103,28 +109,28 @@ class IndexedParametricModel(ParametricModelBaseMixin, IndexedContainer):
         _pars = model_parameters if model_parameters is not None else self._model_parameters
         return self._model_function_handle(*_pars)
 
-    def eval_model_function_derivative_by_parameters(self, model_parameters=None, par_dx=None):
+    def eval_model_function_derivative_by_parameters(self, model_parameters=None, par_dx=None,
+                                                     order=None, complex_step=None):
         """
         Evaluate the derivative of the model function with respect to the model parameters.
 
         :param model_parameters: values of the model parameters (if ``None``, the current values are used)
         :type model_parameters: list or ``None``
-        :param par_dx: step size for numeric differentiation
-        :type par_dx: float
+        :param par_dx: step size for numeric differentiation (ignored if an analytic gradient is available)
+        :type par_dx: float or list of float
+        :param order: number of points of the finite difference stencil (if ``None``, use the configured value)
+        :type order: int
+        :param complex_step: use complex-step differentiation (if ``None``, use the configured value)
+        :type complex_step: bool
         :return: value(s) of the model function derivative for the given parameters
         :rtype: :py:obj:`numpy.ndarray`
         """
         _pars = model_parameters if model_parameters is not None else self._model_parameters
-        _pars = np.asarray(_pars)
-        _par_dxs = par_dx if par_dx is not None else 1e-2 * (np.abs(_pars) + 1.0 / (1.0 + np.abs(_pars)))
-
-        _ret = []
-        for _par_idx, (_par_val, _par_dx) in enumerate(zip(_pars, _par_dxs)):
-            def _chipped_func(par):
-                _chipped_pars = _pars.copy()
-                _chipped_pars[_par_idx] = par
-                return self._model_function_handle(*_chipped_pars)
-
-            _der_val = derivative(_chipped_func, _par_val, dx=_par_dx)
-            _ret.append(_der_val)
-        return np.array(_ret)
\ No newline at end of file
+        if self.has_analytic_gradient:
+            return self._eval_model_function_gradient(self._idx_data.shape, *_pars)
+        if order is None:
+            order = kc('core', 'derivatives', 'order')
+        if complex_step is None:
+            complex_step = kc('core', 'derivatives', 'complex_step')
+        return derivative_by_parameters(self._model_function_handle, _pars,
+                                        dp=par_dx, order=order, complex_step=complex_step)
@@ -162,8 +162,13 @@ class DataContainerYamlWriter(DReprWriterMixin, DataContainerDReprBase):
             _yaml['x_data'] = self._container.x.tolist()
             _yaml['y_data'] = self._container.y.tolist()
         elif _type == 'histogram':
+            if not self._container.keeps_raw_entries:
+                raise DReprError("Cannot represent histogram container created with 'keep_raw_entries=False': "
+                                 "the raw entries are not available!")
             _yaml['bin_edges'] = self._container.bin_edges.tolist()
             _yaml['raw_data'] = list(map(float, self._container.raw_data))  # float64 -> float
+            if self._container.weighted:
+                _yaml['raw_weights'] = list(map(float, self._container.raw_weights))
         else:
             raise NotImplemented("Container type unknown or not supported: {}".format(_type))
 
@@ -224,10 +229,11 @@ class DataContainerYamlReader(DReprReaderMixin, DataContainerDReprBase):
         elif _container_type == 'histogram':
             _bin_edges = _yaml['bin_edges']
             _raw_data = _yaml['raw_data']
+            _raw_weights = _yaml.get('raw_weights', None)
             _container_obj = HistContainer(n_bins=len(_bin_edges) - 1,
                                            bin_range=(_bin_edges[0], _bin_edges[-1]),
-                                           bin_edges=_bin_edges,
-                                           fill_data=_raw_data)
+                                           bin_edges=_bin_edges)
+            _container_obj.fill(_raw_data, weights=_raw_weights)
         else:
             raise NotImplemented("Container type unknown or not supported: {}".format(_container_type))
 
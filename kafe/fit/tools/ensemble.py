@@ -1,14 +1,14 @@
 from __future__ import print_function
 
 import collections
-import matplotlib as mpl
-import matplotlib.pyplot as plt
 import numpy as np
-import scipy.stats
 import six
 
+from kafe.config import lazy_import_matplotlib
 from kafe.core.error import CovMat
 
+plt = lazy_import_matplotlib('matplotlib.pyplot')
+
 
 def cycle_axes(array, k):
     """
@@ -223,11 +223,13 @@ class EnsembleVariable(object):
     @property
     def skew(self):
         """The skew of the ensemble variable across all realizations."""
+        import scipy.stats
         return scipy.stats.skew(self._array, axis=0)
 
     @property
     def kurtosis(self):
         """The kurtosis of the ensemble variable across all realizations."""
+        import scipy.stats
         return scipy.stats.kurtosis(self._array, axis=0)
 
     @property
@@ -438,7 +440,7 @@ class EnsembleVariablePlotter(object):
     _DEFAULT_PLOT_PDF_KWARGS = dict(marker='')
     _DEFAULT_PLOT_EXPECTED_MEAN_KWARGS = dict(linewidth=1, marker='', linestyle='--',
                                               # use second color in default color cycle
-                                              color=mpl.rcParams['axes.prop_cycle'].by_key()['color'][1])
+                                              color='C1')
     _DEFAULT_PLOT_OBSERVED_MEAN_KWARGS = dict(linewidth=1, marker='', color='k')
     _DEFAULT_PLOT_ONE_SIGMA_BAND_MEAN_KWARGS = dict(color='k', alpha=0.1)
 
@@ -1,7 +1,7 @@
 import numpy as np
 import six
 
-from ...core.error import MatrixGaussianError, SimpleGaussianError
+from ...core.error import MatrixGaussianError, SimpleGaussianError, LowRankCovMat
 from ..indexed import IndexedContainer
 from ..indexed.container import IndexedContainerException
 
@@ -55,17 +55,18 @@ class XYContainer(IndexedContainer):
         return self._xy_data[axis_id]
 
     def _calculate_total_error(self):
+        # sum the covariance matrix objects, preserving the diagonal + low-rank structure where possible
         _sz = self.size
-        _tmp_cov_mat_x = np.zeros((_sz, _sz))
-        _tmp_cov_mat_y = np.zeros((_sz, _sz))
+        _tmp_cov_mat_x = LowRankCovMat(np.zeros(_sz))
+        _tmp_cov_mat_y = LowRankCovMat(np.zeros(_sz))
         for _err_dict in self._error_dicts.values():
             if not _err_dict['enabled']:
                 continue
             assert _err_dict['axis'] in (0, 1)
             if _err_dict['axis'] == 0:
-                _tmp_cov_mat_x += _err_dict['err'].cov_mat
+                _tmp_cov_mat_x = _tmp_cov_mat_x + _err_dict['err'].get_cov_mat_object()
             elif _err_dict['axis'] == 1:
-                _tmp_cov_mat_y += _err_dict['err'].cov_mat
+                _tmp_cov_mat_y = _tmp_cov_mat_y + _err_dict['err'].get_cov_mat_object()
 
         _total_err_x = MatrixGaussianError(_tmp_cov_mat_x, 'cov', relative=False, reference=self.x)
         _total_err_y = MatrixGaussianError(_tmp_cov_mat_y, 'cov', relative=False, reference=self.y)
@@ -75,10 +76,9 @@ class XYContainer(IndexedContainer):
         """recalculate total errors next time they are needed"""
         self._xy_total_errors = None
 
-    def _calculate_uncor_error_cov_mat(self, axis):
-        #calculate y uncorrelated covariance matrix
-        _sz = self.size
-        _tmp_uncor_cov_mat = np.zeros((_sz, _sz))
+    def _calculate_uncor_error_cov_mat_object(self, axis):
+        # calculate uncorrelated covariance matrix as a `CovMat` object (banded/diagonal structure is preserved)
+        _tmp_uncor_cov_mat = LowRankCovMat(np.zeros(self.size))
         for _err_dict in self._error_dicts.values():
             if not _err_dict['enabled']:
                 continue
@@ -86,10 +86,14 @@ class XYContainer(IndexedContainer):
                 continue
             _err = _err_dict["err"]
             if isinstance(_err, MatrixGaussianError):
-                _tmp_uncor_cov_mat+=_err.cov_mat
+                _tmp_uncor_cov_mat = _tmp_uncor_cov_mat + _err.get_cov_mat_object()
             else:
-                _tmp_uncor_cov_mat+=_err.cov_mat_uncor
-        return np.matrix(_tmp_uncor_cov_mat)
+                _tmp_uncor_cov_mat = _tmp_uncor_cov_mat + LowRankCovMat(_err.get_cov_mat_object().diag_part)
+        return _tmp_uncor_cov_mat
+
+    def _calculate_uncor_error_cov_mat(self, axis):
+        #calculate y uncorrelated covariance matrix
+        return np.matrix(self._calculate_uncor_error_cov_mat_object(axis).mat)
 
     def _calculate_y_nuisance_cor_design_matrix(self):
         """calculate the design matrix containing the correlated parts of all y uncertainties"""
@@ -323,8 +327,8 @@ class XYContainer(IndexedContainer):
 
         :param axis: ``'x'``/``0`` or ``'y'``/``1``
         :type axis: str or int
-        :param err_matrix: covariance or correlation matrix
-        :param matrix_type: one of ``'covariance'``/``'cov'`` or ``'correlation'``/``'cor'``
+        :param err_matrix: covariance or correlation matrix (dense or :py:mod:`scipy.sparse`)
+        :param matrix_type: one of ``'covariance'``/``'cov'``, ``'correlation'``/``'cor'`` or ``'banded'`` (lower bands of a covariance matrix)
         :type matrix_type: str
         :param name: unique name for this uncertainty source. If ``None``, the name
                      of the error source will be set to a random alphanumeric string.
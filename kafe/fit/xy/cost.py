@@ -154,7 +154,8 @@ class XYCostFunction_Chi2(CostFunctionBase_Chi2):
                 _cost_function_description += ' (pointwise errors)'
             else:
                 raise CostFunctionException("Unknown value '%s' for 'errors_to_use': must be one of ('covariance', 'pointwise', None)")
-            CostFunctionBase.__init__(self, cost_function=_chi2_func)
+            CostFunctionBase.__init__(self, cost_function=_chi2_func,
+                                      cost_function_gradient=self._get_builtin_gradient(_chi2_func))
             self._formatter.latex_name = "\chi^2"
             self._formatter.name = "chi2"
             self._formatter.description = _cost_function_description
@@ -181,7 +182,7 @@ class XYCostFunction_Chi2(CostFunctionBase_Chi2):
         return CostFunctionBase_Chi2.chi2_no_errors(data=y_data, model=y_model)
 
     @staticmethod
-    def chi2_covariance(y_data, y_model, y_total_cov_mat_inverse):
+    def chi2_covariance(y_data, y_model, y_total_cov_mat_object):
         r"""A least-squares cost function calculated from 'y' data and model values,
         considering the covariance matrix of the 'y' measurements.
 
@@ -193,10 +194,11 @@ class XYCostFunction_Chi2(CostFunctionBase_Chi2):
 
         :param y_data: measurement data
         :param y_model: model values
-        :param y_total_cov_mat_inverse: inverse of the total covariance matrix
+        :param y_total_cov_mat_object: the total covariance matrix
+        :type y_total_cov_mat_object: :py:class:`~kafe.core.error.CovMat`
         :return: cost function value
         """
-        return CostFunctionBase_Chi2.chi2_covariance(data=y_data, model=y_model, total_cov_mat_inverse=y_total_cov_mat_inverse)
+        return CostFunctionBase_Chi2.chi2_covariance(data=y_data, model=y_model, total_cov_mat_object=y_total_cov_mat_object)
 
     @staticmethod
     def chi2_pointwise_errors(y_data, y_model, y_total_error):
@@ -217,8 +219,8 @@ class XYCostFunction_Chi2(CostFunctionBase_Chi2):
         return CostFunctionBase_Chi2.chi2_pointwise_errors(data=y_data, model=y_model, total_error=y_total_error)
 
     @staticmethod
-    def chi2_xy_covariance(y_data, y_model, projected_xy_total_cov_mat_inverse):
-        return CostFunctionBase_Chi2.chi2_covariance(data=y_data, model=y_model, total_cov_mat_inverse=projected_xy_total_cov_mat_inverse)
+    def chi2_xy_covariance(y_data, y_model, projected_xy_total_cov_mat_object):
+        return CostFunctionBase_Chi2.chi2_covariance(data=y_data, model=y_model, total_cov_mat_object=projected_xy_total_cov_mat_object)
 
     @staticmethod
     def chi2_xy_pointwise_errors(y_data, y_model, x_total_error, projected_xy_total_error):
@@ -229,16 +231,64 @@ class XYCostFunction_Chi2(CostFunctionBase_Chi2):
         return CostFunctionBase_Chi2.chi2_pointwise_errors_fallback(data=y_data, model=y_model, total_error=y_total_error)
 
     @staticmethod
-    def chi2_covariance_fallback(y_data, y_model, y_total_cov_mat_inverse):
-        return CostFunctionBase_Chi2.chi2_covariance_fallback(data=y_data, model=y_model, total_cov_mat_inverse=y_total_cov_mat_inverse)
+    def chi2_covariance_fallback(y_data, y_model, y_total_cov_mat_object):
+        return CostFunctionBase_Chi2.chi2_covariance_fallback(data=y_data, model=y_model, total_cov_mat_object=y_total_cov_mat_object)
 
     @staticmethod
     def chi2_xy_pointwise_errors_fallback(y_data, y_model, projected_xy_total_error):
         return CostFunctionBase_Chi2.chi2_pointwise_errors_fallback(y_data, y_model, total_error=projected_xy_total_error)
 
     @staticmethod
-    def chi2_xy_covariance_fallback(y_data, y_model, projected_xy_total_cov_mat_inverse):
-        return CostFunctionBase_Chi2.chi2_covariance_fallback(data=y_data, model=y_model, total_cov_mat_inverse=projected_xy_total_cov_mat_inverse)
+    def chi2_xy_covariance_fallback(y_data, y_model, projected_xy_total_cov_mat_object):
+        return CostFunctionBase_Chi2.chi2_covariance_fallback(data=y_data, model=y_model, total_cov_mat_object=projected_xy_total_cov_mat_object)
+
+    # -- gradients with respect to the model parameters
+
+    @staticmethod
+    def chi2_no_errors_gradient(y_data, y_model, y_model_gradient):
+        return CostFunctionBase_Chi2.chi2_no_errors_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient)
+
+    @staticmethod
+    def chi2_covariance_gradient(y_data, y_model, y_model_gradient, y_total_cov_mat_object):
+        return CostFunctionBase_Chi2.chi2_covariance_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                              total_cov_mat_object=y_total_cov_mat_object)
+
+    @staticmethod
+    def chi2_pointwise_errors_gradient(y_data, y_model, y_model_gradient, y_total_error):
+        return CostFunctionBase_Chi2.chi2_pointwise_errors_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                                    total_error=y_total_error)
+
+    @staticmethod
+    def chi2_xy_covariance_gradient(y_data, y_model, y_model_gradient, projected_xy_total_cov_mat_object):
+        # NOTE: the projected covariance matrix is kept fixed during each minimization (it is updated
+        #       iteratively between minimizations), so it does not contribute to the gradient
+        return CostFunctionBase_Chi2.chi2_covariance_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                              total_cov_mat_object=projected_xy_total_cov_mat_object)
+
+    @staticmethod
+    def chi2_xy_pointwise_errors_gradient(y_data, y_model, y_model_gradient, x_total_error, projected_xy_total_error):
+        return CostFunctionBase_Chi2.chi2_pointwise_errors_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                                    total_error=projected_xy_total_error)
+
+    @staticmethod
+    def chi2_pointwise_errors_fallback_gradient(y_data, y_model, y_model_gradient, y_total_error):
+        return CostFunctionBase_Chi2.chi2_pointwise_errors_fallback_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                                             total_error=y_total_error)
+
+    @staticmethod
+    def chi2_covariance_fallback_gradient(y_data, y_model, y_model_gradient, y_total_cov_mat_object):
+        return CostFunctionBase_Chi2.chi2_covariance_fallback_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                                       total_cov_mat_object=y_total_cov_mat_object)
+
+    @staticmethod
+    def chi2_xy_pointwise_errors_fallback_gradient(y_data, y_model, y_model_gradient, projected_xy_total_error):
+        return CostFunctionBase_Chi2.chi2_pointwise_errors_fallback_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                                             total_error=projected_xy_total_error)
+
+    @staticmethod
+    def chi2_xy_covariance_fallback_gradient(y_data, y_model, y_model_gradient, projected_xy_total_cov_mat_object):
+        return CostFunctionBase_Chi2.chi2_covariance_fallback_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                                       total_cov_mat_object=projected_xy_total_cov_mat_object)
 
 
 class XYCostFunction_NegLogLikelihood(CostFunctionBase_NegLogLikelihood):
@@ -306,6 +356,15 @@ class XYCostFunction_NegLogLikelihood(CostFunctionBase_NegLogLikelihood):
         # "translate" the argument names
         return CostFunctionBase_NegLogLikelihood.nll_poisson(data=y_data, model=y_model)
 
+    @staticmethod
+    def nll_gaussian_gradient(y_data, y_model, y_model_gradient, y_total_error):
+        return CostFunctionBase_NegLogLikelihood.nll_gaussian_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient,
+                                                                       total_error=y_total_error)
+
+    @staticmethod
+    def nll_poisson_gradient(y_data, y_model, y_model_gradient):
+        return CostFunctionBase_NegLogLikelihood.nll_poisson_gradient(data=y_data, model=y_model, model_gradient=y_model_gradient)
+
 
 class XYCostFunction_NegLogLikelihoodRatio(CostFunctionBase_NegLogLikelihoodRatio):
     def __init__(self, data_point_distribution='poisson'):
@@ -375,7 +434,8 @@ class XYCostFunction_NegLogLikelihoodRatio(CostFunctionBase_NegLogLikelihoodRati
 
 class XYCostFunction_Chi2_Nuisance(CostFunctionBase_Chi2_Nuisance):
 
-    def __init__(self, axes_to_use='xy', errors_to_use='covariance', fallback_on_singular=True):
+    def __init__(self, axes_to_use='xy', errors_to_use='covariance', fallback_on_singular=True,
+                 profile_x_nuisance=False, profile_y_nuisance=False):
 
         """
         Built-in least-squares cost function with nuisanceparameters for *xy* data.
@@ -384,7 +444,22 @@ class XYCostFunction_Chi2_Nuisance(CostFunctionBase_Chi2_Nuisance):
         :type errors_to_use: ``'covariance'``, ``'pointwise'`` or ``None``
         :param axes_to_use: take into account errors for which axes
         :type axes_to_use: ``'y'`` or ``'xy'``
+        :param profile_x_nuisance: if ``True``, the uncorrelated *x* nuisance parameters are not passed to the
+                                   minimizer, but are profiled out (i.e. determined by minimizing the cost function
+                                   for the current values of all other parameters) on each evaluation.
+                                   Requires **errors_to_use** ``'covariance'`` and **axes_to_use** ``'x'`` or ``'xy'``.
+        :type profile_x_nuisance: bool
+        :param profile_y_nuisance: if ``True``, the nuisance parameters for the correlated *y* uncertainties are not
+                                   passed to the minimizer, but are calculated in closed form on each evaluation.
+                                   Requires **errors_to_use** ``'covariance'`` and **axes_to_use** ``'y'`` or ``'xy'``.
+        :type profile_y_nuisance: bool
         """
+        if profile_x_nuisance and (errors_to_use != 'covariance' or axes_to_use not in ('x', 'xy')):
+            raise CostFunctionException("Profiling the 'x' nuisance parameters requires errors_to_use='covariance' "
+                                        "and axes_to_use 'x' or 'xy', got %r and %r!" % (errors_to_use, axes_to_use))
+        if profile_y_nuisance and (errors_to_use != 'covariance' or axes_to_use not in ('y', 'xy')):
+            raise CostFunctionException("Profiling the 'y' nuisance parameters requires errors_to_use='covariance' "
+                                        "and axes_to_use 'y' or 'xy', got %r and %r!" % (errors_to_use, axes_to_use))
 
         if errors_to_use==None:
             _chi2_nui = self.chi2_no_error
@@ -445,6 +520,8 @@ class XYCostFunction_Chi2_Nuisance(CostFunctionBase_Chi2_Nuisance):
                 self.set_flag('need_x_nuisance', True)
                 self.set_flag('need_y_nuisance', True)
                 self._formatter.latex_name = r"\chi^{2}_{nui}(\sigma_x,\sigma_y)"
+            self.set_flag('profile_x_nuisance', profile_x_nuisance)
+            self.set_flag('profile_y_nuisance', profile_y_nuisance)
         else:
             if axes_to_use == 'y':
                 self._formatter.latex_name = r"\chi^{2}_{nui}(\sigma_y)"
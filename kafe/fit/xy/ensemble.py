@@ -1,16 +1,19 @@
+import multiprocessing
+
 import numpy as np
-import scipy.stats
 import six
 
 from ...core.error import CovMat
+from ...tools import can_fork_worker_processes, get_worker_object, worker_pool
 from .._base import FitEnsembleBase, FitEnsembleException
 from ..tools.ensemble import EnsembleVariable, EnsembleVariablePlotter
 from .cost import XYCostFunction_Chi2
 from .fit import XYFit
 
-import matplotlib as mpl
-from matplotlib import pyplot as plt
-from matplotlib import gridspec as gs
+from ...config import lazy_import_matplotlib
+
+plt = lazy_import_matplotlib('matplotlib.pyplot')
+gs = lazy_import_matplotlib('matplotlib.gridspec')
 
 
 __all__ = ["XYFitEnsemble"]
@@ -36,6 +39,12 @@ def _heuristic_optimal_subplot_grid_size(n_subplots, aspect_ratio_priority=0.5):
     return s, s+k
 
 
+def _run_experiments_in_worker(seed_and_experiment_indices):
+    # each pool worker holds its own copy of the ensemble
+    _seed, _experiment_indices = seed_and_experiment_indices
+    return get_worker_object()._run_experiments(_seed, _experiment_indices)
+
+
 class XYFitEnsembleException(FitEnsembleException):
     pass
 
@@ -63,6 +72,9 @@ class XYFitEnsemble(FitEnsembleBase):
     """
     FIT_TYPE = XYFit
 
+    # number of pseudo-datasets to generate at once
+    PSEUDODATA_CHUNK_SIZE = 1000
+
     AVAILABLE_STATISTICS = {
         'mean': EnsembleVariable.mean,
         'mean_error': EnsembleVariable.mean_error,
@@ -131,46 +143,96 @@ class XYFitEnsemble(FitEnsembleBase):
 
     def _set_toy_fit_parameters_to_reference(self):
         """set the model parameters of the toy fit to the reference values"""
-        self._toy_fit._param_model._model_parameters = self._model_parameters
-        self._toy_fit._param_model._pm_calculation_stale = True
+        self._toy_fit._param_model.parameters = self._model_parameters
+        # start fitting from the reference values (and with all nuisance parameters set to zero)
+        _n_nuisance = len(self._toy_fit._fit_param_names) - self._n_par
+        self._toy_fit.set_all_parameter_values(list(self._model_parameters) + [0.0] * _n_nuisance)
+
+    @staticmethod
+    def _get_cov_mat_sqrt(cov_mat):
+        """return a matrix `A` with `A A^T` equal to the covariance matrix, for drawing correlated Gaussian noise"""
+        _cov_mat = np.asarray(cov_mat)
+        try:
+            return np.linalg.cholesky(_cov_mat)
+        except np.linalg.LinAlgError:
+            # singular (e.g. fully correlated) covariance matrix -> use the eigendecomposition instead
+            _eig_vals, _eig_vecs = np.linalg.eigh(_cov_mat)
+            return _eig_vecs * np.sqrt(np.clip(_eig_vals, 0.0, None))
+
+    def _generate_pseudodata(self, seed, experiment_indices):
+        """
+        generate pseudo-data for several experiments at once according to fit error model
 
-    def _generate_pseudodata(self):
-        """generate new pseudo-data according to fit error model and commit to data container"""
+        The standard normal deviates for each experiment are drawn from a random number stream which
+        depends only on the `seed` and the experiment index. They are then transformed into correlated
+        *x* and *y* jitters using the cached factors of the reference covariance matrices.
+
+        :return: tuple of arrays of shape ``(len(experiment_indices), n_dat)`` with the *x* and *y* pseudo-data
+        """
 
         if not self._toy_fit.has_errors:
             raise FitEnsembleException("Cannot generate fit ensemble: no error model specified!")
 
-        # -- generate 'x' data
-        _x_data = self._ref_x_data.copy()
+        _has_x_errors = self._toy_fit._data_container.has_x_errors
 
-        if self._toy_fit._data_container.has_x_errors:
-            # smear x data according to the total 'x' covariance matrix
-            # TODO: only gaussian smearing is implemented -> more?
-            _x_jitter =  np.random.multivariate_normal(
-                np.zeros_like(_x_data),
-                self._ref_x_cov_mat)
-            _x_data += _x_jitter
+        # -- draw standard normal deviates
+        _x_normal = np.zeros((len(experiment_indices), self.n_dat))
+        _y_normal = np.empty((len(experiment_indices), self.n_dat))
+        for _i, _i_exp in enumerate(experiment_indices):
+            _random_state = np.random.RandomState([seed, _i_exp])
+            if _has_x_errors:
+                _x_normal[_i] = _random_state.standard_normal(self.n_dat)
+            _y_normal[_i] = _random_state.standard_normal(self.n_dat)
 
-        _y_data = self._toy_fit.eval_model_function(x=_x_data,
-                                                    model_parameters=self._model_parameters)
+        # -- generate 'x' data
+        # TODO: only gaussian smearing is implemented -> more?
+        _x_data = np.tile(self._ref_x_data, (len(experiment_indices), 1))
+        if _has_x_errors:
+            # smear x data according to the total 'x' covariance matrix
+            _x_data += _x_normal.dot(self._ref_x_cov_mat_sqrt.T)
+            _y_data = np.array([self._toy_fit.eval_model_function(x=_x, model_parameters=self._model_parameters)
+                                for _x in _x_data])
+        else:
+            _y_data = np.tile(self._ref_y_data, (len(experiment_indices), 1))
 
         # smear y data according to the total 'y' covariance matrix
-        # TODO: only gaussian smearing is implemented -> more?
-        _y_jitter = np.random.multivariate_normal(
-            np.zeros_like(_y_data),
-            self._ref_y_cov_mat)
-        _y_data += _y_jitter
+        _y_data += _y_normal.dot(self._ref_y_cov_mat_sqrt.T)
+
+        return _x_data, _y_data
 
-        # update toy fit data container
-        self._toy_fit._data_container.x = _x_data
-        self._toy_fit._data_container.y = _y_data
+    def _set_toy_fit_data(self, x_data, y_data):
+        """commit pseudo-data to the toy fit data container"""
+        self._toy_fit._data_container.x = x_data
+        self._toy_fit._data_container.y = y_data
+        # update the data nodes explicitly: they need not share memory with the container (e.g. in copies)
+        self._toy_fit._nexus.set(x_data=self._toy_fit.x_data, y_data=self._toy_fit.y_data)
 
     def _gather_results_from_toy_fit(self, i_exp):
         for _var_name in self._requested_results:
             self._ensemble_variables[_var_name].set_value(index=i_exp, variable_value=self._get_var(_var_name))
 
+    def _run_experiments(self, seed, experiment_indices):
+        """
+        Perform the pseudo-experiments with the given indices and return the collected results.
+
+        The pseudo-data for each experiment are drawn from a random number stream which depends only on
+        the `seed` and the experiment index. Every toy fit starts from the reference parameter values,
+        so that the result of an experiment does not depend on the experiments performed before it.
+        """
+        for _i_chunk in six.moves.range(0, len(experiment_indices), self.PSEUDODATA_CHUNK_SIZE):
+            _chunk_indices = experiment_indices[_i_chunk:_i_chunk + self.PSEUDODATA_CHUNK_SIZE]
+            _x_data, _y_data = self._generate_pseudodata(seed, _chunk_indices)
+            for _i_exp, _x, _y in zip(_chunk_indices, _x_data, _y_data):
+                self._set_toy_fit_parameters_to_reference()
+                self._set_toy_fit_data(_x, _y)
+                self._do_toy_fit()
+                self._gather_results_from_toy_fit(_i_exp)
+        return {_var_name: self._ensemble_variables[_var_name].values[experiment_indices]
+                for _var_name in self._requested_results}
+
     def _do_toy_fit(self):
         """run fit with current pseudo-data"""
+        self._toy_fit._mark_errors_for_update()
         self._toy_fit._invalidate_total_error_cache()
         self._toy_fit.do_fit()
 
@@ -179,6 +241,7 @@ class XYFitEnsemble(FitEnsembleBase):
         return self.AVAILABLE_RESULTS[var_name].fget(self)
 
     def _initialize_ensemble_variables(self):
+        import scipy.stats
         self._ensemble_variables = {}
         self._ensemble_variable_plotters = {}
         if 'y_pulls' in self._requested_results:
@@ -282,13 +345,18 @@ class XYFitEnsemble(FitEnsembleBase):
         self._ref_x_err = self._toy_fit.x_total_error
         self._ref_y_err = self._toy_fit.y_total_error
         self._ref_projected_xy_err = self._toy_fit.projected_xy_total_error
+        # factor the covariance matrices once for generating all pseudo-data
+        self._ref_x_cov_mat_sqrt = None
+        if self._toy_fit._data_container.has_x_errors:
+            self._ref_x_cov_mat_sqrt = self._get_cov_mat_sqrt(self._ref_x_cov_mat)
+        self._ref_y_cov_mat_sqrt = self._get_cov_mat_sqrt(self._ref_y_cov_mat)
 
     # -- private properties
 
     @property
     def _x_data(self):
         """property for ensemble variable 'x_data'"""
-        return self._toy_fit.x
+        return self._toy_fit.x_data
 
     @property
     def _parameter_pulls(self):
@@ -360,15 +428,54 @@ class XYFitEnsemble(FitEnsembleBase):
     # "inherit" docstring
     add_matrix_error.__doc__ = XYFit.add_matrix_error.__doc__
 
-    def run(self):
-        """Perform the pseudo-experiments. Retrieve and store the requested fit result variables."""
+    def run(self, seed=None, backend='serial', n_workers=None):
+        """
+        Perform the pseudo-experiments. Retrieve and store the requested fit result variables.
+
+        The pseudo-experiments can be distributed over several workers, each using its own copy of the
+        toy fit. The results for a given `seed` are identical regardless of the backend and the number
+        of workers.
+
+        :param seed: seed for generating the pseudo-data. If ``None``, a seed is drawn from the
+                     global :py:mod:`numpy.random` state.
+        :type seed: int
+        :param backend: how to run the pseudo-experiments: ``'serial'``, ``'thread'`` (thread pool)
+                        or ``'process'`` (pool of forked processes). The ``'process'`` backend is not
+                        available on platforms which do not support forking (e.g. Windows).
+        :type backend: str
+        :param n_workers: number of workers for the ``'thread'`` and ``'process'`` backends.
+                          If ``None``, the number of CPUs is used.
+        :type n_workers: int
+        """
+        if backend not in ('serial', 'thread', 'process'):
+            raise XYFitEnsembleException("Unknown backend '{}': expected one of "
+                                         "'serial', 'thread' or 'process'!".format(backend))
+        if backend == 'process' and not can_fork_worker_processes():
+            raise XYFitEnsembleException("Cannot use backend 'process': worker processes cannot be forked "
+                                         "on this platform. Use backend 'thread' instead.")
+        if seed is None:
+            seed = np.random.randint(0, 2**31 - 1)
+
         self._set_toy_fit_parameters_to_reference()
         self._update_reference_quantities_from_toy_fit()
         self._initialize_ensemble_variables()
-        for _i_exp in six.moves.range(self.n_exp):
-            self._generate_pseudodata()
-            self._do_toy_fit()
-            self._gather_results_from_toy_fit(_i_exp)
+
+        _experiment_indices = np.arange(self.n_exp)
+        if backend == 'serial':
+            self._run_experiments(seed, _experiment_indices)
+            return
+
+        if n_workers is None:
+            n_workers = multiprocessing.cpu_count()
+        _shards = [_shard for _shard in np.array_split(_experiment_indices, max(1, int(n_workers))) if len(_shard)]
+
+        with worker_pool(self, len(_shards), backend) as _pool:
+            _shard_results = _pool.map(_run_experiments_in_worker, [(seed, _shard) for _shard in _shards])
+
+        # merge the results from all workers
+        for _shard, _results in zip(_shards, _shard_results):
+            for _var_name, _values in six.iteritems(_results):
+                self._ensemble_variables[_var_name].set_value(index=_shard, variable_value=_values)
 
     def get_results(self, *results):
         """
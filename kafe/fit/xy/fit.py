@@ -6,9 +6,11 @@ import six
 import sys
 import textwrap
 
+from scipy import linalg
+
 from ...tools import print_dict_as_table
 from ...core import NexusFitter, Nexus
-from ...core.error import MatrixGaussianError, SimpleGaussianError
+from ...core.error import MatrixGaussianError, SimpleGaussianError, ProjectedCovMat
 from ...config import kc
 from .._base import (FitException, FitBase, DataContainerBase,
                      ModelParameterFormatter, CostFunctionBase)
@@ -30,18 +32,20 @@ class XYFit(FitBase):
     MODEL_TYPE = XYParametricModel
     MODEL_FUNCTION_TYPE = XYModelFunction
     EXCEPTION_TYPE = XYFitException
-    RESERVED_NODE_NAMES = {'y_data', 'y_model', 'cost',
+    RESERVED_NODE_NAMES = {'y_data', 'y_model', 'cost', 'y_model_gradient', 'cost_gradient',
                            'x_error', 'y_data_error', 'y_model_error', 'total_error',
                            'x_cov_mat', 'y_data_cov_mat', 'y_model_cov_mat', 'total_cov_mat',
                            'x_cor_mat', 'y_data_cor_mat', 'y_model_cor_mat', 'total_cor_mat',
-                           'x_cov_mat_inverse', 'y_data_cov_mat_inverse', 'y_model_cov_mat_inverse', 'total_cor_mat_inverse'
+                           'x_cov_mat_inverse', 'y_data_cov_mat_inverse', 'y_model_cov_mat_inverse', 'total_cor_mat_inverse',
+                           'x_total_cov_mat_object', 'y_total_cov_mat_object', 'projected_xy_total_cov_mat_object',
                            'y_data_uncor_cov_mat', 'y_model_uncor_cov_mat','y_total_uncor_cov_mat',
                            'nuisance_y_data_cor_cov_mat','nuisance_y_model_cor_cov_mat','nuisance_y_total_cor_cov_mat',
                            'nuisance_para', 'y_nuisance_vector'}
 
     def __init__(self, xy_data, model_function,
                  cost_function=XYCostFunction_Chi2(axes_to_use='xy', errors_to_use='covariance'),
-                 minimizer=None, minimizer_kwargs=None):
+                 minimizer=None, minimizer_kwargs=None,
+                 model_function_gradient=None, model_function_derivative_by_x=None):
         """
         Construct a fit of a model to *xy* data.
 
@@ -51,6 +55,10 @@ class XYFit(FitBase):
         :type model_function: :py:class:`~kafe.fit.xy.XYModelFunction` or unwrapped native Python function
         :param cost_function: the cost function
         :type cost_function: :py:class:`~kafe.fit._base.CostFunctionBase`-derived or unwrapped native Python function
+        :param model_function_gradient: the gradient of the model function with respect to its parameters (optional)
+        :type model_function_gradient: unwrapped native Python function
+        :param model_function_derivative_by_x: the derivative of the model function with respect to *x* (optional)
+        :type model_function_derivative_by_x: unwrapped native Python function
         """
         # set the data
         self.data = xy_data
@@ -59,9 +67,17 @@ class XYFit(FitBase):
 
         # set/construct the model function object
         if isinstance(model_function, self.__class__.MODEL_FUNCTION_TYPE):
+            if model_function_gradient is not None or model_function_derivative_by_x is not None:
+                raise XYFitException("Derivatives (%r, %r) provided in constructor for %r, "
+                                     "but model function object (%r) already constructed!"
+                                     % (model_function_gradient, model_function_derivative_by_x,
+                                        self.__class__, model_function))
             self._model_function = model_function
         else:
-            self._model_function = self.__class__.MODEL_FUNCTION_TYPE(model_function)
+            self._model_function = self.__class__.MODEL_FUNCTION_TYPE(
+                model_function,
+                model_function_gradient=model_function_gradient,
+                model_function_derivative_by_x=model_function_derivative_by_x)
 
         # validate the model function for this fit
         self._validate_model_function_for_fit_raise()
@@ -84,7 +100,9 @@ class XYFit(FitBase):
         self._initialize_fitter(minimizer, minimizer_kwargs)
         # create the child ParametricModel object
         self._param_model = self._new_parametric_model(self.x_model, self._model_function.func,
-                                                       self.poi_values)
+                                                       self.poi_values,
+                                                       model_func_gradient=self._model_function.gradient,
+                                                       model_func_derivative_by_x=self._model_function.derivative_by_x)
 
         # TODO: check where to update this (set/release/etc.)
         # FIXME: nicer way than len()?
@@ -101,7 +119,7 @@ class XYFit(FitBase):
 
         # create nexus function Nodes for the x and y model values
         self._nexus.new_function(lambda: self.x_model, function_name='x_model')
-        self._nexus.new_function(lambda: self.y_model, function_name='y_model')
+        self._nexus.new_function(lambda: self.y_model, function_name='y_model', memoize=True)
 
         # create a nexus Node for each parameter of the model function
         _nexus_new_dict = OrderedDict()
@@ -110,6 +128,7 @@ class XYFit(FitBase):
         self._fit_param_names = []  # names of all fit parameters (including nuisance parameters)
         self._poi_names = []  # names of the parameters of interest (i.e. the model parameters)
         self._y_nuisance_names = []  # names of all nuisance parameters accounting for correlated y errors
+        self._y_profiled_nuisance_names = []  # names of the correlated y nuisance parameters calculated in closed form
         self._x_uncor_nuisance_names = []  # names of all nuisance parameters accounting for uncorrelated x errors
         # TODO
         # self._x_cor_nuisance_names = []  # names of all nuisance parameters accounting for correlated x errors
@@ -135,8 +154,12 @@ class XYFit(FitBase):
         def _calc_y_nuisance_vector(*n_para):
             return np.asarray(n_para)
 
-        self._nexus.new_function(_calc_y_nuisance_vector, function_name="y_nuisance_vector",
-                                 add_unknown_parameters=False)
+        if self._cost_function.get_flag("profile_y_nuisance"):
+            # the 'y' nuisance parameters are not fit parameters, but are calculated on each evaluation
+            self._nexus.new_function(lambda: self.y_nuisance_values, function_name="y_nuisance_vector")
+        else:
+            self._nexus.new_function(_calc_y_nuisance_vector, function_name="y_nuisance_vector",
+                                     add_unknown_parameters=False)
 
         # TODO
         # x-nuisance vector for correlated errors
@@ -164,14 +187,20 @@ class XYFit(FitBase):
             )
             for _err_name, _err_obj in six.iteritems(_nuisance_error_objects):
                 _nuisance_name = "_n_yc_{}".format(_err_name)
+                if self._cost_function.get_flag("profile_y_nuisance"):
+                    self._y_profiled_nuisance_names.append(_nuisance_name)
+                    continue
                 self._nexus.new(**{_nuisance_name: 0.0})
                 self._nexus.add_dependency(_nuisance_name, "y_nuisance_vector")
                 self._fit_param_names.append(_nuisance_name)
                 self._y_nuisance_names.append(_nuisance_name)
-            self._nexus.set_function_parameter_names("y_nuisance_vector", self._y_nuisance_names)
+            if not self._cost_function.get_flag("profile_y_nuisance"):
+                self._nexus.set_function_parameter_names("y_nuisance_vector", self._y_nuisance_names)
 
         # one 'x' nuisance parameter per data point (TODO: and one per correlated 'x' error)
-        if self._cost_function.get_flag("need_x_nuisance") and self._data_container.has_uncor_x_errors:
+        # if they are profiled, the 'x' nuisance parameters are determined when calculating 'x_model' instead
+        if (self._cost_function.get_flag("need_x_nuisance") and self._data_container.has_uncor_x_errors
+                and not self._cost_function.get_flag("profile_x_nuisance")):
             # one 'x' nuisance parameter per data point
             for i in six.moves.range(self._data_container.size):
                 _nuisance_name = "_n_xu_{}".format(i)
@@ -198,53 +227,56 @@ class XYFit(FitBase):
 
         # -- bind other reserved nodes
 
-        self._nexus.new_function(lambda: self.x_data_error, function_name='x_data_error')
-        self._nexus.new_function(lambda: self.x_data_cov_mat, function_name='x_data_cov_mat')
-        self._nexus.new_function(lambda: self.x_data_cov_mat_inverse, function_name='x_data_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.x_model_error, function_name='x_model_error')
-        self._nexus.new_function(lambda: self.x_model_cov_mat, function_name='x_model_cov_mat')
-        self._nexus.new_function(lambda: self.x_model_cov_mat_inverse, function_name='x_model_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.x_total_error, function_name='x_total_error')
-        self._nexus.new_function(lambda: self.x_total_cov_mat, function_name='x_total_cov_mat')
-        self._nexus.new_function(lambda: self.x_total_cov_mat_inverse, function_name='x_total_cov_mat_inverse')
-
-        self._nexus.new_function(lambda: self.projected_xy_total_error, function_name='projected_xy_total_error')
-        self._nexus.new_function(lambda: self.projected_xy_total_cov_mat, function_name='projected_xy_total_cov_mat')
-        self._nexus.new_function(lambda: self.projected_xy_total_cov_mat_inverse, function_name='projected_xy_total_cov_mat_inverse')
-
-        self._nexus.new_function(lambda: self.y_data_error, function_name='y_data_error')
-        self._nexus.new_function(lambda: self.y_data_cov_mat, function_name='y_data_cov_mat')
-        self._nexus.new_function(lambda: self.y_data_cov_mat_inverse, function_name='y_data_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.y_model_error, function_name='y_model_error')
-        self._nexus.new_function(lambda: self.y_model_cov_mat, function_name='y_model_cov_mat')
-        self._nexus.new_function(lambda: self.y_model_cov_mat_inverse, function_name='y_model_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.y_total_error, function_name='y_total_error')
-        self._nexus.new_function(lambda: self.y_total_cov_mat, function_name='y_total_cov_mat')
-        self._nexus.new_function(lambda: self.y_total_cov_mat_inverse, function_name='y_total_cov_mat_inverse')
+        self._nexus.new_function(lambda: self.x_data_error, function_name='x_data_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_data_cov_mat, function_name='x_data_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_data_cov_mat_inverse, function_name='x_data_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_model_error, function_name='x_model_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_model_cov_mat, function_name='x_model_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_model_cov_mat_inverse, function_name='x_model_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_total_error, function_name='x_total_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_total_cov_mat, function_name='x_total_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_total_cov_mat_inverse, function_name='x_total_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_total_cov_mat_object, function_name='x_total_cov_mat_object', groups=('errors',))
+
+        self._nexus.new_function(lambda: self.projected_xy_total_error, function_name='projected_xy_total_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.projected_xy_total_cov_mat, function_name='projected_xy_total_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.projected_xy_total_cov_mat_inverse, function_name='projected_xy_total_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.projected_xy_total_cov_mat_object, function_name='projected_xy_total_cov_mat_object', groups=('errors',))
+
+        self._nexus.new_function(lambda: self.y_data_error, function_name='y_data_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_data_cov_mat, function_name='y_data_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_data_cov_mat_inverse, function_name='y_data_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_model_error, function_name='y_model_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_model_cov_mat, function_name='y_model_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_model_cov_mat_inverse, function_name='y_model_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_total_error, function_name='y_total_error', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_total_cov_mat, function_name='y_total_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_total_cov_mat_inverse, function_name='y_total_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_total_cov_mat_object, function_name='y_total_cov_mat_object', groups=('errors',))
 
         #correlated error matrix (for cor-nuisance approach)
-        self._nexus.new_function(lambda: self._y_data_nuisance_cor_design_mat, function_name='_y_data_nuisance_cor_design_mat')
-        self._nexus.new_function(lambda: self._y_model_nuisance_cor_design_mat, function_name='_y_model_nuisance_cor_design_mat')
-        self._nexus.new_function(lambda: self._y_total_nuisance_cor_design_mat, function_name='_y_total_nuisance_cor_design_mat')
+        self._nexus.new_function(lambda: self._y_data_nuisance_cor_design_mat, function_name='_y_data_nuisance_cor_design_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self._y_model_nuisance_cor_design_mat, function_name='_y_model_nuisance_cor_design_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self._y_total_nuisance_cor_design_mat, function_name='_y_total_nuisance_cor_design_mat', groups=('errors',))
 
         #uncorrelated y error cov matrix
-        self._nexus.new_function(lambda: self.y_data_uncor_cov_mat, function_name='y_data_uncor_cov_mat')
-        self._nexus.new_function(lambda: self.y_data_uncor_cov_mat_inverse,function_name='y_data_uncor_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.y_model_uncor_cov_mat, function_name='y_model_uncor_cov_mat')
-        self._nexus.new_function(lambda: self.y_model_uncor_cov_mat_inverse, function_name='y_model_uncor_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.y_total_uncor_cov_mat, function_name='y_total_uncor_cov_mat')
-        self._nexus.new_function(lambda: self.y_total_uncor_cov_mat_inverse, function_name='y_total_uncor_cov_mat_inverse')
+        self._nexus.new_function(lambda: self.y_data_uncor_cov_mat, function_name='y_data_uncor_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_data_uncor_cov_mat_inverse,function_name='y_data_uncor_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_model_uncor_cov_mat, function_name='y_model_uncor_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_model_uncor_cov_mat_inverse, function_name='y_model_uncor_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_total_uncor_cov_mat, function_name='y_total_uncor_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.y_total_uncor_cov_mat_inverse, function_name='y_total_uncor_cov_mat_inverse', groups=('errors',))
         # correlated x_error cov matrix (nuisance) TODO: correlated x-errors
         # self._nexus.new_function(lambda: self.nuisance_x_data_cor_cov_mat, function_name='nuisance_x_data_cor_cov_mat')
         # self._nexus.new_function(lambda: self.nuisance_x_model_cor_cov_mat,function_name='nuisance_x_model_cor_cov_mat')
         # self._nexus.new_function(lambda: self.nuisance_x_total_cor_cov_mat,function_name='nuisance_x_total_cor_cov_mat')
         # uncorrelated x error cov matrix
-        self._nexus.new_function(lambda: self.x_data_uncor_cov_mat, function_name='x_data_uncor_cov_mat')
-        self._nexus.new_function(lambda: self.x_data_uncor_cov_mat_inverse, function_name='x_data_uncor_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.x_model_uncor_cov_mat, function_name='x_model_uncor_cov_mat')
-        self._nexus.new_function(lambda: self.x_model_uncor_cov_mat_inverse, function_name='x_model_uncor_cov_mat_inverse')
-        self._nexus.new_function(lambda: self.x_total_uncor_cov_mat, function_name='x_total_uncor_cov_mat')
-        self._nexus.new_function(lambda: self.x_total_uncor_cov_mat_inverse, function_name='x_total_uncor_cov_mat_inverse')
+        self._nexus.new_function(lambda: self.x_data_uncor_cov_mat, function_name='x_data_uncor_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_data_uncor_cov_mat_inverse, function_name='x_data_uncor_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_model_uncor_cov_mat, function_name='x_model_uncor_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_model_uncor_cov_mat_inverse, function_name='x_model_uncor_cov_mat_inverse', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_total_uncor_cov_mat, function_name='x_total_uncor_cov_mat', groups=('errors',))
+        self._nexus.new_function(lambda: self.x_total_uncor_cov_mat_inverse, function_name='x_total_uncor_cov_mat_inverse', groups=('errors',))
 
         # the cost function (the function to be minimized)
         self._nexus.new_function(self._cost_function.func, function_name=self._cost_function.name,
@@ -252,10 +284,25 @@ class XYFit(FitBase):
 
         self._nexus.new_alias(**{'cost': self._cost_function.name})
 
+        # the cost function gradient can only be assembled if there are no nuisance parameters
+        if self._model_function.gradient is not None and self._fit_param_names == self._poi_names:
+            self._nexus.new_function(lambda: self.y_model_gradient, function_name='y_model_gradient', memoize=True)
+            self._init_nexus_cost_gradient()
+        else:
+            self._cost_gradient_name = None
+
         # add nexus dependencies to recalculate model
         # whenever nuisance parameters change
         for _arg_name in self._x_uncor_nuisance_names:
              self._nexus.add_dependency(source=_arg_name, target='x_model')
+        if self._x_uncor_nuisance_profiled:
+            # the profiled 'x' nuisance parameters depend on the 'y' data and on all other fit parameters
+            for _arg_name in ['y_data'] + self._poi_names + self._y_nuisance_names:
+                self._nexus.add_dependency(source=_arg_name, target='x_model')
+        if self._cost_function.get_flag("profile_y_nuisance"):
+            # the calculated 'y' nuisance parameters depend on the 'y' residuals and on the 'y' errors
+            for _arg_name in ('y_data', 'y_model', 'y_total_uncor_cov_mat_inverse', '_y_total_nuisance_cor_design_mat'):
+                self._nexus.add_dependency(source=_arg_name, target='y_nuisance_vector')
 
         self._nexus.add_dependency(source='x_data_cov_mat', target='x_model')
         self._nexus.add_dependency(source='x_data_error', target='x_model')
@@ -265,92 +312,234 @@ class XYFit(FitBase):
         for _arg_name in self._poi_names:
             self._nexus.add_dependency(source=_arg_name, target="y_model")
 
+        if self._cost_gradient_name is not None:
+            self._nexus.add_dependency(source='x_model', target="y_model_gradient")
+            for _arg_name in self._poi_names:
+                self._nexus.add_dependency(source=_arg_name, target="y_model_gradient")
+
     def _invalidate_total_error_cache(self):
         self.__cache_x_data_error = None
         self.__cache_x_data_cov_mat = None
         self.__cache_x_total_error = None
         self.__cache_x_total_cov_mat = None
         self.__cache_x_total_cov_mat_inverse = None
+        self.__cache_x_total_cov_mat_object = None
         self.__cache_projected_xy_total_error = None
         self.__cache_projected_xy_total_cov_mat = None
         self.__cache_projected_xy_total_cov_mat_inverse = None
+        self.__cache_projected_xy_total_cov_mat_object = None
         self.__cache_y_total_error = None
         self.__cache_y_total_cov_mat = None
         self.__cache_y_total_cov_mat_inverse = None
+        self.__cache_y_total_cov_mat_object = None
         self.__cache_y_error_band = None
         self.__cache_y_total_uncor_cov_mat = None
         self.__cache_y_total_uncor_cov_mat_inverse = None
+        self.__cache_y_total_uncor_cov_mat_object = None
         self.__cache_y_total_nuisance_cor_design_mat = None
         self.__cache_x_total_uncor_cov_mat = None
         self.__cache_x_total_uncor_cov_mat_inverse = None
+        self.__cache_x_total_uncor_cov_mat_object = None
         # self.__cache_nuisance_x_total_uncor_cov_mat = None
+        self.__projected_xy_update_pending = False
+        self.__cache_x_nuisance_profile_weights = None
+        self.__cache_x_nuisance_profile = None
+        self.__cache_y_nuisance_profile_factorization = None
+
+    def _invalidate_projected_xy_cache(self):
+        # only the projection of the x uncertainties depends on the model derivatives: keep the
+        # projected covariance matrix object, so the factorization of the y covariance matrix can be reused
+        self.__cache_projected_xy_total_error = None
+        self.__cache_projected_xy_total_cov_mat = None
+        self.__cache_projected_xy_total_cov_mat_inverse = None
+        self.__cache_y_error_band = None
+        self.__projected_xy_update_pending = True
+
+    def _get_x_nuisance_profile_weights(self, x_data, poi_values):
+        """
+        Inverse 'x' and 'y' uncorrelated covariance matrices (vectors if diagonal), 'y' nuisance design matrix and
+        total 'x' errors as used for profiling the 'x' nuisance parameters. Model uncertainties are evaluated
+        at **x_data**, so that none of these depend on the profiled 'x' shifts.
+        """
+        if self.__cache_x_nuisance_profile_weights is None:
+            def _as_weights(cov_mat_inverse):
+                _mat = np.asarray(cov_mat_inverse)
+                _diag = np.diagonal(_mat).copy()
+                if np.count_nonzero(_mat - np.diag(_diag)) == 0:
+                    return _diag
+                return _mat
+            # do not use the public properties here: these update the parametric model from 'x_model'
+            self._param_model.parameters = poi_values
+            self._param_model.x = x_data
+            self._param_model.y  # recalculate the model values, which are the reference for relative model errors
+            _x_cov_mat = (self._data_container._calculate_uncor_error_cov_mat_object(axis=0)
+                          + self._param_model._calculate_uncor_error_cov_mat_object(axis=0))
+            _x_weights = _x_cov_mat.I
+            _y_weights = None
+            _y_design_mat = None
+            if self._cost_function.get_flag("need_y_nuisance"):
+                _y_cov_mat_inverse = (self._data_container._calculate_uncor_error_cov_mat_object(axis=1)
+                                      + self._param_model._calculate_uncor_error_cov_mat_object(axis=1)).I
+                if _y_cov_mat_inverse is not None:
+                    _y_weights = _as_weights(_y_cov_mat_inverse)
+                    if self._y_nuisance_names:
+                        _y_design_mat = np.asarray(self._y_data_nuisance_cor_design_mat)
+                    elif self._y_profiled_nuisance_names:
+                        # profiling the 'y' nuisance parameters out of the cost function results in the weights
+                        # W - (B W)^T (I + B W B^T)^-1 (B W)
+                        _factor, _design_weights = self._factorize_y_nuisance_profile(
+                            self._y_data_nuisance_cor_design_mat, _y_cov_mat_inverse)
+                        _y_weights = (np.asarray(_y_cov_mat_inverse)
+                                      - _design_weights.T.dot(linalg.cho_solve(_factor, _design_weights)))
+            self.__cache_x_nuisance_profile_weights = (
+                None if _x_weights is None else _as_weights(_x_weights),
+                np.ones(self._data_container.size) if _y_weights is None else _y_weights,
+                _y_design_mat,
+                np.sqrt(np.diagonal(np.asarray(_x_cov_mat.mat)))
+            )
+        return self.__cache_x_nuisance_profile_weights
+
+    @staticmethod
+    def _factorize_y_nuisance_profile(design_mat, uncor_cov_mat_inverse):
+        """Cholesky factorization of ``I + B W B^T`` and the matrix ``B W``, where ``B`` is the 'y' nuisance design
+        matrix and ``W`` is the inverse of the uncorrelated part of the total 'y' covariance matrix"""
+        _design_mat = np.asarray(design_mat)
+        _design_weights = _design_mat.dot(np.asarray(uncor_cov_mat_inverse))
+        _left_side = np.eye(_design_mat.shape[0]) + _design_weights.dot(_design_mat.T)
+        return linalg.cho_factor(_left_side), _design_weights
+
+    def _get_y_nuisance_profile_factorization(self):
+        """cached result of :py:meth:`_factorize_y_nuisance_profile` for the current 'y' uncertainties"""
+        if self.__cache_y_nuisance_profile_factorization is None:
+            _uncor_cov_mat_inverse = self.y_total_uncor_cov_mat_inverse
+            if _uncor_cov_mat_inverse is None:
+                self.__cache_y_nuisance_profile_factorization = (None, None)
+            else:
+                self.__cache_y_nuisance_profile_factorization = self._factorize_y_nuisance_profile(
+                    self._y_total_nuisance_cor_design_mat, _uncor_cov_mat_inverse)
+        return self.__cache_y_nuisance_profile_factorization
+
+    def _profile_y_cor_nuisance(self):
+        """
+        Calculate the nuisance parameters for the correlated 'y' uncertainties which minimize the cost function
+        for the current values of the model parameters, by solving ``(I + B W B^T) n = B W (y_data - y_model)``.
+
+        :return: the 'y' nuisance vector
+        :rtype: :py:class:`numpy.ndarray`
+        """
+        if not self._y_profiled_nuisance_names:
+            return np.zeros(0)
+        _factor, _design_weights = self._get_y_nuisance_profile_factorization()
+        if _factor is None:
+            # singular uncorrelated 'y' covariance matrix: the cost function does not use the nuisance parameters
+            return np.zeros(len(self._y_profiled_nuisance_names))
+        return linalg.cho_solve(_factor, _design_weights.dot(self.y_data - self.y_model))
+
+    def _profile_x_uncor_nuisance(self):
+        """
+        Determine the shifts of the *x* support points which minimize the cost function for the current values
+        of the model parameters and 'y' nuisance parameters. The minimum is found by a vectorized
+        Gauss-Newton iteration, starting from the previous solution.
+
+        :return: the *x* shifts
+        :rtype: :py:class:`numpy.ndarray`
+        """
+        _size = self._data_container.size
+        _n_poi = len(self._poi_names)
+        # get all parameter values from the nexus at once
+        _parameter_values = self._nexus.get_values_by_name(self._poi_names + self._y_nuisance_names)
+        _poi_values = _parameter_values[:_n_poi]
+        _y_nuisance_values = np.array(_parameter_values[_n_poi:])
+        _x_data = self.x_data
+        _y_data = self.y_data
+        _key = tuple(_parameter_values)
+        if self.__cache_x_nuisance_profile is not None:
+            _cached_key, _cached_data, _cached_shifts = self.__cache_x_nuisance_profile
+            if (_cached_key == _key and np.array_equal(_cached_data[0], _x_data)
+                    and np.array_equal(_cached_data[1], _y_data)):
+                return _cached_shifts
+
+        _x_weights, _y_weights, _y_design_mat, _x_total_error = self._get_x_nuisance_profile_weights(
+            _x_data, _poi_values)
+
+        if _x_weights is None:
+            # singular 'x' covariance matrix: the cost function falls back to ignoring the 'x' errors
+            _shifts = np.zeros(_size)
+            self.__cache_x_nuisance_profile = (_key, (_x_data.copy(), _y_data.copy()), _shifts)
+            return _shifts
+
+        _diagonal = _x_weights.ndim == 1 and _y_weights.ndim == 1
+        if not _diagonal:
+            _x_weights = np.diag(_x_weights) if _x_weights.ndim == 1 else _x_weights
+            _y_weights = np.diag(_y_weights) if _y_weights.ndim == 1 else _y_weights
+        _y_target = _y_data
+        if _y_design_mat is not None:
+            _y_target = _y_target - _y_nuisance_values.dot(_y_design_mat)
+
+        def _profile_objective(shifts):
+            _res = _y_target - self._param_model.eval_model_function(x=_x_data + shifts, model_parameters=_poi_values)
+            if _diagonal:
+                return _res, _y_weights * _res ** 2 + _x_weights * shifts ** 2
+            return _res, _res.dot(_y_weights.dot(_res)) + shifts.dot(_x_weights.dot(shifts))
+
+        _shifts = np.zeros(_size) if self.__cache_x_nuisance_profile is None else self.__cache_x_nuisance_profile[-1]
+        _tolerance = float(kc('fit', 'x_nuisance_profile', 'tolerance')) * _x_total_error
+        _dx = 0.01 * np.min(_x_total_error)
+        _res, _objective = _profile_objective(_shifts)
+        for _ in six.moves.range(kc('fit', 'x_nuisance_profile', 'max_iterations')):
+            _derivatives = self._param_model.eval_model_function_derivative_by_x(
+                x=_x_data + _shifts, model_parameters=_poi_values, dx=_dx)
+            # Gauss-Newton step for the linearized model
+            if _diagonal:
+                _step = ((_derivatives * _y_weights * _res - _x_weights * _shifts)
+                         / (_derivatives ** 2 * _y_weights + _x_weights))
+            else:
+                _hessian = _derivatives[:, np.newaxis] * _y_weights * _derivatives[np.newaxis, :] + _x_weights
+                _step = np.linalg.solve(_hessian, _derivatives * _y_weights.dot(_res) - _x_weights.dot(_shifts))
+            # halve the step (pointwise, if possible) where it does not decrease the cost function
+            for _ in six.moves.range(10):
+                _new_res, _new_objective = _profile_objective(_shifts + _step)
+                _no_decrease = _new_objective > _objective
+                if not np.any(_no_decrease):
+                    break
+                if _diagonal:
+                    _step = np.where(_no_decrease, 0.5 * _step, _step)
+                else:
+                    _step = 0.5 * _step
+            else:
+                # no decrease possible (within numerical precision): keep the current values
+                _step = np.where(_no_decrease, 0.0, _step) if _diagonal else np.zeros(_size)
+                _new_res, _new_objective = _profile_objective(_shifts + _step)
+            _shifts = _shifts + _step
+            _res, _objective = _new_res, _new_objective
+            if np.all(np.abs(_step) <= _tolerance):
+                break
+
+        self.__cache_x_nuisance_profile = (_key, (_x_data.copy(), _y_data.copy()), _shifts)
+        return _shifts
 
     def _mark_errors_for_update(self):
-        # TODO: implement a mass 'mark_for_update' routine in Nexus
-        self._nexus.get_by_name('x_data_error').mark_for_update()
-        self._nexus.get_by_name('x_data_cov_mat').mark_for_update()
-        self._nexus.get_by_name('x_data_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('x_model_error').mark_for_update()
-        self._nexus.get_by_name('x_model_cov_mat').mark_for_update()
-        self._nexus.get_by_name('x_model_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('x_total_error').mark_for_update()
-        self._nexus.get_by_name('x_total_cov_mat').mark_for_update()
-        self._nexus.get_by_name('x_total_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('y_data_error').mark_for_update()
-        self._nexus.get_by_name('y_data_cov_mat').mark_for_update()
-        self._nexus.get_by_name('y_data_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('y_model_error').mark_for_update()
-        self._nexus.get_by_name('y_model_cov_mat').mark_for_update()
-        self._nexus.get_by_name('y_model_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('y_total_error').mark_for_update()
-        self._nexus.get_by_name('y_total_cov_mat').mark_for_update()
-        self._nexus.get_by_name('y_total_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('projected_xy_total_error').mark_for_update()
-        self._nexus.get_by_name('projected_xy_total_cov_mat').mark_for_update()
-        self._nexus.get_by_name('projected_xy_total_cov_mat_inverse').mark_for_update()
-
-        self._nexus.get_by_name('y_data_uncor_cov_mat').mark_for_update()
-        self._nexus.get_by_name('y_model_uncor_cov_mat').mark_for_update()
-        self._nexus.get_by_name('y_total_uncor_cov_mat').mark_for_update()
-        self._nexus.get_by_name('y_data_uncor_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('y_model_uncor_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('y_total_uncor_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('_y_data_nuisance_cor_design_mat').mark_for_update()
-        self._nexus.get_by_name('_y_model_nuisance_cor_design_mat').mark_for_update()
-        self._nexus.get_by_name('_y_total_nuisance_cor_design_mat').mark_for_update()
-        self._nexus.get_by_name('x_data_uncor_cov_mat').mark_for_update()
-        self._nexus.get_by_name('x_model_uncor_cov_mat').mark_for_update()
-        self._nexus.get_by_name('x_total_uncor_cov_mat').mark_for_update()
-        self._nexus.get_by_name('x_data_uncor_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('x_model_uncor_cov_mat_inverse').mark_for_update()
-        self._nexus.get_by_name('x_total_uncor_cov_mat_inverse').mark_for_update()
-        # self._nexus.get_by_name('_x_data_nuisance_cor_design_mat').mark_for_update()
-        # self._nexus.get_by_name('_x_model_nuisance_cor_design_mat').mark_for_update()
-        # self._nexus.get_by_name('_x_total_nuisance_cor_design_mat').mark_for_update()
-        # #self._nexus.get_by_name('x_cor_nuisance_vector').mark_for_update() TODO: uncorrelated x-errors
-        self._nexus.get_by_name('y_nuisance_vector').mark_for_update()
-        self._nexus.get_by_name('x_uncor_nuisance_vector').mark_for_update()
-        self._nexus.get_by_name('x_model').mark_for_update()
-        self._nexus.get_by_name('y_model').mark_for_update()
+        self._nexus.mark_group_for_update('errors')
 
     def _mark_errors_for_update_invalidate_total_error_cache(self):
         self._mark_errors_for_update()
         self._invalidate_total_error_cache()
 
+    def _update_parametric_model(self):
+        # the parametric model only recalculates if the parameter or x values have actually changed
+        self._param_model.parameters = self.poi_values
+        self._param_model.x = self.x_model
+
     def _calculate_y_error_band(self):
         _xmin, _xmax = self._data_container.x_range
         _band_x = np.linspace(_xmin, _xmax, 100)  # TODO: config
         _f_deriv_by_params = self._param_model.eval_model_function_derivative_by_parameters(x=_band_x, model_parameters=self.poi_values)
         # here: df/dp[par_idx]|x=x[x_idx] = _f_deriv_by_params[par_idx][x_idx]
 
-        _f_deriv_by_params = _f_deriv_by_params.T
-        # here: df/dp[par_idx]|x=x[x_idx] = _f_deriv_by_params[x_idx][par_idx]
-
-        _band_y = np.zeros_like(_band_x)
         _n_poi = len(self.poi_values)
-        for _x_idx, _x_val in enumerate(_band_x):
-            _p_res = _f_deriv_by_params[_x_idx]
-            _band_y[_x_idx] = _p_res.dot(self.parameter_cov_mat[:_n_poi, :_n_poi]).dot(_p_res)[0, 0]
+        _poi_cov_mat = np.asarray(self.parameter_cov_mat[:_n_poi, :_n_poi])
+        # quadratic form of the derivative vector at each x value, for all x values at once
+        _band_y = np.einsum('ij,ik,kj->j', _f_deriv_by_params, _poi_cov_mat, _f_deriv_by_params)
 
         self.__cache_y_error_band = np.sqrt(_band_y)
 
@@ -365,6 +554,8 @@ class XYFit(FitBase):
     def x_model(self):
         # if cost function uses x-nuisance parameters, consider these
         if self._cost_function.get_flag("need_x_nuisance") and self._data_container.has_uncor_x_errors:
+            if self._cost_function.get_flag("profile_x_nuisance"):
+                return self.x_data + self._profile_x_uncor_nuisance()
             return self.x_data + (self.x_uncor_nuisance_values * self.x_data_error)
         else:
             return self.x_data
@@ -480,92 +671,85 @@ class XYFit(FitBase):
     @property
     def y_model(self):
         """array of *y* model predictions for the data points"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.y
 
+    @property
+    def y_model_gradient(self):
+        """derivatives of the *y* model predictions with respect to the parameters (one row per parameter)"""
+        self._update_parametric_model()
+        return self._param_model.eval_model_function_derivative_by_parameters()
+
     @property
     def x_model_error(self):
         """array of pointwise model *x* uncertainties"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.x_err
 
     @property
     def y_model_error(self):
         """array of pointwise model *y* uncertainties"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.y_err
 
     @property
     def x_model_cov_mat(self):
         """the model *x* covariance matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.x_cov_mat
 
     @property
     def y_model_cov_mat(self):
         """the model *y* covariance matrix"""
-        self._param_model.parameters = self.poi_values # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.y_cov_mat
 
     @property
     def x_model_cov_mat_inverse(self):
         """inverse of the model *x* covariance matrix (or ``None`` if singular)"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.x_cov_mat_inverse
 
     @property
     def y_model_cov_mat_inverse(self):
         """inverse of the model *y* covariance matrix (or ``None`` if singular)"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.y_cov_mat_inverse
 
     @property
     def y_model_uncor_cov_mat(self):
         """uncorrelated part the model *y* covariance matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.y_uncor_cov_mat
 
     @property
     def y_model_uncor_cov_mat_inverse(self):
         """inverse of the uncorrelated part the model *y* covariance matrix (or ``None`` if singular)"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.y_uncor_cov_mat_inverse
 
     @property
     def x_model_uncor_cov_mat(self):
         """the model *x* uncorrelated covariance matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.x_uncor_cov_mat
 
     @property
     def x_model_uncor_cov_mat_inverse(self):
         """inverse of the model *x*  uncorrelated covariance matrix (or ``None`` if singular)"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.x_uncor_cov_mat_inverse
 
     @property
     def _y_model_nuisance_cor_design_mat(self):
         """matrix containing the correlated parts of all model uncertainties for all data points"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model._y_nuisance_cor_design_mat
 
     @property
     def x_model_cor_mat(self):
         """the model *x* correlation matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.y_cor_mat
 
     # @property TODO: correlated x-errors
@@ -578,15 +762,13 @@ class XYFit(FitBase):
     @property
     def y_model_cor_mat(self):
         """the model *y* correlation matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.y_cor_mat
 
     @property
     def x_total_error(self):
         """array of pointwise total *x* uncertainties"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_x_total_error is None:
             _tmp = self.x_data_error**2
             _tmp += self.x_model_error**2
@@ -596,8 +778,7 @@ class XYFit(FitBase):
     @property
     def y_total_error(self):
         """array of pointwise total *y* uncertainties"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_y_total_error is None:
             _tmp = self.y_data_error**2
             _tmp += self.y_model_error**2
@@ -607,8 +788,7 @@ class XYFit(FitBase):
     @property
     def projected_xy_total_error(self):
         """array of pointwise total *y* with the x uncertainties projected on top of them"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if np.count_nonzero(self._data_container.x_err) == 0:
             return self.y_total_error
         if self.__cache_projected_xy_total_error is None:
@@ -621,111 +801,119 @@ class XYFit(FitBase):
     @property
     def x_total_cov_mat(self):
         """the total *x* covariance matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_x_total_cov_mat is None:
-            _tmp = self.x_data_cov_mat
-            _tmp += self.x_model_cov_mat
-            self.__cache_x_total_cov_mat = _tmp
+            self.__cache_x_total_cov_mat = self.x_total_cov_mat_object.mat
         return self.__cache_x_total_cov_mat
 
     @property
     def y_total_cov_mat(self):
         """the total *y* covariance matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_y_total_cov_mat is None:
-            _tmp = self.y_data_cov_mat
-            _tmp += self.y_model_cov_mat
-            self.__cache_y_total_cov_mat = _tmp
+            self.__cache_y_total_cov_mat = self.y_total_cov_mat_object.mat
         return self.__cache_y_total_cov_mat
 
     @property
     def projected_xy_total_cov_mat(self):
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if np.count_nonzero(self._data_container.x_err) == 0:
             return self.y_total_cov_mat
         if self.__cache_projected_xy_total_cov_mat is None:
-            _x_errors = self.x_total_error
-            _precision = 0.01 * np.min(_x_errors)
-            _derivatives = self._param_model.eval_model_function_derivative_by_x(dx=_precision)
-            _outer_product = np.outer(_derivatives, _derivatives)
-            _projected_x_cov_mat = np.asarray(self.x_total_cov_mat) * _outer_product
-            self.__cache_projected_xy_total_cov_mat = self.y_total_cov_mat + np.asmatrix(_projected_x_cov_mat)
+            self.__cache_projected_xy_total_cov_mat = self.projected_xy_total_cov_mat_object.mat
         return self.__cache_projected_xy_total_cov_mat
 
     @property
     def x_total_cov_mat_inverse(self):
         """inverse of the total *x* covariance matrix (or ``None`` if singular)"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_x_total_cov_mat_inverse is None:
-            _tmp = self.x_total_cov_mat
-            try:
-                _tmp = _tmp.I
-                self.__cache_x_total_cov_mat_inverse = _tmp
-            except np.linalg.LinAlgError:
-                pass
+            self.__cache_x_total_cov_mat_inverse = self.x_total_cov_mat_object.I
         return self.__cache_x_total_cov_mat_inverse
 
     @property
     def y_total_cov_mat_inverse(self):
         """inverse of the total *y* covariance matrix (or ``None`` if singular)"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_y_total_cov_mat_inverse is None:
-            _tmp = self.y_total_cov_mat
-            try:
-                _tmp = _tmp.I
-                self.__cache_y_total_cov_mat_inverse = _tmp
-            except np.linalg.LinAlgError:
-                pass
+            self.__cache_y_total_cov_mat_inverse = self.y_total_cov_mat_object.I
         return self.__cache_y_total_cov_mat_inverse
 
     @property
     def projected_xy_total_cov_mat_inverse(self):
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_projected_xy_total_cov_mat_inverse is None:
-            _tmp = self.projected_xy_total_cov_mat
-            try:
-                _tmp = _tmp.I
-                self.__cache_projected_xy_total_cov_mat_inverse = _tmp
-            except np.linalg.LinAlgError:
-                pass
+            self.__cache_projected_xy_total_cov_mat_inverse = self.projected_xy_total_cov_mat_object.I
         return self.__cache_projected_xy_total_cov_mat_inverse
 
+    @property
+    def x_total_cov_mat_object(self):
+        """the total *x* covariance matrix as a :py:class:`~kafe.core.error.CovMat` object (caches its factorization)"""
+        self._update_parametric_model()
+        if self.__cache_x_total_cov_mat_object is None:
+            # sum the covariance matrix objects, preserving the diagonal + low-rank structure where possible
+            self.__cache_x_total_cov_mat_object = (self._data_container.get_total_error(axis=0).get_cov_mat_object()
+                                                   + self._param_model.get_total_error(axis=0).get_cov_mat_object())
+        return self.__cache_x_total_cov_mat_object
+
+    @property
+    def y_total_cov_mat_object(self):
+        """the total *y* covariance matrix as a :py:class:`~kafe.core.error.CovMat` object (caches its factorization)"""
+        self._update_parametric_model()
+        if self.__cache_y_total_cov_mat_object is None:
+            # sum the covariance matrix objects, preserving the diagonal + low-rank structure where possible
+            self.__cache_y_total_cov_mat_object = (self._data_container.get_total_error(axis=1).get_cov_mat_object()
+                                                   + self._param_model.get_total_error(axis=1).get_cov_mat_object())
+        return self.__cache_y_total_cov_mat_object
+
+    @property
+    def projected_xy_total_cov_mat_object(self):
+        """the total *y* covariance matrix with the *x* uncertainties projected on top of it as a :py:class:`~kafe.core.error.CovMat` object (caches its factorization)"""
+        self._update_parametric_model()
+        if np.count_nonzero(self._data_container.x_err) == 0:
+            return self.y_total_cov_mat_object
+        if self.__cache_projected_xy_total_cov_mat_object is None or self.__projected_xy_update_pending:
+            _x_errors = self.x_total_error
+            _precision = 0.01 * np.min(_x_errors)
+            _derivatives = self._param_model.eval_model_function_derivative_by_x(dx=_precision)
+            if self.__cache_projected_xy_total_cov_mat_object is None:
+                self.__cache_projected_xy_total_cov_mat_object = ProjectedCovMat(
+                    self.y_total_cov_mat_object, self.x_total_cov_mat_object, _derivatives)
+            else:
+                self.__cache_projected_xy_total_cov_mat_object.update(_derivatives)
+            self.__projected_xy_update_pending = False
+        return self.__cache_projected_xy_total_cov_mat_object
+
     @property
     def y_total_uncor_cov_mat(self):
         """the total *y* uncorrelated covariance matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_y_total_uncor_cov_mat is None:
-            _tmp = self.y_data_uncor_cov_mat
-            _tmp += self.y_model_uncor_cov_mat
-            self.__cache_y_total_uncor_cov_mat = _tmp
+            self.__cache_y_total_uncor_cov_mat = self._y_total_uncor_cov_mat_object.mat
         return self.__cache_y_total_uncor_cov_mat
 
     @property
     def y_total_uncor_cov_mat_inverse(self):
         """inverse of the uncorrelated part of the total *y* covariance matrix (or ``None`` if singular)"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_y_total_uncor_cov_mat_inverse is None:
-            _tmp = self.y_total_uncor_cov_mat
-            try:
-                _tmp = _tmp.I
-                self.__cache_y_total_uncor_cov_mat_inverse = _tmp
-            except np.linalg.LinAlgError:
-                pass
+            self.__cache_y_total_uncor_cov_mat_inverse = self._y_total_uncor_cov_mat_object.I
         return self.__cache_y_total_uncor_cov_mat_inverse
 
+    @property
+    def _y_total_uncor_cov_mat_object(self):
+        """the total *y* uncorrelated covariance matrix as a :py:class:`~kafe.core.error.CovMat` object"""
+        self._update_parametric_model()
+        if self.__cache_y_total_uncor_cov_mat_object is None:
+            self.__cache_y_total_uncor_cov_mat_object = (
+                self._data_container._calculate_uncor_error_cov_mat_object(axis=1)
+                + self._param_model._calculate_uncor_error_cov_mat_object(axis=1))
+        return self.__cache_y_total_uncor_cov_mat_object
+
     @property
     def _y_total_nuisance_cor_design_mat(self):
         """matrix containing the correlated parts of all model uncertainties for all total points"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_y_total_nuisance_cor_design_mat is None:
             _tmp = self._y_data_nuisance_cor_design_mat
             # _tmp += self.nuisance_y_model_cor_cov_mat
@@ -735,28 +923,29 @@ class XYFit(FitBase):
     @property
     def x_total_uncor_cov_mat(self):
         """the total *x* uncorrelated covariance matrix"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_x_total_uncor_cov_mat is None:
-            _tmp = self.x_data_uncor_cov_mat
-            _tmp += self.x_model_uncor_cov_mat
-            self.__cache_x_total_uncor_cov_mat = _tmp
+            self.__cache_x_total_uncor_cov_mat = self._x_total_uncor_cov_mat_object.mat
         return self.__cache_x_total_uncor_cov_mat
 
     @property
     def x_total_uncor_cov_mat_inverse(self):
         """inverse of the total *x* uncorrelated covariance matrix (or ``None`` if singular)"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_x_total_uncor_cov_mat_inverse is None:
-            _tmp = self.x_total_uncor_cov_mat
-            try:
-                _tmp = _tmp.I
-                self.__cache_x_total_uncor_cov_mat_inverse = _tmp
-            except np.linalg.LinAlgError:
-                pass
+            self.__cache_x_total_uncor_cov_mat_inverse = self._x_total_uncor_cov_mat_object.I
         return self.__cache_x_total_uncor_cov_mat_inverse
 
+    @property
+    def _x_total_uncor_cov_mat_object(self):
+        """the total *x* uncorrelated covariance matrix as a :py:class:`~kafe.core.error.CovMat` object"""
+        self._update_parametric_model()
+        if self.__cache_x_total_uncor_cov_mat_object is None:
+            self.__cache_x_total_uncor_cov_mat_object = (
+                self._data_container._calculate_uncor_error_cov_mat_object(axis=0)
+                + self._param_model._calculate_uncor_error_cov_mat_object(axis=0))
+        return self.__cache_x_total_uncor_cov_mat_object
+
     # @property TODO: correlated x-errors
     # def nuisance_x_total_cor_cov_mat(self):
     #     """total *x* correlated covariance matrix (nuisance) (or ``None`` if singular)"""
@@ -771,8 +960,7 @@ class XYFit(FitBase):
     @property
     def y_error_band(self):
         """one-dimensional array representing the uncertainty band around the model function"""
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         if self.__cache_y_error_band is None:
             self._calculate_y_error_band()
         return self.__cache_y_error_band
@@ -790,14 +978,31 @@ class XYFit(FitBase):
     @property
     def poi_values(self):
         # gives the values of the model_function_parameters
-        _poi_values = []
-        for _name in self._poi_names:
-            _poi_values.append(self.parameter_name_value_dict[_name])
-        return _poi_values
+        _parameter_name_value_dict = self.parameter_name_value_dict
+        return [_parameter_name_value_dict[_name] for _name in self._poi_names]
+
+    @property
+    def _x_uncor_nuisance_profiled(self):
+        # ``True`` if the uncorrelated 'x' nuisance parameters are profiled out instead of being fit parameters
+        return bool(self._cost_function.get_flag("need_x_nuisance") and self._cost_function.get_flag("profile_x_nuisance")
+                    and self._data_container.has_uncor_x_errors)
+
+    @property
+    def y_nuisance_values(self):
+        """gives the nuisance vector for the correlated *y* uncertainties"""
+        if self._y_profiled_nuisance_names:
+            return self._profile_y_cor_nuisance()
+        _parameter_name_value_dict = self.parameter_name_value_dict
+        return np.asarray([_parameter_name_value_dict[_name] for _name in self._y_nuisance_names])
 
     @property
     def x_uncor_nuisance_values(self):
         """gives the x uncorrelated nuisance vector"""
+        if self._x_uncor_nuisance_profiled:
+            # points without 'x' uncertainty are not shifted
+            _x_data_error = self.x_data_error
+            return np.divide(self._profile_x_uncor_nuisance(), _x_data_error,
+                             out=np.zeros(self._data_container.size), where=_x_data_error > 0)
         _values = []
         for _name in self._x_uncor_nuisance_names:
             _values.append(self.parameter_name_value_dict[_name])
@@ -847,8 +1052,8 @@ class XYFit(FitBase):
 
         :param axis: ``'x'``/``0`` or ``'y'``/``1``
         :type axis: str or int
-        :param err_matrix: covariance or correlation matrix
-        :param matrix_type: one of ``'covariance'``/``'cov'`` or ``'correlation'``/``'cor'``
+        :param err_matrix: covariance or correlation matrix (dense or :py:mod:`scipy.sparse`)
+        :param matrix_type: one of ``'covariance'``/``'cov'``, ``'correlation'``/``'cor'`` or ``'banded'`` (lower bands of a covariance matrix)
         :type matrix_type: str
         :param err_val: the pointwise uncertainties (mandatory if only a correlation matrix is given)
         :type err_val: iterable of float
@@ -884,17 +1089,20 @@ class XYFit(FitBase):
         _par_val_dict = {_pn: _pv for _pn, _pv in zip(_param_names, param_values)}
         self.set_parameter_values(**_par_val_dict)
 
-    def do_fit(self):
-        """Perform the fit."""
+    def _do_fit(self):
         if not self._data_container.has_x_errors:
-            super(XYFit, self).do_fit()
+            super(XYFit, self)._do_fit()
         else:
             self._fitter.do_fit()
             _convergence_limit = float(kc('fit', 'x_error_fit_convergence_limit'))
             _previous_cost_function_value = self.cost_function_value
             for i in range(kc('fit', 'max_x_error_fit_iterations')):
                 self._mark_errors_for_update()
-                self._invalidate_total_error_cache()
+                if self.has_model_errors:
+                    self._invalidate_total_error_cache()
+                else:
+                    # the data errors are constant, only the projection of the x errors has to be updated
+                    self._invalidate_projected_xy_cache()
                 self._fitter.do_fit()
                 if np.abs(self.cost_function_value - _previous_cost_function_value) < _convergence_limit:
                     break
@@ -915,8 +1123,7 @@ class XYFit(FitBase):
         :return: model function values
         :rtype: :py:class:`numpy.ndarray`
         """
-        self._param_model.parameters = self.poi_values  # this is lazy, so just do it
-        self._param_model.x = self.x_model
+        self._update_parametric_model()
         return self._param_model.eval_model_function(x=x, model_parameters=model_parameters)
 
     def calculate_nuisance_parameters(self):
@@ -953,6 +1160,19 @@ class XYFit(FitBase):
 
         return _nuisance_vector
 
+    def get_result_dict(self):
+        """Return a structured dictionary of human-readable strings characterizing the fit result."""
+        # nuisance parameters which are not fit parameters are reported separately
+        # (calculate these first, since the base class retrieves the parameter covariance matrix)
+        _profiled_nuisance_values = OrderedDict(zip(self._y_profiled_nuisance_names, self.y_nuisance_values))
+        if self._x_uncor_nuisance_profiled:
+            for _i, _value in enumerate(self.x_uncor_nuisance_values):
+                _profiled_nuisance_values["_n_xu_{}".format(_i)] = _value
+        _result_dict = super(XYFit, self).get_result_dict()
+        if _profiled_nuisance_values:
+            _result_dict['profiled nuisance parameter values'] = _profiled_nuisance_values
+        return _result_dict
+
     def report(self, output_stream=sys.stdout,
                show_data=True,
                show_model=True):
@@ -1,8 +1,8 @@
 import inspect
 import numpy as np
 
-from scipy.misc import derivative
-
+from ...config import kc
+from ...core.derivative import derivative_by_parameters, derivative_by_x
 from .._base import ParametricModelBaseMixin, ModelFunctionBase, ModelFunctionException, ModelParameterFormatter
 from .container import XYContainer, XYContainerException
 from .format import XYModelFunctionFormatter
@@ -18,14 +18,21 @@ class XYModelFunction(ModelFunctionBase):
     EXCEPTION_TYPE = XYModelFunctionException
     FORMATTER_TYPE = XYModelFunctionFormatter
 
-    def __init__(self, model_function):
+    def __init__(self, model_function, model_function_gradient=None, model_function_derivative_by_x=None):
         """
         Construct :py:class:`XYModelFunction` object (a wrapper for a native Python function):
 
         :param model_function: function handle
+        :param model_function_gradient: function handle for the gradient of the model function with respect
+                                        to its parameters (same arguments as the model function)
+        :param model_function_derivative_by_x: function handle for the derivative of the model function with
+                                               respect to *x* (same arguments as the model function)
         """
         self._x_name = 'x'
-        super(XYModelFunction, self).__init__(model_function=model_function)
+        self._derivative_by_x = model_function_derivative_by_x
+        super(XYModelFunction, self).__init__(model_function=model_function,
+                                              model_function_gradient=model_function_gradient)
+        self._validate_auxiliary_function_raise(self.derivative_by_x, "derivative by x")
 
     def _validate_model_function_raise(self):
         # require 'xy' model function agruments to include 'x'
@@ -58,21 +65,32 @@ class XYModelFunction(ModelFunctionBase):
         """the name of the independent variable"""
         return self._x_name
 
+    @property
+    def derivative_by_x(self):
+        """the handle of the model function derivative with respect to *x* (or ``None``)"""
+        return self._derivative_by_x
+
 
 class XYParametricModelException(XYContainerException):
     pass
 
 
 class XYParametricModel(ParametricModelBaseMixin, XYContainer):
-    def __init__(self, x_data, model_func, model_parameters):
+    def __init__(self, x_data, model_func, model_parameters, model_func_gradient=None, model_func_derivative_by_x=None):
         """
         Construct an :py:obj:`XYParametricModel` object:
 
         :param x_data: array containing the *x* values supporting the model
         :param model_func: handle of Python function (the model function)
         :param model_parameters: iterable of parameter values with which the model function should be initialized
+        :param model_func_gradient: handle of Python function returning the model function gradient
+                                    with respect to the parameters (optional)
+        :param model_func_derivative_by_x: handle of Python function returning the model function derivative
+                                           with respect to *x* (optional)
         """
         # print "XYParametricModel.__init__(x_data=%r, model_func=%r, model_parameters=%r)" % (x_data, model_func, model_parameters)
+        self._model_function_gradient_handle = model_func_gradient
+        self._model_function_derivative_by_x_handle = model_func_derivative_by_x
         _y_data = model_func(x_data, *model_parameters)
         super(XYParametricModel, self).__init__(model_func, model_parameters, x_data, _y_data)
 
@@ -104,11 +122,18 @@ class XYParametricModel(ParametricModelBaseMixin, XYContainer):
 
     @x.setter
     def x(self, new_x):
-        # resetting 'x' -> must reset entire data array
-        self._xy_data = np.zeros((2, len(new_x)))
-        self._xy_data[0] = new_x
+        _new_x = np.asarray(new_x, dtype=float)
+        if _new_x.shape == self._xy_data[0].shape:
+            if np.array_equal(_new_x, self._xy_data[0]):
+                return  # values unchanged -> keep the current model values
+            # same number of points -> reuse the data array
+            XYContainer.x.fset(self, _new_x)
+        else:
+            # number of points changed -> must reset entire data array
+            self._xy_data = np.zeros((2, len(_new_x)))
+            self._xy_data[0] = _new_x
+            self._clear_total_error_cache()
         self._pm_calculation_stale = True
-        self._clear_total_error_cache()
 
     @property
     def y(self):
@@ -138,7 +163,8 @@ class XYParametricModel(ParametricModelBaseMixin, XYContainer):
         _pars = model_parameters if model_parameters is not None else self._model_parameters
         return self._model_function_handle(_x, *_pars)
 
-    def eval_model_function_derivative_by_parameters(self, x=None, model_parameters=None, par_dx=None):
+    def eval_model_function_derivative_by_parameters(self, x=None, model_parameters=None, par_dx=None,
+                                                     order=None, complex_step=None):
         """
         Evaluate the derivative of the model function with respect to the model parameters.
 
@@ -146,28 +172,28 @@ class XYParametricModel(ParametricModelBaseMixin, XYContainer):
         :type x: list or ``None``
         :param model_parameters: values of the model parameters (if ``None``, the current values are used)
         :type model_parameters: list or ``None``
-        :param par_dx: step size for numeric differentiation
-        :type par_dx: float
+        :param par_dx: step size for numeric differentiation (ignored if an analytic gradient is available)
+        :type par_dx: float or list of float
+        :param order: number of points of the finite difference stencil (if ``None``, use the configured value)
+        :type order: int
+        :param complex_step: use complex-step differentiation (if ``None``, use the configured value)
+        :type complex_step: bool
         :return: value(s) of the model function derivative for the given parameters
         :rtype: :py:obj:`numpy.ndarray`
         """
         _x = x if x is not None else self.x
         _pars = model_parameters if model_parameters is not None else self._model_parameters
-        _pars = np.asarray(_pars)
-        _par_dxs = par_dx if par_dx is not None else 1e-2 * (np.abs(_pars) + 1.0/(1.0+np.abs(_pars)))
-
-        _ret = []
-        for _par_idx, (_par_val, _par_dx) in enumerate(zip(_pars, _par_dxs)):
-            def _chipped_func(par):
-                _chipped_pars = _pars.copy()
-                _chipped_pars[_par_idx] = par
-                return self._model_function_handle(_x, *_chipped_pars)
-
-            _der_val = derivative(_chipped_func, _par_val, dx=_par_dx)
-            _ret.append(_der_val)
-        return np.array(_ret)
-
-    def eval_model_function_derivative_by_x(self, x=None, model_parameters=None, dx=None):
+        if self.has_analytic_gradient:
+            return self._eval_model_function_gradient(np.shape(_x), _x, *_pars)
+        if order is None:
+            order = kc('core', 'derivatives', 'order')
+        if complex_step is None:
+            complex_step = kc('core', 'derivatives', 'complex_step')
+        return derivative_by_parameters(self._model_function_handle, _pars, args=(np.asarray(_x),),
+                                        dp=par_dx, order=order, complex_step=complex_step)
+
+    def eval_model_function_derivative_by_x(self, x=None, model_parameters=None, dx=None,
+                                            order=None, complex_step=None):
         """
         Evaluate the derivative of the model function with respect to the independent variable (*x*).
 
@@ -175,24 +201,24 @@ class XYParametricModel(ParametricModelBaseMixin, XYContainer):
         :type x: list or ``None``
         :param model_parameters: values of the model parameters (if ``None``, the current values are used)
         :type model_parameters: list or ``None``
-        :param dx: step size for numeric differentiation
-        :type dx: float
+        :param dx: step size for numeric differentiation (ignored if an analytic derivative is available)
+        :type dx: float or list of float
+        :param order: number of points of the finite difference stencil (if ``None``, use the configured value)
+        :type order: int
+        :param complex_step: use complex-step differentiation (if ``None``, use the configured value)
+        :type complex_step: bool
         :return: value(s) of the model function derivative
         :rtype: :py:obj:`numpy.ndarray`
         """
         _x = x if x is not None else self.x
         _pars = model_parameters if model_parameters is not None else self._model_parameters
-        _dxs = dx if dx is not None else 1e-2 * (np.abs(_x) + 1.0/(1.0+np.abs(_x)))
-        try:
-            iter(_dxs)
-        except TypeError:
-            _dxs = np.ones_like(_x)*_dxs
-
-        _ret = []
-        for _x_idx, (_x_val, _dx) in enumerate(zip(_x, _dxs)):
-            def _chipped_func(x):
-                return self._model_function_handle(x, *_pars)
-
-            _der_val = derivative(_chipped_func, _x_val, dx=_dx)
-            _ret.append(_der_val)
-        return np.array(_ret)
\ No newline at end of file
+        if self._model_function_derivative_by_x_handle is not None:
+            return np.array(np.broadcast_to(self._model_function_derivative_by_x_handle(_x, *_pars), np.shape(_x)),
+                            dtype=float)
+        if order is None:
+            order = kc('core', 'derivatives', 'order')
+        if complex_step is None:
+            complex_step = kc('core', 'derivatives', 'complex_step')
+        # the model function is vectorized: evaluate the stencil on the full x array at once
+        return derivative_by_x(self._model_function_handle, _x, args=tuple(_pars),
+                               dx=dx, order=order, complex_step=complex_step)
@@ -1,10 +1,15 @@
 from __future__ import print_function
 
 import contextlib
+import importlib
+import multiprocessing
 import numpy as np
 import six
 import sys
+import threading
 
+from copy import deepcopy
+from multiprocessing.pool import ThreadPool
 from string import ascii_letters
 
 
@@ -21,6 +26,112 @@ def numpy_print_options(*args, **kwargs):
         np.set_printoptions(**_saved_options)
 
 
+class LazyModule(object):
+    """
+    Stand-in for a module which is only imported when one of its attributes is first accessed.
+    Used for heavy optional dependencies (e.g. ``matplotlib``), so that importing *kafe* stays cheap.
+    """
+    def __init__(self, module_name, before_import=None):
+        """
+        :param module_name: full name of the module to import (e.g. ``'matplotlib.pyplot'``)
+        :type module_name: str
+        :param before_import: function to call (without arguments) right before the module is imported
+        """
+        self.__dict__['_lazy_module_name'] = module_name
+        self.__dict__['_lazy_before_import'] = before_import
+        self.__dict__['_lazy_module'] = None
+
+    def _lazy_load(self):
+        _module = self.__dict__['_lazy_module']
+        if _module is None:
+            if self.__dict__['_lazy_before_import'] is not None:
+                self.__dict__['_lazy_before_import']()
+            _module = self.__dict__['_lazy_module'] = importlib.import_module(self.__dict__['_lazy_module_name'])
+        return _module
+
+    @property
+    def is_loaded(self):
+        """``True`` if the module has already been imported"""
+        return self.__dict__['_lazy_module'] is not None
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._lazy_load(), name, value)
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    def __repr__(self):
+        if self.is_loaded:
+            return repr(self.__dict__['_lazy_module'])
+        return "<lazily imported module '%s'>" % (self.__dict__['_lazy_module_name'],)
+
+
+# -- worker pools
+
+# per-worker state: every pool worker (thread or process) holds its own copy of the worker object
+_worker_state = threading.local()
+
+
+def _get_fork_context():
+    """Return a multiprocessing context which forks worker processes, or ``None`` if forking is not supported."""
+    if not hasattr(multiprocessing, 'get_context'):
+        # Python 2 forks worker processes on all platforms except Windows
+        return None if sys.platform.startswith('win') else multiprocessing
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context('fork')
+
+
+def can_fork_worker_processes():
+    """``True`` if worker processes can be forked on this platform (required for the ``'process'`` backend)"""
+    return _get_fork_context() is not None
+
+
+def _init_pool_worker(worker_object, copy_worker_object):
+    # forked worker processes already own a copy; worker threads share the memory of the parent and need one
+    _worker_state.worker_object = deepcopy(worker_object) if copy_worker_object else worker_object
+
+
+def get_worker_object():
+    """Return the copy of the worker object held by the calling pool worker (see :py:func:`worker_pool`)."""
+    return _worker_state.worker_object
+
+
+@contextlib.contextmanager
+def worker_pool(worker_object, n_workers, backend):
+    """
+    Context providing a pool of workers, each of which holds its own copy of ``worker_object``.
+    Inside a worker, the copy is retrieved with :py:func:`get_worker_object`. The pool is terminated
+    when the context is left.
+
+    Worker processes are always forked, regardless of the default start method: the worker objects
+    (fits, cost functions) hold weak references and lambdas and cannot be pickled for spawned processes.
+
+    :param worker_object: the object to copy to each worker
+    :param n_workers: number of workers
+    :type n_workers: int
+    :param backend: ``'thread'`` (thread pool) or ``'process'`` (pool of forked processes)
+    :type backend: str
+    """
+    if backend == 'thread':
+        _pool = ThreadPool(processes=n_workers, initializer=_init_pool_worker, initargs=(worker_object, True))
+    elif backend == 'process':
+        _context = _get_fork_context()
+        if _context is None:
+            raise ValueError("Cannot use backend 'process': worker processes cannot be forked on this platform!")
+        _pool = _context.Pool(processes=n_workers, initializer=_init_pool_worker, initargs=(worker_object, False))
+    else:
+        raise ValueError("Unknown backend '{}': expected 'thread' or 'process'!".format(backend))
+    try:
+        yield _pool
+    finally:
+        _pool.terminate()
+        _pool.join()
+
+
 _ALPHANUMERIC = np.array(list(ascii_letters) + list("0123456789"))
 def random_alphanumeric(size):
     return "".join(np.random.choice(_ALPHANUMERIC, size=size))
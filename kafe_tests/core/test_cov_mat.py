@@ -1,8 +1,10 @@
 import unittest
 
 import numpy as np
+import scipy.sparse as sp
 
-from kafe.core.error import CovMat, cov_mat_from_float_list, cov_mat_from_float
+from kafe.core.error import (CovMat, LowRankCovMat, BandedCovMat, ProjectedCovMat, cov_mat_from_float_list,
+                             cov_mat_from_float)
 
 
 class TestCovMat(unittest.TestCase):
@@ -34,6 +36,178 @@ class TestCovMat(unittest.TestCase):
     def test_split_svd(self):
         self.assertTrue(np.allclose(self.cm.mat, np.sum(self.cm.split_svd(), axis=0)))
 
+    def test_solve(self):
+        _b = np.array(self.reference)
+        self.assertTrue(np.allclose(self.cm.solve(_b), np.asarray(self.cm.I).dot(_b)))
+
+    def test_whiten(self):
+        _r = np.array(self.reference)
+        _z = self.cm.whiten(_r)
+        self.assertAlmostEqual(_z.dot(_z), _r.dot(np.asarray(self.cm.I)).dot(_r))
+
+    def test_raise_whiten_singular(self):
+        _cm = cov_mat_from_float_list([0.1, 0.2, 0.3], correlation=1.0)
+        with self.assertRaises(np.linalg.LinAlgError):
+            _cm.whiten([1., 2., 3.])
+
+
+class TestLowRankCovMat(unittest.TestCase):
+
+    def setUp(self):
+        self.diag = np.array([0.01, 0.1849, 0.038025, 1.7956, 0.0009])
+        self.factors = np.array([
+            [0.1, 0.02],
+            [0.2, 0.01],
+            [0.05, 0.3],
+            [0.4, 0.2],
+            [0.01, 0.0]])
+        self.cm = LowRankCovMat(self.diag[:], self.factors[:, :1]) + LowRankCovMat(np.zeros(5), self.factors[:, 1:])
+        self.ref_mat = np.diag(self.diag) + self.factors.dot(self.factors.T)
+        self.reference = np.array([2., 1., 3., 2., 9.])
+
+    def test_lazy_sum_preserves_structure(self):
+        self.assertIsInstance(self.cm, LowRankCovMat)
+        self.assertEqual(self.cm.rank, 2)
+        self.assertTrue(np.allclose(self.cm.mat, self.ref_mat))
+        self.assertTrue(np.allclose(self.cm.diagonal, np.diag(self.ref_mat)))
+
+    def test_sum_with_dense(self):
+        _sum = self.cm + CovMat(self.ref_mat)
+        self.assertNotIsInstance(_sum, LowRankCovMat)
+        self.assertTrue(np.allclose(_sum.mat, 2 * self.ref_mat))
+
+    def test_inverse(self):
+        self.assertTrue(np.allclose(self.cm.I, np.linalg.inv(self.ref_mat)))
+
+    def test_solve(self):
+        self.assertTrue(np.allclose(self.cm.solve(self.reference), np.linalg.solve(self.ref_mat, self.reference)))
+
+    def test_whiten(self):
+        _z = self.cm.whiten(self.reference)
+        self.assertAlmostEqual(_z.dot(_z), self.reference.dot(np.linalg.solve(self.ref_mat, self.reference)))
+
+    def test_logdet(self):
+        self.assertAlmostEqual(self.cm.logdet, np.linalg.slogdet(self.ref_mat)[1])
+
+    def test_scaled(self):
+        _scaled = self.cm.scaled(self.reference)
+        self.assertIsInstance(_scaled, LowRankCovMat)
+        self.assertTrue(np.allclose(_scaled.mat, self.ref_mat * np.outer(self.reference, self.reference)))
+
+    def test_raise_whiten_singular(self):
+        _cm = LowRankCovMat(np.zeros(3), [0.1, 0.2, 0.3])
+        self.assertIsNone(_cm.I)
+        with self.assertRaises(np.linalg.LinAlgError):
+            _cm.whiten([1., 2., 3.])
+
+
+class TestBandedCovMat(unittest.TestCase):
+
+    def setUp(self):
+        _diag = np.array([2.0, 2.5, 3.0, 2.2, 2.8, 3.1])
+        self.ref_mat = np.diag(_diag) + 0.4 * (np.eye(6, k=1) + np.eye(6, k=-1)) + 0.1 * (np.eye(6, k=2) + np.eye(6, k=-2))
+        # shuffle rows and columns so that the bandwidth must be recovered by reordering
+        _perm = np.array([3, 0, 5, 1, 4, 2])
+        self.ref_mat = self.ref_mat[_perm][:, _perm]
+        self.cm = BandedCovMat(sp.csr_matrix(self.ref_mat))
+        self.reference = np.array([2., 1., 3., 2., 9., 4.])
+
+    def test_reorder_bandwidth(self):
+        self.assertEqual(self.cm.bandwidth, 2)
+        self.assertTrue(np.allclose(self.cm.mat, self.ref_mat))
+        self.assertTrue(np.allclose(self.cm.diagonal, np.diag(self.ref_mat)))
+
+    def test_from_bands(self):
+        _cm = BandedCovMat.from_bands([[1.0, 2.0, 3.0], [0.5, 0.2, 0.0]])
+        self.assertTrue(np.allclose(_cm.mat, [[1.0, 0.5, 0.0], [0.5, 2.0, 0.2], [0.0, 0.2, 3.0]]))
+
+    def test_raise_not_symmetric(self):
+        with self.assertRaises(ValueError):
+            BandedCovMat(sp.csr_matrix([[1.0, 0.5], [0.0, 1.0]]))
+
+    def test_sum_with_diagonal(self):
+        _sum = LowRankCovMat(np.ones(6)) + self.cm
+        self.assertIsInstance(_sum, BandedCovMat)
+        self.assertTrue(np.allclose(_sum.mat, self.ref_mat + np.eye(6)))
+
+    def test_solve(self):
+        self.assertTrue(np.allclose(self.cm.solve(self.reference), np.linalg.solve(self.ref_mat, self.reference)))
+
+    def test_whiten(self):
+        _z = self.cm.whiten(self.reference)
+        self.assertAlmostEqual(_z.dot(_z), self.reference.dot(np.linalg.solve(self.ref_mat, self.reference)))
+
+    def test_logdet(self):
+        self.assertAlmostEqual(self.cm.logdet, np.linalg.slogdet(self.ref_mat)[1])
+
+    def test_scaled(self):
+        _scaled = self.cm.scaled(self.reference)
+        self.assertTrue(np.allclose(_scaled.mat, self.ref_mat * np.outer(self.reference, self.reference)))
+
+
+
+class TestProjectedCovMat(unittest.TestCase):
+
+    def setUp(self):
+        _rs = np.random.RandomState(42)
+        _tmp = _rs.uniform(-1., 1., size=(6, 6))
+        self.y_mat = _tmp.dot(_tmp.T) + np.eye(6)
+        self.x_err = np.array([0.1, 0.3, 0.2, 0.2, 0.4, 0.1])
+        self.derivatives = np.array([1.0, -2.0, 0.5, 3.0, 1.5, -0.5])
+        self.new_derivatives = np.array([2.0, -1.0, 1.5, 0.3, 1.0, 2.5])
+        self.reference = np.array([2., 1., 3., 2., 9., 4.])
+
+    def _check_against_dense(self, projected, x_mat, derivatives):
+        _ref_mat = np.asarray(projected._base.mat) + x_mat * np.outer(derivatives, derivatives)
+        self.assertTrue(np.allclose(projected.mat, _ref_mat))
+        self.assertTrue(np.allclose(projected.I, np.linalg.inv(_ref_mat)))
+        self.assertTrue(np.allclose(projected.solve(self.reference), np.linalg.solve(_ref_mat, self.reference)))
+        _z = projected.whiten(self.reference)
+        self.assertAlmostEqual(_z.dot(_z), self.reference.dot(np.linalg.solve(_ref_mat, self.reference)))
+        self.assertAlmostEqual(projected.logdet, np.linalg.slogdet(_ref_mat)[1])
+
+    def test_woodbury_correlated_x_errors(self):
+        _x_cov_mat = LowRankCovMat(np.zeros(6), self.x_err)
+        _projected = ProjectedCovMat(CovMat(self.y_mat), _x_cov_mat, self.derivatives)
+        self.assertEqual(_projected.mode, 'woodbury')
+        self._check_against_dense(_projected, np.outer(self.x_err, self.x_err), self.derivatives)
+
+    def test_update_reuses_base_factorization(self):
+        _base = CovMat(self.y_mat)
+        _projected = ProjectedCovMat(_base, LowRankCovMat(np.zeros(6), self.x_err), self.derivatives)
+        _projected.solve(self.reference)
+        _base_factor = _base._factor
+        _projected.update(self.new_derivatives)
+        self._check_against_dense(_projected, np.outer(self.x_err, self.x_err), self.new_derivatives)
+        self.assertIs(_base._factor, _base_factor)
+
+    def test_dense_uncorrelated_x_errors(self):
+        _projected = ProjectedCovMat(CovMat(self.y_mat), LowRankCovMat(self.x_err ** 2), self.derivatives)
+        self.assertEqual(_projected.mode, 'dense')
+        self._check_against_dense(_projected, np.diag(self.x_err ** 2), self.derivatives)
+        _projected.update(self.new_derivatives)
+        self._check_against_dense(_projected, np.diag(self.x_err ** 2), self.new_derivatives)
+
+    def test_structured_sum(self):
+        _base = LowRankCovMat(np.diag(self.y_mat), self.reference / 10.)
+        _projected = ProjectedCovMat(_base, LowRankCovMat(self.x_err ** 2, self.x_err), self.derivatives)
+        self.assertEqual(_projected.mode, 'sum')
+        self._check_against_dense(_projected, np.diag(self.x_err ** 2) + np.outer(self.x_err, self.x_err),
+                                  self.derivatives)
+
+
+    def test_rescale(self):
+        _ratio = self.new_derivatives / self.derivatives
+        for _base, _x_cov_mat in ((CovMat(self.y_mat), LowRankCovMat(np.zeros(6), self.x_err)),
+                                  (CovMat(self.y_mat), LowRankCovMat(self.x_err ** 2)),
+                                  (LowRankCovMat(np.diag(self.y_mat), self.reference / 10.),
+                                   LowRankCovMat(self.x_err ** 2, self.x_err))):
+            _projected = ProjectedCovMat(_base, _x_cov_mat, self.derivatives)
+            _ref_mat = np.asarray(_projected.mat) * np.outer(_ratio, _ratio)
+            _projected.solve(self.reference)
+            _projected.rescale(self.derivatives, self.new_derivatives)
+            self.assertTrue(np.allclose(_projected.mat, _ref_mat))
+            self.assertTrue(np.allclose(_projected.solve(self.reference), np.linalg.solve(_ref_mat, self.reference)))
 
 
 class TestCovMatHelperFunctions(unittest.TestCase):
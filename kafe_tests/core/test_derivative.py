@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from kafe.core.derivative import (central_difference_stencil, derivative_by_x, derivative_by_parameters,
+                                  DerivativeException)
+
+
+class TestDerivative(unittest.TestCase):
+
+    @staticmethod
+    def func(x, a, b):
+        return a * np.exp(-b * x) + np.sin(x)
+
+    def setUp(self):
+        self.x = np.linspace(0, 5, 101)
+        self.pars = (2.0, 0.3)
+        self.ref_derivative_by_x = -self.pars[0] * self.pars[1] * np.exp(-self.pars[1] * self.x) + np.cos(self.x)
+        self.ref_derivative_by_parameters = np.array([np.exp(-self.pars[1] * self.x),
+                                                      -self.pars[0] * self.x * np.exp(-self.pars[1] * self.x)])
+
+    def test_stencil_weights(self):
+        _offsets, _weights = central_difference_stencil(3)
+        self.assertTrue(np.allclose(_offsets, [-1, 1]))
+        self.assertTrue(np.allclose(_weights, [-0.5, 0.5]))
+        _offsets, _weights = central_difference_stencil(5)
+        self.assertTrue(np.allclose(_offsets, [-2, -1, 1, 2]))
+        self.assertTrue(np.allclose(_weights, [1. / 12, -2. / 3, 2. / 3, -1. / 12]))
+
+    def test_raise_even_order(self):
+        with self.assertRaises(DerivativeException):
+            central_difference_stencil(4)
+
+    def test_derivative_by_x_higher_order_more_accurate(self):
+        _errors = [np.max(np.abs(derivative_by_x(self.func, self.x, args=self.pars, dx=1e-2, order=_order)
+                                 - self.ref_derivative_by_x))
+                   for _order in (3, 5, 7)]
+        self.assertTrue(_errors[0] > _errors[1] > _errors[2])
+        self.assertTrue(_errors[2] < 1e-9)
+
+    def test_derivative_by_x_complex_step(self):
+        _der = derivative_by_x(self.func, self.x, args=self.pars, complex_step=True)
+        self.assertTrue(np.allclose(_der, self.ref_derivative_by_x, rtol=1e-14, atol=1e-14))
+
+    def test_derivative_by_x_pointwise_step(self):
+        _der = derivative_by_x(self.func, self.x, args=self.pars, dx=np.full_like(self.x, 1e-4))
+        self.assertTrue(np.allclose(_der, self.ref_derivative_by_x, rtol=1e-6))
+
+    def test_derivative_by_parameters(self):
+        _der = derivative_by_parameters(self.func, self.pars, args=(self.x,), dp=1e-4)
+        self.assertEqual(_der.shape, (2, len(self.x)))
+        self.assertTrue(np.allclose(_der, self.ref_derivative_by_parameters, rtol=1e-6, atol=1e-10))
+
+    def test_derivative_by_parameters_complex_step(self):
+        _der = derivative_by_parameters(self.func, self.pars, args=(self.x,), complex_step=True)
+        self.assertTrue(np.allclose(_der, self.ref_derivative_by_parameters, rtol=1e-14, atol=1e-14))
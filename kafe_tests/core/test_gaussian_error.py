@@ -2,7 +2,7 @@ import unittest
 
 import numpy as np
 
-from kafe.core.error import MatrixGaussianError, SimpleGaussianError
+from kafe.core.error import MatrixGaussianError, SimpleGaussianError, LowRankCovMat
 
 
 class TestMatrixGaussianError(unittest.TestCase):
@@ -311,6 +311,18 @@ class TestSimpleGaussianError(unittest.TestCase):
 
 
 
+    def test_cov_mat_object_is_low_rank(self):
+        _cm = self.sge_abs_wref.get_cov_mat_object()
+        self.assertIsInstance(_cm, LowRankCovMat)
+        self.assertEqual(_cm.rank, 1)
+        self.assertTrue(np.allclose(_cm.mat, self.ref_cov_mat))
+
+    def test_matrix_error_keeps_low_rank_structure(self):
+        _mge = MatrixGaussianError(self.sge_abs_wref.get_cov_mat_object(), 'cov', reference=self.ref_reference)
+        self.assertIsInstance(_mge.get_cov_mat_object(), LowRankCovMat)
+        self.assertTrue(np.allclose(_mge.cov_mat_rel, self.ref_cov_mat_rel))
+        self.assertTrue(np.allclose(_mge.error, self.ref_error))
+
     def test_raise_cov_from_rel_noref(self):
         with self.assertRaises(AttributeError):
             _ = self.sge_rel_noref.cov_mat
@@ -0,0 +1,76 @@
+import json
+import subprocess
+import sys
+import unittest
+
+from kafe.core.minimizers import get_minimizer
+from kafe.tools import LazyModule
+
+
+# heavy optional dependencies which should only be imported on first use
+_LAZY_MODULES = ('matplotlib', 'matplotlib.pyplot', 'numdifftools', 'iminuit', 'ROOT')
+
+_IMPORT_BENCHMARK_SCRIPT = """
+import json, sys
+from timeit import default_timer
+_t_start = default_timer()
+import kafe.fit
+_t_import = default_timer() - _t_start
+sys.stdout.write(json.dumps(dict(import_time=_t_import,
+                                 loaded_modules=[_m for _m in {lazy_modules!r} if _m in sys.modules])))
+"""
+
+
+class TestLazyImport(unittest.TestCase):
+
+    # generous upper limit on the time needed for 'import kafe.fit', to catch eager imports of heavy modules
+    MAX_IMPORT_TIME = 1.5
+
+    @staticmethod
+    def _run_import_benchmark():
+        _output = subprocess.check_output(
+            [sys.executable, '-c', _IMPORT_BENCHMARK_SCRIPT.format(lazy_modules=_LAZY_MODULES)])
+        return json.loads(_output.decode())
+
+    def test_import_does_not_load_heavy_modules(self):
+        _result = self._run_import_benchmark()
+        self.assertEqual(_result['loaded_modules'], [])
+
+    def test_import_time(self):
+        # take the best of a few runs to reduce the influence of other processes
+        _import_time = min(self._run_import_benchmark()['import_time'] for _ in range(3))
+        self.assertLess(_import_time, self.MAX_IMPORT_TIME)
+
+    def test_get_minimizer_on_demand(self):
+        _minimizer = get_minimizer('scipy')
+        self.assertEqual(_minimizer.__name__, 'MinimizerScipyOptimize')
+        self.assertIs(get_minimizer('scipy.optimize'), _minimizer)
+
+    def test_import_scipy_minimizer_from_core(self):
+        from kafe.core import MinimizerScipyOptimize
+        from kafe.core import minimizers
+        self.assertIs(MinimizerScipyOptimize, get_minimizer('scipy'))
+        self.assertIn('MinimizerScipyOptimize', minimizers.__all__)
+
+    def test_resolved_minimizer_is_module_attribute(self):
+        from kafe.core import minimizers
+        try:
+            _minimizer = get_minimizer('iminuit')
+        except ValueError:
+            self.skipTest("Cannot import iminuit")
+        # without relying on the module-level '__getattr__' (Python 3.7+)
+        self.assertIs(vars(minimizers)['MinimizerIMinuit'], _minimizer)
+        self.assertIn('MinimizerIMinuit', minimizers.__all__)
+
+    def test_raise_get_unknown_minimizer(self):
+        with self.assertRaises(ValueError):
+            get_minimizer('my_inexistent_minimizer')
+
+    def test_lazy_module(self):
+        _before_import_calls = []
+        _lazy_json = LazyModule('json', before_import=lambda: _before_import_calls.append(True))
+        self.assertFalse(_lazy_json.is_loaded)
+        self.assertEqual(_lazy_json.dumps([1, 2]), '[1, 2]')
+        self.assertTrue(_lazy_json.is_loaded)
+        self.assertEqual(_lazy_json.loads('[3]'), [3])
+        self.assertEqual(_before_import_calls, [True])
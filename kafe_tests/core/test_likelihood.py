@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+from scipy.stats import norm, poisson
+
+from kafe.core import likelihood
+
+
+class TestLikelihoodKernels(unittest.TestCase):
+
+    def setUp(self):
+        _rs = np.random.RandomState(1234)
+        self._ref_model = _rs.uniform(1., 50., size=20)
+        self._ref_data = _rs.poisson(self._ref_model).astype(float)
+        self._ref_error = _rs.uniform(0.5, 2., size=20)
+
+        self._ref_nll_poisson = -2.0 * np.sum(poisson.logpmf(self._ref_data, self._ref_model))
+        self._ref_nll_gaussian = -2.0 * np.sum(norm.logpdf(self._ref_data, self._ref_model, self._ref_error))
+
+    def test_nll_poisson_compare_ref(self):
+        self.assertAlmostEqual(likelihood.nll_poisson(self._ref_data, self._ref_model), self._ref_nll_poisson)
+
+    def test_nll_gaussian_compare_ref(self):
+        self.assertAlmostEqual(likelihood.nll_gaussian(self._ref_data, self._ref_model, self._ref_error),
+                               self._ref_nll_gaussian)
+
+    def test_nllr_compare_ref(self):
+        _log_marginal = 2.0 * np.sum(np.log(self._ref_model))
+        self.assertAlmostEqual(likelihood.nllr_poisson(self._ref_data, self._ref_model),
+                               self._ref_nll_poisson + _log_marginal)
+        self.assertAlmostEqual(likelihood.nllr_gaussian(self._ref_data, self._ref_model, self._ref_error),
+                               self._ref_nll_gaussian + _log_marginal)
+
+    def test_nll_poisson_many_bins_finite(self):
+        _model = np.tile(self._ref_model, 100)
+        _data = np.tile(self._ref_data, 100)
+        self.assertAlmostEqual(likelihood.nll_poisson(_data, _model), 100 * self._ref_nll_poisson, places=6)
+
+    def test_nll_poisson_empty_bins(self):
+        self.assertEqual(likelihood.nll_poisson([0., 0.], [0., 1.]), 2.0)
+        self.assertEqual(likelihood.nll_poisson([1.], [0.]), np.inf)
+        self.assertEqual(likelihood.nll_poisson([1.], [-1.]), np.inf)
+
+    def test_log_factorial_cache_data_change(self):
+        _data = self._ref_data.copy()
+        _ref_nll = likelihood.nll_poisson(_data, self._ref_model)
+        _data[0] += 1
+        self.assertNotAlmostEqual(likelihood.nll_poisson(_data, self._ref_model), _ref_nll)
+        _data[0] -= 1
+        self.assertEqual(likelihood.nll_poisson(_data, self._ref_model), _ref_nll)
+
+    def test_gradients_compare_finite_differences(self):
+        # model linear in the parameters: m = J^T p
+        _jac = np.vstack([np.ones_like(self._ref_model), np.linspace(0, 1, self._ref_model.size)])
+        _pars = np.array([20., 10.])
+        _eps = 1e-6
+        for _nll, _nll_grad, _args in (
+                (likelihood.nll_poisson, likelihood.nll_poisson_gradient, ()),
+                (likelihood.nll_gaussian, likelihood.nll_gaussian_gradient, (self._ref_error,))):
+            _num_grad = [(_nll(self._ref_data, _jac.T.dot(_pars + _eps * _dp), *_args)
+                          - _nll(self._ref_data, _jac.T.dot(_pars - _eps * _dp), *_args)) / (2 * _eps)
+                         for _dp in np.eye(2)]
+            _grad = _nll_grad(self._ref_data, _jac.T.dot(_pars), _jac, *_args)
+            self.assertTrue(np.allclose(_grad, _num_grad, rtol=1e-5))
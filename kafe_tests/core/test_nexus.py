@@ -1,4 +1,5 @@
 import unittest
+from copy import deepcopy
 
 from kafe.core.fitters import Nexus
 from kafe.core.fitters.nexus import NodeException, NexusException, NODE_VALUE_DEFAULT
@@ -72,6 +73,122 @@ class TestParameterFunction(unittest.TestCase):
         self.ps.new_function(self.native_func_unknown_parameters, add_unknown_parameters=True)
         self.assertEqual(self.ps.get_by_name('zz_unknown_zz').value, NODE_VALUE_DEFAULT)
 
+    def test_update_chained_func_value_from_parameter(self):
+        self.ps.new_function(lambda native_func_difference12: 2 * native_func_difference12, function_name='double12')
+        self.assertEqual(self.ps.get_values('double12'), 40)
+        self.ps.set(a2=52)
+        self.assertEqual(self.ps.get_values('double12'), 20)
+
+    def test_dirty_set_transitive_in_evaluation_order(self):
+        self.ps.new_function(lambda native_func_difference12: 2 * native_func_difference12, function_name='double12')
+        _dirty_names = [_node.name for _node in self.ps.get_dirty_set('a2')]
+        self.assertEqual(_dirty_names, ['native_func_difference12', 'double12'])
+
+    def test_dirty_set_updated_after_adding_dependency(self):
+        self.assertEqual(len(self.ps.get_dirty_set('a2')), 1)
+        self.ps.add_dependency(source='a2', target='native_func_difference1_constant2')
+        self.assertEqual(len(self.ps.get_dirty_set('a2')), 2)
+
+    def test_set_vector(self):
+        _slots = self.ps.bind_slots(['a1', 'a2'])
+        self.assertEqual(self.ps.get_values('native_func_difference12'), 20)
+        self.ps.set_vector(_slots, [10, 3])
+        self.assertEqual(self.ps.get_values('native_func_difference12'), 7)
+        self.assertEqual(self.ps.get_values('native_func_difference3_constant2'), 8)
+        self.assertEqual(_slots.values, [10, 3])
+
+    def test_raise_set_vector_wrong_length(self):
+        _slots = self.ps.bind_slots(['a1', 'a2'])
+        with self.assertRaises(NexusException):
+            self.ps.set_vector(_slots, [10])
+
+    def test_raise_bind_slots_function(self):
+        with self.assertRaises(NexusException):
+            self.ps.bind_slots(['a1', 'native_func_difference12'])
+
+    def test_mark_group_for_update(self):
+        self.ps.new_function(lambda: 3, function_name='error_func', groups=('errors',))
+        self.ps.new_function(lambda error_func: 2 * error_func, function_name='double_error_func')
+        self.assertEqual(self.ps.get_values('double_error_func'), 6)
+        self.ps.set_function(error_func=lambda: 5)
+        self.ps.get_by_name('double_error_func')._stale = False
+        self.ps.mark_group_for_update('errors')
+        self.assertEqual(self.ps.get_values('double_error_func'), 10)
+
+    def test_raise_mark_unknown_group_for_update(self):
+        with self.assertRaises(NexusException):
+            self.ps.mark_group_for_update('zz_unknown_zz')
+
+    def test_memoized_func_skip_update_if_inputs_unchanged(self):
+        _calls = []
+        def _func(a1, a2):
+            _calls.append((a1, a2))
+            return a1 + a2
+        self.ps.new_function(_func, function_name='sum12', memoize=True)
+        self.assertEqual(self.ps.get_values('sum12'), 104)
+        self.ps.set(a1=62)
+        self.assertEqual(self.ps.get_values('sum12'), 104)
+        self.assertEqual(len(_calls), 1)
+        self.ps.set(a1=63)
+        self.assertEqual(self.ps.get_values('sum12'), 105)
+        self.assertEqual(len(_calls), 2)
+
+    def test_memoized_func_update_after_mark_for_update(self):
+        _calls = []
+        def _func(a1):
+            _calls.append(a1)
+            return a1
+        self.ps.new_function(_func, function_name='identity1', memoize=True)
+        self.ps.get_values('identity1')
+        self.ps.get_by_name('identity1').mark_for_update()
+        self.ps.get_values('identity1')
+        self.assertEqual(len(_calls), 2)
+
+    def test_version_unchanged_for_same_value(self):
+        _node = self.ps.get_by_name('a1')
+        _version = _node.version
+        self.ps.set(a1=62)
+        self.assertEqual(_node.version, _version)
+        self.ps.set(a1=61)
+        self.assertEqual(_node.version, _version + 1)
+
+    def test_profile_report(self):
+        self.ps.enable_profiling()
+        self.ps.get_values('native_func_difference12')
+        self.ps.get_values('native_func_difference12')
+        self.ps.set(a2=40)
+        self.ps.disable_profiling()
+        self.ps.set(a2=30)
+        _report = self.ps.get_profile_report()['native_func_difference12']
+        self.assertEqual(_report['n_evaluations'], 1)
+        self.assertEqual(_report['n_cache_hits'], 1)
+        self.assertEqual(_report['n_cache_misses'], 1)
+        self.assertEqual(_report['n_invalidations'], 1)
+        self.assertEqual(_report['cache_hit_ratio'], 0.5)
+        self.assertGreaterEqual(_report['cumulative_time'], _report['self_time'])
+
+    def test_deepcopy_independent(self):
+        _copy = deepcopy(self.ps)
+        _copy.set(a2=52)
+        self.assertEqual(_copy.get_values('native_func_difference12'), 10)
+        self.assertEqual(self.ps.get_values('native_func_difference12'), 20)
+        self.assertIs(_copy.get_by_name('a1').nexus, _copy)
+
+    def test_deepcopy_rebinds_function_closure(self):
+        _offset = dict(value=1)
+        self.ps.new_function(lambda a1: a1 + _offset['value'], function_name='a1_plus_offset')
+        _copy = deepcopy(self.ps)
+        _offset['value'] = 2
+        self.ps.get_by_name('a1_plus_offset').mark_for_update()
+        _copy.get_by_name('a1_plus_offset').mark_for_update()
+        self.assertEqual(self.ps.get_values('a1_plus_offset'), 64)
+        self.assertEqual(_copy.get_values('a1_plus_offset'), 63)
+
+    def test_raise_cyclic_dependency(self):
+        self.ps.add_dependency(source='native_func_difference12', target='a1')
+        with self.assertRaises(NexusException):
+            self.ps.set(a2=3)
+
 
 class TestPSpace(unittest.TestCase):
 
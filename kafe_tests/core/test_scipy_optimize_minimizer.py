@@ -1,9 +1,11 @@
+import multiprocessing
 import scipy.optimize as opt
 import unittest
 
 import numpy as np
 
-from kafe.core.minimizers.scipy_optimize_minimizer import MinimizerScipyOptimize
+from kafe.core.minimizers.scipy_optimize_minimizer import MinimizerScipyOptimize, MinimizerScipyOptimizeException
+from kafe.tools import can_fork_worker_processes
 
 
 def fcn_3(x, y, z):
@@ -204,3 +206,74 @@ class TestMinimizerScipyOptimize(unittest.TestCase):
         self.assertTrue(
             np.allclose(_hm_inv, _hm_inv_scipy, atol=1e-2)
         )
+
+
+class TestMinimizerScipyOptimizeContour(unittest.TestCase):
+
+    def setUp(self):
+        self.m3 = MinimizerScipyOptimize(function_to_minimize=fcn_3,
+                                         parameter_names=('x', 'y', 'z'),
+                                         parameter_values=(1.0, 1.0, 1.0),
+                                         parameter_errors=(0.1, 0.1, 0.1))
+        self.m3.minimize()
+        self._ref_contour = self.m3.contour('x', 'y', sigma=1.0, algorithm='heuristic_grid', iterations=3)
+
+    def _assert_contours_equal(self, contour):
+        self.assertTrue(np.array_equal(contour.grid_x, self._ref_contour.grid_x))
+        self.assertTrue(np.array_equal(contour.grid_y, self._ref_contour.grid_y))
+        self.assertTrue(np.array_equal(contour.grid_z, self._ref_contour.grid_z))
+
+    def test_compare_contour_heuristic_grid_thread_pool(self):
+        _contour = self.m3.contour('x', 'y', sigma=1.0, algorithm='heuristic_grid', iterations=3,
+                                   n_workers=2, backend='thread')
+        self._assert_contours_equal(_contour)
+
+    def test_compare_contour_heuristic_grid_process_pool(self):
+        _contour = self.m3.contour('x', 'y', sigma=1.0, algorithm='heuristic_grid', iterations=3,
+                                   n_workers=2, backend='process')
+        self._assert_contours_equal(_contour)
+
+    def test_raise_contour_heuristic_grid_unknown_backend(self):
+        with self.assertRaises(MinimizerScipyOptimizeException):
+            self.m3.contour('x', 'y', sigma=1.0, algorithm='heuristic_grid', n_workers=2, backend='cluster')
+
+
+class TestMinimizerScipyOptimizeProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.m3 = MinimizerScipyOptimize(function_to_minimize=fcn_3,
+                                         parameter_names=('x', 'y', 'z'),
+                                         parameter_values=(1.0, 1.0, 1.0),
+                                         parameter_errors=(0.1, 0.1, 0.1))
+        self.m3.minimize()
+
+    def test_compare_profile_fcn3(self):
+        _x, _y = self.m3.profile('x', bins=11, bound=2)
+        self.assertTrue(np.allclose(_y, (_x - 1.23) ** 2 - 5.23, atol=1e-5))
+
+    def test_compare_profile_fcn3_even_bins_subtract_min(self):
+        _x, _y = self.m3.profile('y', bins=10, bound=2, subtract_min=True)
+        self.assertTrue(np.allclose(_y, 0.5 * (_x - 4.32) ** 2, atol=1e-5))
+
+    def test_compare_profile_thread_pool(self):
+        _ref_profile = self.m3.profile('z', bins=11, bound=2)
+        _profile = self.m3.profile('z', bins=11, bound=2, n_workers=2, backend='thread')
+        self.assertTrue(np.array_equal(_profile, _ref_profile))
+
+    @unittest.skipIf(not hasattr(multiprocessing, 'set_start_method') or not can_fork_worker_processes(),
+                     "start methods cannot be selected or worker processes cannot be forked")
+    def test_compare_profile_process_pool_spawn_start_method(self):
+        # lambdas cannot be pickled: the worker processes must be forked even if the default is 'spawn'
+        _m = MinimizerScipyOptimize(function_to_minimize=lambda x, y, z: fcn_3(x, y, z),
+                                    parameter_names=('x', 'y', 'z'),
+                                    parameter_values=(1.0, 1.0, 1.0),
+                                    parameter_errors=(0.1, 0.1, 0.1))
+        _m.minimize()
+        _ref_profile = _m.profile('z', bins=11, bound=2)
+        _start_method = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method('spawn', force=True)
+        try:
+            _profile = _m.profile('z', bins=11, bound=2, n_workers=2, backend='process')
+        finally:
+            multiprocessing.set_start_method(_start_method, force=True)
+        self.assertTrue(np.array_equal(_profile, _ref_profile))
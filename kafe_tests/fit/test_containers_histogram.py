@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 import numpy as np
 import scipy.stats as stats
@@ -87,6 +90,106 @@ class TestDatastoreHistogram(unittest.TestCase):
             np.allclose(self.hist_cont_binedges_auto.data, self._ref_data_manual_variablespacing)
         )
 
+    def test_fill_chunks_compare_data(self):
+        for _entry in self._ref_entries[:3]:
+            self.hist_cont_binedges_manual_equal.fill(_entry)
+        self.hist_cont_binedges_manual_equal.fill(self._ref_entries[3:6])
+        self.hist_cont_binedges_manual_equal.data  # bin the entries filled so far
+        self.hist_cont_binedges_manual_equal.fill(np.array(self._ref_entries[6:]))
+        self.assertTrue(
+            np.allclose(self.hist_cont_binedges_manual_equal.data, self._ref_data_manual_equalspacing)
+        )
+        self.assertEqual(self.hist_cont_binedges_manual_equal.n_entries, len(self._ref_entries))
+        self.assertTrue(np.allclose(self.hist_cont_binedges_manual_equal.raw_data, np.sort(self._ref_entries)))
+
+    def test_fill_compare_underflow_overflow(self):
+        self.hist_cont_binedges_manual_variable.fill(self._ref_entries)
+        self.assertEqual(self.hist_cont_binedges_manual_variable.underflow, 2)
+        self.assertEqual(self.hist_cont_binedges_manual_variable.overflow, 4)
+
+    def test_fill_weighted_compare_sums(self):
+        self.hist_cont_binedges_manual_equal.fill(self._ref_entries[:5])
+        self.hist_cont_binedges_manual_equal.fill(self._ref_entries[5:], weights=2.0)
+        _ref_sum_w = np.array([0, 0, 1, 1, 0, 1, 0, 0, 2, 0])
+        _ref_sum_w2 = np.array([0, 0, 1, 1, 0, 1, 0, 0, 4, 0])
+        self.assertTrue(self.hist_cont_binedges_manual_equal.weighted)
+        self.assertTrue(np.allclose(self.hist_cont_binedges_manual_equal.data, _ref_sum_w))
+        self.assertTrue(np.allclose(self.hist_cont_binedges_manual_equal.sum_of_squared_weights, _ref_sum_w2))
+        self.assertEqual(self.hist_cont_binedges_manual_equal.sum_of_weights, 15.)
+        self.assertEqual(self.hist_cont_binedges_manual_equal.n_entries, 10)
+
+    def test_raise_fill_weights_wrong_length(self):
+        with self.assertRaises(HistContainerException):
+            self.hist_cont_binedges_manual_equal.fill(self._ref_entries, weights=[1., 2.])
+
+    def test_fill_from_chunks_counts_only_compare_data(self):
+        _hc = HistContainer(self._ref_n_bins_manual, self._ref_n_bin_range, keep_raw_entries=False)
+        _hc.fill_from_chunks([np.array(self._ref_entries[:4]), self._ref_entries[4:7], self._ref_entries[7:]])
+        self.assertFalse(_hc.keeps_raw_entries)
+        self.assertTrue(np.allclose(_hc.data, self._ref_data_manual_equalspacing))
+        self.assertEqual(_hc.n_entries, len(self._ref_entries))
+        self.assertEqual(_hc.underflow, 2)
+        self.assertEqual(_hc.overflow, 4)
+
+    def test_fill_from_chunks_weighted_counts_only_compare_sums(self):
+        _hc = HistContainer(self._ref_n_bins_manual, self._ref_n_bin_range, keep_raw_entries=False)
+        _hc.fill(self._ref_entries[:5])
+        _hc.fill_from_chunks([self._ref_entries[5:8], self._ref_entries[8:]], weight_chunks=[2.0, [2.0, 2.0]])
+        self.assertTrue(_hc.weighted)
+        self.assertTrue(np.allclose(_hc.data, [0, 0, 1, 1, 0, 1, 0, 0, 2, 0]))
+        self.assertTrue(np.allclose(_hc.sum_of_squared_weights, [0, 0, 1, 1, 0, 1, 0, 0, 4, 0]))
+        self.assertEqual(_hc.sum_of_weights, 15.)
+
+    def test_fill_rebin_fill_rebin_compare_to_direct_fill(self):
+        _entries = np.random.RandomState(0).normal(5., 3., size=500)
+        _weights = np.random.RandomState(1).uniform(0.5, 1.5, size=500)
+        _hc = HistContainer(self._ref_n_bins_manual, self._ref_n_bin_range)
+        _hc.fill(_entries[:200], weights=_weights[:200])
+        _hc.rebin(self._ref_bin_edges_manual_variablespacing)
+        _hc.fill(_entries[200:], weights=_weights[200:])
+        _hc.rebin(self._ref_bin_edges_manual_equalspacing)
+        _ref_hc = HistContainer(self._ref_n_bins_manual, self._ref_n_bin_range)
+        _ref_hc.fill(_entries, weights=_weights)
+        self.assertTrue(np.allclose(_hc.data, _ref_hc.data))
+        self.assertTrue(np.allclose(_hc.sum_of_squared_weights, _ref_hc.sum_of_squared_weights))
+        self.assertAlmostEqual(_hc.underflow, _ref_hc.underflow)
+        self.assertAlmostEqual(_hc.overflow, _ref_hc.overflow)
+        self.assertTrue(np.allclose(_hc.raw_data, np.sort(_entries)))
+        self.assertTrue(np.allclose(_hc.raw_weights, _weights[np.argsort(_entries)]))
+
+    def test_counts_only_merge_bins_compare_data(self):
+        _hc = HistContainer(self._ref_n_bins_manual, self._ref_n_bin_range, keep_raw_entries=False)
+        _hc.fill(self._ref_entries)
+        _hc.rebin([2., 4., 6., 10.])
+        self.assertTrue(np.allclose(_hc.data, [2, 1, 1]))
+        self.assertEqual(_hc.underflow, 2)
+        self.assertEqual(_hc.overflow, 4)
+        self.assertTrue(np.allclose(_hc.sum_of_squared_weights, [2, 1, 1]))
+
+    def test_raise_counts_only_raw_data(self):
+        _hc = HistContainer(self._ref_n_bins_manual, self._ref_n_bin_range, keep_raw_entries=False)
+        _hc.fill(self._ref_entries)
+        with self.assertRaises(HistContainerException):
+            _hc.raw_data
+        with self.assertRaises(HistContainerException):
+            _hc.rebin(self._ref_bin_edges_manual_variablespacing)
+
+    def test_fill_from_file_compare_data(self):
+        _tmp_dir = tempfile.mkdtemp()
+        try:
+            _npy_path = os.path.join(_tmp_dir, 'entries.npy')
+            _bin_path = os.path.join(_tmp_dir, 'entries.bin')
+            np.save(_npy_path, np.array(self._ref_entries))
+            np.array(self._ref_entries, dtype=np.float32).tofile(_bin_path)
+            for _path, _keep_raw_entries in ((_npy_path, True), (_bin_path, False)):
+                _hc = HistContainer(self._ref_n_bins_manual, self._ref_n_bin_range,
+                                    keep_raw_entries=_keep_raw_entries)
+                _hc.fill_from_file(_path, dtype=np.float32, chunk_size=3)
+                self.assertTrue(np.allclose(_hc.data, self._ref_data_manual_equalspacing))
+                self.assertEqual(_hc.n_entries, len(self._ref_entries))
+        finally:
+            shutil.rmtree(_tmp_dir)
+
     def test_construct_bin_edges_variablespacing_withedges(self):
         _hc = HistContainer(self._ref_n_bins_manual, self._ref_n_bin_range, bin_edges=self._probe_bin_edges_variablespacing_withedges)
 
@@ -195,3 +298,40 @@ class TestDatastoreHistParametricModel(unittest.TestCase):
     def test_raise_fill(self):
         with self.assertRaises(HistParametricModelException):
             self.hist_param_model_no_antider.fill([-1, 2, 700])
+
+    def test_compare_hist_model_bin_integration_methods_ref_data(self):
+        for _method in HistParametricModel.BIN_INTEGRATION_METHODS:
+            _hist_param_model = HistParametricModel(
+                n_bins=self._ref_n_bins,
+                bin_range=self._ref_n_bin_range,
+                model_density_func=self._ref_model_func, model_parameters=self._ref_params,
+                bin_integration_method=_method)
+            self.assertTrue(np.allclose(_hist_param_model.data, self._ref_data, rtol=1e-6, atol=1e-8))
+
+    def test_compare_hist_model_narrow_peak_fallback_ref_data(self):
+        # the peak is too narrow for the fixed-order rule, so the affected bins are integrated adaptively
+        _params = (14.1, 0.3)
+        _ref_data = (self._ref_model_func_antider(self._ref_bin_edges[1:], *_params) -
+                     self._ref_model_func_antider(self._ref_bin_edges[:-1], *_params))
+        _hist_param_model = HistParametricModel(
+            n_bins=self._ref_n_bins,
+            bin_range=self._ref_n_bin_range,
+            model_density_func=self._ref_model_func, model_parameters=_params,
+            bin_integration_method='gauss-legendre', bin_integration_order=4)
+        self.assertTrue(np.allclose(_hist_param_model.data, _ref_data))
+
+    def test_compare_hist_model_not_vectorized_ref_data(self):
+        _hist_param_model = HistParametricModel(
+            n_bins=self._ref_n_bins,
+            bin_range=self._ref_n_bin_range,
+            model_density_func=lambda x, mu, sigma: float(self._ref_model_func(x, mu, sigma)),
+            model_parameters=self._ref_params)
+        self.assertTrue(np.allclose(_hist_param_model.data, self._ref_data))
+
+    def test_raise_unknown_bin_integration_method(self):
+        with self.assertRaises(HistParametricModelException):
+            HistParametricModel(
+                n_bins=self._ref_n_bins,
+                bin_range=self._ref_n_bin_range,
+                model_density_func=self._ref_model_func, model_parameters=self._ref_params,
+                bin_integration_method='monte-carlo')
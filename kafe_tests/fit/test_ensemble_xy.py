@@ -0,0 +1,86 @@
+import multiprocessing
+import unittest
+import numpy as np
+
+from kafe.fit.xy.ensemble import XYFitEnsemble, XYFitEnsembleException
+from kafe.tools import can_fork_worker_processes
+
+
+def simple_xy_model(x, b=1.1, c=3.3):
+    return b * x + c
+
+
+class TestXYFitEnsembleRun(unittest.TestCase):
+
+    def setUp(self):
+        self._ref_x = np.arange(10.)
+        self._ref_pars = (2.0, 1.0)
+        self._ref_results = ('parameter_pulls', 'cost', 'x_data', 'y_data')
+
+        self.ensemble = XYFitEnsemble(n_experiments=12, x_support=self._ref_x,
+                                      model_function=simple_xy_model, model_parameters=self._ref_pars,
+                                      requested_results=self._ref_results)
+        self.ensemble.add_simple_error('y', 0.3)
+        self.ensemble.add_simple_error('x', 0.1)
+
+        self.ensemble.run(seed=1234)
+        self._ref_serial_results = self.ensemble.get_results()
+
+    def _assert_results_identical_to_serial(self):
+        _results = self.ensemble.get_results()
+        for _result_name in self._ref_results:
+            self.assertTrue(np.array_equal(_results[_result_name], self._ref_serial_results[_result_name]))
+
+    def test_run_reproducible_for_seed(self):
+        self.ensemble.run(seed=1234)
+        self._assert_results_identical_to_serial()
+
+    def test_run_different_seeds_differ(self):
+        self.ensemble.run(seed=4321)
+        _results = self.ensemble.get_results()
+        self.assertFalse(np.array_equal(_results['y_data'], self._ref_serial_results['y_data']))
+
+    def test_run_thread_backend_identical_to_serial(self):
+        self.ensemble.run(seed=1234, backend='thread', n_workers=3)
+        self._assert_results_identical_to_serial()
+
+    def test_run_process_backend_identical_to_serial(self):
+        self.ensemble.run(seed=1234, backend='process', n_workers=5)
+        self._assert_results_identical_to_serial()
+
+    @unittest.skipIf(not hasattr(multiprocessing, 'set_start_method') or not can_fork_worker_processes(),
+                     "start methods cannot be selected or worker processes cannot be forked")
+    def test_run_process_backend_spawn_start_method_identical_to_serial(self):
+        _start_method = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method('spawn', force=True)
+        try:
+            self.ensemble.run(seed=1234, backend='process', n_workers=2)
+        finally:
+            multiprocessing.set_start_method(_start_method, force=True)
+        self._assert_results_identical_to_serial()
+
+    def test_raise_run_unknown_backend(self):
+        with self.assertRaises(XYFitEnsembleException):
+            self.ensemble.run(seed=1234, backend='cluster')
+
+
+class TestXYFitEnsemblePseudoData(unittest.TestCase):
+
+    def setUp(self):
+        self._ref_x = np.arange(5.)
+        self.ensemble = XYFitEnsemble(n_experiments=1, x_support=self._ref_x,
+                                      model_function=simple_xy_model, model_parameters=(2.0, 1.0))
+        self.ensemble.add_simple_error('y', 0.2, correlation=0.5)
+        self.ensemble.add_simple_error('y', 0.1)
+
+    def test_compare_pseudodata_cov_mat(self):
+        _x_data, _y_data = self.ensemble._generate_pseudodata(seed=1234, experiment_indices=np.arange(20000))
+        self.assertEqual(_y_data.shape, (20000, 5))
+        self.assertTrue(np.all(_x_data == self._ref_x))
+        self.assertTrue(np.allclose(np.cov(_y_data.T), self.ensemble._ref_y_cov_mat, atol=2e-3))
+        self.assertTrue(np.allclose(np.mean(_y_data, axis=0), simple_xy_model(self._ref_x, 2.0, 1.0), atol=5e-3))
+
+    def test_pseudodata_independent_of_chunking(self):
+        _x_data, _y_data = self.ensemble._generate_pseudodata(seed=1234, experiment_indices=np.arange(10))
+        _x_data_2, _y_data_2 = self.ensemble._generate_pseudodata(seed=1234, experiment_indices=np.arange(5, 10))
+        self.assertTrue(np.array_equal(_y_data[5:], _y_data_2))
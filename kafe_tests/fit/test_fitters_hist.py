@@ -1,4 +1,5 @@
 import unittest
+import warnings
 import numpy as np
 import six
 
@@ -6,6 +7,7 @@ from scipy import stats
 
 from kafe.config import kc
 from kafe.fit import HistContainer, HistFit
+from kafe.fit.histogram.cost import HistCostFunction_Chi2
 from kafe.fit.histogram.fit import HistFitException
 from kafe.fit.histogram.model import HistModelFunctionException
 
@@ -23,6 +25,11 @@ class TestFittersHist(unittest.TestCase):
     def hist_model_density_antideriv(x, mu=14., sigma=3.):
         return stats.norm(mu, sigma).cdf(x)
 
+    @staticmethod
+    def hist_model_density_gradient(x, mu=14., sigma=3.):
+        _pdf = stats.norm(mu, sigma).pdf(x)
+        return [_pdf * (x - mu) / sigma ** 2, _pdf * ((x - mu) ** 2 / sigma ** 3 - 1.0 / sigma)]
+
     @staticmethod
     def simple_chi2(data, model):
         return np.sum((data - model)**2)
@@ -144,6 +151,63 @@ class TestFittersHist(unittest.TestCase):
             )
         )
 
+    def test_weighted_histogram_data_error_from_squared_weights(self):
+        _weights = np.linspace(0.5, 1.5, len(self._ref_entries))
+        _hist_cont = HistContainer(self._ref_n_bins, self._ref_n_bin_range)
+        _hist_cont.fill(self._ref_entries, weights=_weights)
+        _hist_fit = HistFit(data=_hist_cont,
+                            model_density_function=self.hist_model_density,
+                            cost_function=HistCostFunction_Chi2(errors_to_use='covariance'),
+                            model_density_antiderivative=self.hist_model_density_antideriv)
+        _ref_sum_w2, _ = np.histogram(self._ref_entries, bins=self._ref_bin_edges, weights=_weights**2)
+        self.assertTrue(np.allclose(_hist_fit.data_error, np.sqrt(_ref_sum_w2)))
+        self.assertTrue(np.allclose(_hist_fit.model, self._ref_model / self._ref_n_entries * np.sum(_weights)))
+
+    def test_weighted_histogram_warn_cost_function_without_errors(self):
+        _hist_cont = HistContainer(self._ref_n_bins, self._ref_n_bin_range)
+        _hist_cont.fill(self._ref_entries, weights=np.linspace(0.5, 1.5, len(self._ref_entries)))
+        with warnings.catch_warnings(record=True) as _caught:
+            warnings.simplefilter('always')
+            HistFit(data=_hist_cont,
+                    model_density_function=self.hist_model_density,
+                    model_density_antiderivative=self.hist_model_density_antideriv)
+        self.assertEqual(len([_w for _w in _caught if issubclass(_w.category, UserWarning)]), 1)
+        with warnings.catch_warnings(record=True) as _caught:
+            warnings.simplefilter('always')
+            HistFit(data=_hist_cont,
+                    model_density_function=self.hist_model_density,
+                    cost_function=HistCostFunction_Chi2(errors_to_use='covariance'),
+                    model_density_antiderivative=self.hist_model_density_antideriv)
+        self.assertEqual(len([_w for _w in _caught if issubclass(_w.category, UserWarning)]), 0)
+
+    def test_model_gradient_compare_numeric_derivative(self):
+        _hist_fit = HistFit(data=self._ref_hist_cont,
+                            model_density_function=self.hist_model_density,
+                            model_density_antiderivative=self.hist_model_density_antideriv,
+                            model_density_gradient=self.hist_model_density_gradient)
+        _par_values = np.array(self._ref_params)
+        _eps = 1e-6
+        _numeric_gradient = []
+        for _unit in np.eye(2):
+            _hist_fit.set_all_parameter_values(_par_values + _eps * _unit)
+            _model_up = _hist_fit.model
+            _hist_fit.set_all_parameter_values(_par_values - _eps * _unit)
+            _model_dn = _hist_fit.model
+            _numeric_gradient.append((_model_up - _model_dn) / (2 * _eps))
+        _hist_fit.set_all_parameter_values(_par_values)
+        self.assertTrue(np.allclose(_hist_fit.model_gradient, _numeric_gradient, rtol=1e-5, atol=1e-8))
+
+    def test_compare_fit_analytic_gradient_numeric_gradient(self):
+        _hist_fit = HistFit(data=self._ref_hist_cont,
+                            model_density_function=self.hist_model_density,
+                            model_density_antiderivative=self.hist_model_density_antideriv,
+                            model_density_gradient=self.hist_model_density_gradient)
+        _hist_fit.do_fit()
+        self.hist_fit_default_cost_function.do_fit()
+        self.assertEqual(_hist_fit._fitter.parameter_to_minimize_gradient, 'cost_gradient')
+        self.assertTrue(np.allclose(_hist_fit.parameter_values,
+                                    self.hist_fit_default_cost_function.parameter_values, rtol=1e-3))
+
     def test_update_cost_function_on_parameter_change(self):
         self.hist_fit.set_all_parameter_values(self._ref_parameter_value_estimates)
         self.assertEqual(
@@ -1,14 +1,23 @@
 import unittest
 import numpy as np
+import scipy.sparse as sp
 import six
 
 from kafe.config import kc
 from kafe.fit import XYFit
+from kafe.fit._base import CostFunctionException
+from kafe.fit.xy.cost import XYCostFunction_Chi2_Nuisance
 from kafe.fit.xy.fit import XYFitException
 from kafe.fit.xy.model import XYModelFunctionException
 
 CONFIG_PARAMETER_DEFAULT_VALUE = kc('core', 'default_initial_parameter_value')
 
+_cannot_import_IMinuit = False
+try:
+    from kafe.core.minimizers.iminuit_minimizer import MinimizerIMinuit
+except ImportError:
+    _cannot_import_IMinuit = True
+
 
 class TestFittersXY(unittest.TestCase):
 
@@ -115,6 +124,15 @@ class TestFittersXY(unittest.TestCase):
             )
         )
 
+    def test_do_fit_profile_report(self):
+        self.assertIsNone(self.xy_fit.profile_report)
+        self.xy_fit.do_fit(profile=True)
+        _report = self.xy_fit.profile_report
+        self.assertIn('y_model', _report)
+        self.assertIn('y_total_cov_mat_inverse', _report)
+        self.assertGreater(_report[self.xy_fit._cost_function.name]['n_evaluations'], 0)
+        self.assertFalse(self.xy_fit._nexus.profiling_enabled)
+
     def test_do_fit_explicit_model_name_in_chi2_compare_parameter_values(self):
         self.xy_fit.do_fit()
         self.assertTrue(
@@ -168,6 +186,26 @@ class TestFittersXY(unittest.TestCase):
             self.xy_fit._cost_function(self._ref_y_data, self._ref_y_model_value_estimates),
         )
 
+    def test_model_not_recalculated_on_repeated_access(self):
+        _calls = []
+
+        def _counting_model(x, a=1.1, b=2.2, c=3.3):
+            _calls.append(True)
+            return self.xy_model(x, a, b, c)
+
+        _fit = XYFit(xy_data=self._ref_xy_data, model_function=_counting_model, cost_function=self.simple_chi2)
+        _fit.y_model
+        _xy_data_buffer = _fit._param_model._xy_data
+        del _calls[:]
+        for _ in range(5):
+            _fit.y_model
+            _fit.model
+        self.assertEqual(len(_calls), 0)
+        self.assertIs(_fit._param_model._xy_data, _xy_data_buffer)
+        _fit.set_all_parameter_values(self._ref_parameter_value_estimates)
+        self.assertTrue(np.allclose(_fit.y_model, self._ref_y_model_value_estimates))
+        self.assertEqual(len(_calls), 1)
+
     def test_model_nodefaults(self):
         xy_fit = XYFit(xy_data=self._ref_xy_data,
                              model_function=self.xy_model_nodefaults,
@@ -242,6 +280,14 @@ class TestFittersXYChi2WithError(unittest.TestCase):
         else:
             return 9999
 
+    @staticmethod
+    def xy_model_gradient(x, a=1.1, b=2.2, c=3.3):
+        return [x ** 2, x, 1.0]
+
+    @staticmethod
+    def xy_model_gradient_wrong_args(x, a, b):
+        return [x ** 2, x]
+
 
     def setUp(self):
         self._ref_parameter_values = 1.1, 2.2, 3.3
@@ -341,6 +387,17 @@ class TestFittersXYChi2WithError(unittest.TestCase):
             )
         )
 
+    def test_compare_fit_sparse_matrix_error_dense_matrix_error(self):
+        _cov_mat = np.diag(np.ones(10)) + 0.3 * (np.eye(10, k=1) + np.eye(10, k=-1))
+        _fits = []
+        for _err_matrix in (_cov_mat, sp.csr_matrix(_cov_mat)):
+            _fit = XYFit(xy_data=self._ref_xy_data, model_function=self.xy_model)
+            _fit.add_matrix_error('y', _err_matrix, 'cov')
+            _fit.do_fit()
+            _fits.append(_fit)
+        self.assertTrue(np.allclose(_fits[0].parameter_values, _fits[1].parameter_values))
+        self.assertAlmostEqual(_fits[0].cost_function_value, _fits[1].cost_function_value)
+
     def test_before_fit_compare_data_error_nexus_data_error(self):
         self.assertTrue(
             np.allclose(
@@ -434,4 +491,139 @@ class TestFittersXYChi2WithError(unittest.TestCase):
         _buffer = six.StringIO()
         self.xy_fit.do_fit()
         self.xy_fit.report(output_stream=_buffer)
-        self.assertNotEquals(_buffer.getvalue(), "")
\ No newline at end of file
+        self.assertNotEquals(_buffer.getvalue(), "")
+
+    def _assert_fit_analytic_gradient_numeric_gradient_equal(self, minimizer):
+        _cov_mat = np.diag(np.ones(10)) + 0.3 * (np.eye(10, k=1) + np.eye(10, k=-1))
+        _fits = []
+        for _gradient in (None, self.xy_model_gradient):
+            _fit = XYFit(xy_data=self._ref_xy_data, model_function=self.xy_model,
+                         minimizer=minimizer, model_function_gradient=_gradient)
+            _fit.add_matrix_error('y', _cov_mat, 'cov')
+            _fit.add_simple_error('x', 0.1)
+            _fit.do_fit()
+            _fits.append(_fit)
+        self.assertIsNone(_fits[0]._fitter.parameter_to_minimize_gradient)
+        self.assertEqual(_fits[1]._fitter.parameter_to_minimize_gradient, 'cost_gradient')
+        self.assertTrue(np.allclose(_fits[0].parameter_values, _fits[1].parameter_values, rtol=1e-4))
+        self.assertAlmostEqual(_fits[0].cost_function_value, _fits[1].cost_function_value, places=5)
+
+    @unittest.skipIf(_cannot_import_IMinuit, "Cannot import iminuit")
+    def test_compare_fit_analytic_gradient_numeric_gradient_iminuit(self):
+        self._assert_fit_analytic_gradient_numeric_gradient_equal('iminuit')
+
+    def test_compare_fit_analytic_gradient_numeric_gradient_scipy(self):
+        self._assert_fit_analytic_gradient_numeric_gradient_equal('scipy')
+
+    def test_cost_gradient_compare_finite_differences(self):
+        _fit = XYFit(xy_data=self._ref_xy_data, model_function=self.xy_model,
+                     model_function_gradient=self.xy_model_gradient)
+        _fit.add_simple_error('y', self._ref_y_data_error, correlation=0.2)
+        _par_values = np.array(self._ref_parameter_value_estimates)
+        _gradient = _fit._fitter._grad_wrapper(*_par_values)
+        _eps = 1e-6
+        _numeric_gradient = [
+            (_fit._fitter._fcn_wrapper(*(_par_values + _eps * _unit))
+             - _fit._fitter._fcn_wrapper(*(_par_values - _eps * _unit))) / (2 * _eps)
+            for _unit in np.eye(3)
+        ]
+        self.assertTrue(np.allclose(_gradient, _numeric_gradient, rtol=1e-5))
+
+    def test_no_cost_gradient_for_user_defined_cost_function(self):
+        _fit = XYFit(xy_data=self._ref_xy_data, model_function=self.xy_model, cost_function=self.simple_chi2,
+                     model_function_gradient=self.xy_model_gradient)
+        self.assertIsNone(_fit._fitter.parameter_to_minimize_gradient)
+
+    def test_raise_gradient_argument_structure(self):
+        with self.assertRaises(XYModelFunctionException):
+            XYFit(xy_data=self._ref_xy_data, model_function=self.xy_model,
+                  model_function_gradient=self.xy_model_gradient_wrong_args)
+
+
+class TestFittersXYChi2NuisanceProfiled(unittest.TestCase):
+
+    @staticmethod
+    def xy_model(x, a=1.0, b=0.0):
+        return a * x ** 2 + b
+
+    def setUp(self):
+        self._ref_x = np.arange(8, dtype=float)
+        self._ref_y_data = np.array([1.2, 1.0, 2.3, 3.5, 6.0, 8.1, 11.9, 15.4])
+        self._ref_xy_data = np.array([self._ref_x, self._ref_y_data])
+
+    def _get_fit(self, profile_x_nuisance, correlated_y_error=False, profile_y_nuisance=False):
+        _fit = XYFit(xy_data=self._ref_xy_data, model_function=self.xy_model,
+                     cost_function=XYCostFunction_Chi2_Nuisance(axes_to_use='xy',
+                                                                profile_x_nuisance=profile_x_nuisance,
+                                                                profile_y_nuisance=profile_y_nuisance))
+        _fit.add_simple_error('x', 0.2)
+        _fit.add_simple_error('y', 0.5)
+        if correlated_y_error:
+            _fit.add_simple_error('y', 0.1 * self._ref_y_data, name='cor', correlation=1.0)
+        return _fit
+
+    def test_no_x_nuisance_fit_parameters(self):
+        _fit = self._get_fit(profile_x_nuisance=True, correlated_y_error=True)
+        self.assertEqual(_fit._fit_param_names, ['a', 'b', '_n_yc_cor'])
+
+    def test_compare_fit_with_x_nuisance_parameters(self):
+        for _correlated_y_error in (False, True):
+            _fits = [self._get_fit(_profile, _correlated_y_error) for _profile in (True, False)]
+            for _fit in _fits:
+                _fit.do_fit()
+            self.assertTrue(np.allclose(_fits[0].poi_values, _fits[1].poi_values, rtol=1e-4))
+            self.assertAlmostEqual(_fits[0].cost_function_value, _fits[1].cost_function_value, places=5)
+            self.assertTrue(np.allclose(_fits[0].x_uncor_nuisance_values, _fits[1].x_uncor_nuisance_values,
+                                        rtol=1e-3, atol=1e-4))
+
+    def test_x_nuisance_values_zero_x_error(self):
+        _fit = XYFit(xy_data=self._ref_xy_data, model_function=self.xy_model,
+                     cost_function=XYCostFunction_Chi2_Nuisance(axes_to_use='xy', profile_x_nuisance=True))
+        _fit.add_simple_error('x', [0.] + [0.2] * (len(self._ref_x) - 1))
+        _fit.add_simple_error('y', 0.5)
+        _fit.do_fit()
+        self.assertTrue(np.all(np.isfinite(_fit.x_uncor_nuisance_values)))
+        self.assertEqual(_fit.x_uncor_nuisance_values[0], 0.)
+
+    def test_profile_weights_model_error_at_x_data(self):
+        _fit = XYFit(xy_data=self._ref_xy_data, model_function=self.xy_model,
+                     cost_function=XYCostFunction_Chi2_Nuisance(axes_to_use='xy', profile_x_nuisance=True))
+        _fit.add_simple_error('x', 0.2)
+        _fit.add_simple_error('y', 0.5)
+        _fit.add_simple_error('y', 0.1, relative=True, reference='model')
+        _fit.do_fit()
+        _fit._invalidate_total_error_cache()
+        _y_weights = _fit._get_x_nuisance_profile_weights(self._ref_x, _fit.poi_values)[1]
+        _ref_y_model = self.xy_model(self._ref_x, *_fit.poi_values)
+        self.assertTrue(np.allclose(_y_weights, 1. / (0.5 ** 2 + (0.1 * _ref_y_model) ** 2)))
+
+    def test_no_y_nuisance_fit_parameters(self):
+        _fit = self._get_fit(profile_x_nuisance=True, correlated_y_error=True, profile_y_nuisance=True)
+        self.assertEqual(_fit._fit_param_names, ['a', 'b'])
+
+    def test_compare_fit_with_y_nuisance_parameters(self):
+        for _profile_x_nuisance in (False, True):
+            _fits = [self._get_fit(_profile_x_nuisance, True, _profile) for _profile in (True, False)]
+            for _fit in _fits:
+                _fit.do_fit()
+            # the scipy minimizer stops once the cost decreases by less than its tolerance of 1e-6 per step,
+            # i.e. up to ~1e-6 above the minimum. This corresponds to parameter deviations of up to
+            # sqrt(1e-6) = 1e-3 parameter errors (measured: 6e-4 with both nuisance sets profiled).
+            _poi_errors = np.asarray(_fits[1].parameter_errors[:len(_fits[1].poi_values)])
+            self.assertTrue(np.all(np.abs(np.asarray(_fits[0].poi_values) - _fits[1].poi_values)
+                                   <= 2e-3 * _poi_errors))
+            self.assertAlmostEqual(_fits[0].cost_function_value, _fits[1].cost_function_value, places=5)
+            # the nuisance parameters are in units of their uncertainties
+            self.assertTrue(np.allclose(_fits[0].y_nuisance_values, _fits[1].y_nuisance_values,
+                                        rtol=1e-3, atol=2e-3))
+            _profiled_values = _fits[0].get_result_dict()['profiled nuisance parameter values']
+            self.assertAlmostEqual(_profiled_values['_n_yc_cor'], _fits[1].parameter_name_value_dict['_n_yc_cor'],
+                                   places=3)
+
+    def test_raise_profile_pointwise(self):
+        with self.assertRaises(CostFunctionException):
+            XYCostFunction_Chi2_Nuisance(axes_to_use='xy', errors_to_use='pointwise', profile_x_nuisance=True)
+        with self.assertRaises(CostFunctionException):
+            XYCostFunction_Chi2_Nuisance(axes_to_use='xy', errors_to_use='pointwise', profile_y_nuisance=True)
+        with self.assertRaises(CostFunctionException):
+            XYCostFunction_Chi2_Nuisance(axes_to_use='x', profile_y_nuisance=True)
@@ -481,4 +481,19 @@ class TestHistContainerYamlRepresentation(unittest.TestCase):
         self.assertEqual(
             set(self._container._error_dicts.keys()),
             set(_read_container._error_dicts.keys())
-        )
\ No newline at end of file
+        )
+
+    def test_round_trip_weighted_with_stringstream(self):
+        self._container.fill([0.5, 3.5, 7.5], weights=[2., 3., 4.])
+        self._roundtrip_streamwriter.write()
+        self._roundtrip_stringstream.seek(0)  # return to beginning
+        _read_container = self._roundtrip_streamreader.read()
+        self.assertTrue(_read_container.weighted)
+        self.assertTrue(np.allclose(self._container.data, _read_container.data))
+        self.assertTrue(np.allclose(self._container.raw_weights, _read_container.raw_weights))
+        self.assertTrue(np.allclose(self._container.sum_of_squared_weights, _read_container.sum_of_squared_weights))
+
+    def test_raise_write_without_raw_entries(self):
+        _container = HistContainer(n_bins=3, bin_range=(0.0, 10.), fill_data=[1, 4, 8], keep_raw_entries=False)
+        with self.assertRaises(DReprError):
+            DataContainerYamlWriter(_container, self._roundtrip_stringstream).write()